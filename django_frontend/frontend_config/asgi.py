@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'frontend_config.settings')
+# Under ASGI, serve the async page views (pages/async_views.py) by default
+os.environ.setdefault('FRONTEND_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
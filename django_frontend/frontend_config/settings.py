@@ -102,4 +102,40 @@ LOGIN_URL = 'login'
 # Where to redirect after successful template login (though your view handles this)
 # LOGIN_REDIRECT_URL = '/'
 # Where to redirect after logout (though your view handles this)
-# LOGOUT_REDIRECT_URL = '/login/'
\ No newline at end of file
+# LOGOUT_REDIRECT_URL = '/login/'
+
+
+# --- BACKEND API CLIENT ---
+# Base URL of the DRF backend, and tuning for the pooled client in pages/api_client.py
+BACKEND_API_URL = 'http://127.0.0.1:8001/api' # Port 8001 for backend
+BACKEND_API_CLIENT = {
+    'POOL_SIZE': 20,          # Keep-alive connections to the backend (match your worker threads)
+    'CONNECT_TIMEOUT': 3.05,  # Seconds
+    'READ_TIMEOUT': 10,       # Seconds; a slow backend can no longer hang a worker forever
+    'RETRIES': 2,             # Idempotent methods only (GET/HEAD/OPTIONS/PUT/DELETE)
+    'BACKOFF_FACTOR': 0.2,
+}
+
+# --- PUBLIC API RESPONSE CACHE ---
+# Caches the anonymous reads of /recent-posts/, /posts/ and /posts/<id>/ (see pages/api_cache.py).
+# Entries live in the default cache (per-process memory unless CACHES says otherwise);
+# point CACHES at Redis/Memcached to share them between worker processes.
+FRONTEND_API_CACHE = {
+    'TTL': 30,                       # Seconds served with no backend call
+    'STALE_WHILE_REVALIDATE': 300,   # Then served stale while one background request refreshes it
+    'STALE_IF_ERROR': 60 * 60 * 24,  # Oldest copy shown when the backend is down
+}
+
+# --- FULL-PAGE CACHE ---
+# Rendered home / all posts / post detail pages, per URL and auth state (see pages/page_cache.py).
+# Dropped when the backend reports a post change via the webhook or the version poll.
+FRONTEND_PAGE_CACHE = {
+    'ENABLED': True,
+    'TIMEOUT': 60 * 5,     # Seconds; an upper bound, changes invalidate pages sooner
+    'POLL_INTERVAL': 5,    # Seconds between checks of /api/posts/version/ (0 = rely on the webhook)
+    'WEBHOOK_SECRET': os.environ.get('FRONTEND_WEBHOOK_SECRET', ''), # Same value as the backend's BLOG_CHANGE_WEBHOOK
+}
+
+# Route pages to the async views (concurrent backend calls). asgi.py turns this
+# on by default; set FRONTEND_ASYNC_VIEWS=0 to keep the sync views under ASGI.
+FRONTEND_ASYNC_VIEWS = os.environ.get('FRONTEND_ASYNC_VIEWS') == '1'
@@ -1,9 +1,13 @@
 # In django_frontend/frontend_config/urls.py
 
+from django.conf import settings
 from django.urls import path, include
 
-# Import all views from the pages app
-from pages import views as page_views
+# Import all views from the pages app (async twins when served over ASGI)
+if settings.FRONTEND_ASYNC_VIEWS:
+    from pages import async_views as page_views
+else:
+    from pages import views as page_views
 
 urlpatterns = [
 
@@ -18,6 +22,9 @@ urlpatterns = [
     path('create-post/', page_views.create_post_view, name='create_post'),
     path('posts/<int:post_id>/update/', page_views.update_post_view, name='update_post'), 
     path('posts/<int:post_id>/delete/', page_views.delete_post_view, name='delete_post'),
+
+    # --- Backend -> frontend notifications ---
+    path('hooks/posts-changed/', page_views.posts_changed_hook, name='posts_changed_hook'),
 ]
 
 # Note: We are defining all page URLs here directly.
@@ -0,0 +1,252 @@
+# In django_frontend/pages/api_cache.py
+
+"""
+Frontend cache for the public backend reads (/recent-posts/, /posts/,
+/posts/<id>/).
+
+These reads are made without a token, so the JSON is the same for every
+visitor and one cached copy serves them all. Each entry keeps the body with
+its ETag/Last-Modified and the time it was fetched. Its age decides what
+happens on a read (windows are set in FRONTEND_API_CACHE):
+
+* younger than TTL: served from the cache, no backend call;
+* within STALE_WHILE_REVALIDATE after that: served from the cache while one
+  background request revalidates it;
+* older: fetched again before the page renders.
+
+Fetches are single-flight. Concurrent readers of the same URL in a process
+wait for one backend call instead of all hitting the backend at once, and a
+background refresh holds a lock in the cache so other processes keep
+serving the stale copy rather than refreshing it too.
+If the backend is unreachable or answers 5xx, an entry up to STALE_IF_ERROR
+old is served instead of an error page.
+
+Revalidation sends If-None-Match / If-Modified-Since, so an unchanged body
+costs the backend a 304 and no download.
+
+Entries also record the content version they were fetched under. When the
+backend reports a post change (webhook or version poll, see page_cache.py)
+the version is bumped and older entries are refetched on their next read;
+they stay usable as the STALE_IF_ERROR fallback.
+"""
+import asyncio
+import threading
+import time
+import weakref
+from urllib.parse import urlencode
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+from .api_client import api
+from .async_api_client import async_api
+
+DEFAULTS = {
+    'TTL': 30,                       # Seconds an entry is served without asking the backend
+    'STALE_WHILE_REVALIDATE': 300,   # Further seconds it is served while refreshing in the background
+    'STALE_IF_ERROR': 60 * 60 * 24,  # Max age served when the backend is down
+    'LOCK_TIMEOUT': 10,              # Seconds one process may hold the refresh lock for a URL
+}
+
+KEY_PREFIX = 'api-body:'
+CONTENT_VERSION_KEY = 'frontend:content-version'
+
+
+def api_cache_settings():
+    return {**DEFAULTS, **getattr(settings, 'FRONTEND_API_CACHE', {})}
+
+
+def api_cache_key(api_url, params=None):
+    return KEY_PREFIX + api_url + ('?' + urlencode(sorted(params.items())) if params else '')
+
+
+# --- Content version (bumped when the backend reports a post change) ---
+# Seeded from the clock so an evicted counter never returns to an old value
+
+def content_version():
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        cache.add(CONTENT_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(CONTENT_VERSION_KEY)
+    return version
+
+async def acontent_version():
+    version = await cache.aget(CONTENT_VERSION_KEY)
+    if version is None:
+        await cache.aadd(CONTENT_VERSION_KEY, time.time_ns(), None)
+        version = await cache.aget(CONTENT_VERSION_KEY)
+    return version
+
+def bump_content_version():
+    try:
+        cache.incr(CONTENT_VERSION_KEY)
+    except ValueError:
+        cache.set(CONTENT_VERSION_KEY, time.time_ns(), None)
+
+async def abump_content_version():
+    try:
+        await cache.aincr(CONTENT_VERSION_KEY)
+    except ValueError:
+        await cache.aset(CONTENT_VERSION_KEY, time.time_ns(), None)
+
+
+def lock_key(cache_key):
+    return cache_key + ':lock'
+
+
+def conditional_headers(entry):
+    headers = {}
+    if entry:
+        if entry['etag']: headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']: headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def can_serve_stale(error):
+    """Outages and 5xx fall back to a stale copy; 404 and other 4xx don't."""
+    if isinstance(error, requests.exceptions.HTTPError):
+        return error.response is not None and error.response.status_code >= 500
+    return isinstance(error, requests.exceptions.RequestException)
+
+
+def entry_from_response(response, entry, version):
+    """Build the cache entry for a backend response (raises on HTTP errors)."""
+    if response.status_code == 304 and entry:
+        return {**entry, 'fetched_at': time.time(), 'version': version}
+    response.raise_for_status()
+    return {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'data': response.json(),
+        'fetched_at': time.time(),
+        'version': version,
+    }
+
+
+def entry_timeout(options):
+    return options['TTL'] + max(options['STALE_WHILE_REVALIDATE'], options['STALE_IF_ERROR'])
+
+
+def age_of(entry):
+    return time.time() - entry.get('fetched_at', 0) if entry else None
+
+
+def serve_from_cache(entry, version, options):
+    """'fresh', 'stale' (serve and revalidate) or None (fetch first)."""
+    if not entry or entry.get('version') != version:
+        return None
+    age = age_of(entry)
+    if age < options['TTL']:
+        return 'fresh'
+    if age < options['TTL'] + options['STALE_WHILE_REVALIDATE']:
+        return 'stale'
+    return None
+
+
+# --- Sync ---
+
+# Per-process single-flight: one lock per cache key, dropped once nobody holds it
+_thread_locks = weakref.WeakValueDictionary()
+_thread_locks_guard = threading.Lock()
+
+def _thread_lock(cache_key):
+    with _thread_locks_guard:
+        lock = _thread_locks.get(cache_key)
+        if lock is None:
+            lock = _thread_locks[cache_key] = threading.Lock()
+        return lock
+
+def _fetch(api_url, params, cache_key, entry, version, options):
+    response = api.get(api_url, params=params, headers=conditional_headers(entry))
+    entry = entry_from_response(response, entry, version)
+    cache.set(cache_key, entry, entry_timeout(options))
+    return entry
+
+def _revalidate_in_background(api_url, params, cache_key, entry, version, options):
+    def run():
+        try:
+            _fetch(api_url, params, cache_key, entry, version, options)
+        except requests.exceptions.RequestException as e:
+            print(f"API Cache Revalidation Error ({api_url}): {e}")
+        finally:
+            cache.delete(lock_key(cache_key))
+    threading.Thread(target=run, daemon=True).start()
+
+def get_api_json(api_url, params=None):
+    options = api_cache_settings()
+    cache_key = api_cache_key(api_url, params)
+    version = content_version()
+    entry = cache.get(cache_key)
+    state = serve_from_cache(entry, version, options)
+    if state == 'fresh':
+        return entry['data']
+    if state == 'stale':
+        if cache.add(lock_key(cache_key), 1, options['LOCK_TIMEOUT']):
+            _revalidate_in_background(api_url, params, cache_key, entry, version, options)
+        return entry['data']
+
+    requested_at = time.time()
+    with _thread_lock(cache_key):
+        # Another thread may have fetched it while we waited for the lock
+        latest = cache.get(cache_key)
+        if latest and latest.get('fetched_at', 0) >= requested_at:
+            return latest['data']
+        entry = latest or entry
+        try:
+            return _fetch(api_url, params, cache_key, entry, version, options)['data']
+        except requests.exceptions.RequestException as e:
+            if entry and can_serve_stale(e) and age_of(entry) < options['STALE_IF_ERROR']:
+                print(f"API Error ({api_url}), serving cached copy: {e}")
+                return entry['data']
+            raise
+
+
+# --- Async ---
+
+# Per-process single-flight: concurrent readers await the same task
+_inflight = {}
+_background_tasks = set()
+
+async def _afetch(api_url, params, cache_key, entry, version, options):
+    response = await async_api.get(api_url, params=params, headers=conditional_headers(entry))
+    entry = entry_from_response(response, entry, version)
+    await cache.aset(cache_key, entry, entry_timeout(options))
+    return entry
+
+async def _arevalidate(api_url, params, cache_key, entry, version, options):
+    try:
+        await _afetch(api_url, params, cache_key, entry, version, options)
+    except requests.exceptions.RequestException as e:
+        print(f"API Cache Revalidation Error ({api_url}): {e}")
+    finally:
+        await cache.adelete(lock_key(cache_key))
+
+async def aget_api_json(api_url, params=None):
+    options = api_cache_settings()
+    cache_key = api_cache_key(api_url, params)
+    version = await acontent_version()
+    entry = await cache.aget(cache_key)
+    state = serve_from_cache(entry, version, options)
+    if state == 'fresh':
+        return entry['data']
+    if state == 'stale':
+        if await cache.aadd(lock_key(cache_key), 1, options['LOCK_TIMEOUT']):
+            task = asyncio.create_task(_arevalidate(api_url, params, cache_key, entry, version, options))
+            _background_tasks.add(task) # Keep a reference until it finishes
+            task.add_done_callback(_background_tasks.discard)
+        return entry['data']
+
+    task = _inflight.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(_afetch(api_url, params, cache_key, entry, version, options))
+        _inflight[cache_key] = task
+        task.add_done_callback(lambda done: _inflight.pop(cache_key, None))
+    try:
+        # shield(): one reader being cancelled must not cancel the others' fetch
+        return (await asyncio.shield(task))['data']
+    except requests.exceptions.RequestException as e:
+        if entry and can_serve_stale(e) and age_of(entry) < options['STALE_IF_ERROR']:
+            print(f"API Error ({api_url}), serving cached copy: {e}")
+            return entry['data']
+        raise
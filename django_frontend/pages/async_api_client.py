@@ -0,0 +1,134 @@
+# In django_frontend/pages/async_api_client.py
+
+"""
+Async counterpart of api_client.py for the async page views.
+
+Uses one httpx.AsyncClient (a shared keep-alive connection pool) per event
+loop, with the same pool size, timeouts and retry policy as the sync client
+(BACKEND_API_CLIENT in settings). Without httpx installed, calls run the
+pooled sync client in worker threads, so concurrent calls still overlap.
+
+Responses and errors are adapted to look like `requests`: raise_for_status()
+raises requests.exceptions.HTTPError with `.response`, and transport
+failures raise requests' ConnectionError/Timeout. That way the async views
+keep the sync views' error handling.
+
+Usage:
+    recent, profile = await asyncio.gather(
+        async_api.get(recent_url),
+        async_api.get(profile_url, request=request),
+    )
+"""
+import asyncio
+import weakref
+
+import requests
+from asgiref.sync import sync_to_async
+
+from .api_client import IDEMPOTENT_METHODS, api, client_settings
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class AsyncAPIResponse:
+    """Minimal requests.Response look-alike around an httpx.Response."""
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = str(response.url)
+
+    @property
+    def text(self):
+        return self._response.text
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def __bool__(self):
+        return self.ok
+
+    def json(self):
+        return self._response.json()
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} Error for url: {self.url}", response=self,
+            )
+
+
+class AsyncBackendAPIClient:
+    def __init__(self):
+        # One pool per event loop: an httpx client can't be shared across loops
+        self._clients = weakref.WeakKeyDictionary()
+
+    def _client(self):
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            options = client_settings()
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=options['POOL_SIZE'],
+                    max_keepalive_connections=options['POOL_SIZE'],
+                ),
+                timeout=httpx.Timeout(options['READ_TIMEOUT'], connect=options['CONNECT_TIMEOUT']),
+            )
+            self._clients[loop] = client
+        return client
+
+    async def aclose(self):
+        for client in list(self._clients.values()):
+            await client.aclose()
+        self._clients.clear()
+
+    async def request(self, method, url, request=None, **kwargs):
+        if httpx is None:
+            # Thread fallback reuses the sync pool (and its retry policy)
+            return await sync_to_async(api.request, thread_sensitive=False)(
+                method, url, request=request, **kwargs
+            )
+
+        options = client_settings()
+        headers = dict(kwargs.pop('headers', None) or {})
+        access_token = request.session.get('access_token') if request is not None else None
+        if access_token:
+            headers.setdefault('Authorization', f'Bearer {access_token}')
+
+        attempts = 1 + (options['RETRIES'] if method in IDEMPOTENT_METHODS else 0)
+        for attempt in range(attempts):
+            if attempt:
+                await asyncio.sleep(options['BACKOFF_FACTOR'] * (2 ** (attempt - 1)))
+            try:
+                response = await self._client().request(method, url, headers=headers, **kwargs)
+            except httpx.TimeoutException as e:
+                error = requests.exceptions.Timeout(str(e))
+            except httpx.TransportError as e:
+                error = requests.exceptions.ConnectionError(str(e))
+            else:
+                if response.status_code in options['RETRY_STATUSES'] and attempt + 1 < attempts:
+                    continue
+                return AsyncAPIResponse(response)
+        raise error
+
+    async def get(self, url, request=None, **kwargs):
+        return await self.request('GET', url, request=request, **kwargs)
+
+    async def post(self, url, request=None, **kwargs):
+        return await self.request('POST', url, request=request, **kwargs)
+
+    async def put(self, url, request=None, **kwargs):
+        return await self.request('PUT', url, request=request, **kwargs)
+
+    async def delete(self, url, request=None, **kwargs):
+        return await self.request('DELETE', url, request=request, **kwargs)
+
+
+# Process-wide client shared by the async views
+async_api = AsyncBackendAPIClient()
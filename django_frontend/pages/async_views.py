@@ -0,0 +1,231 @@
+# In django_frontend/pages/async_views.py
+
+"""
+Async versions of the page views in views.py.
+
+Each view makes the same backend calls as its sync twin, through async_api
+(pages/async_api_client.py), and hands the outcomes to the same helpers
+(pages/view_helpers.py) for contexts and error messages. Independent backend
+calls are issued together with asyncio.gather, so a view waits for its
+slowest call instead of the sum of all of them. frontend_config/urls.py
+routes to these views when FRONTEND_ASYNC_VIEWS is on, which is the default
+under ASGI.
+"""
+import asyncio
+
+from django.shortcuts import render, redirect
+import requests
+
+from . import view_helpers as helpers
+from .api_cache import abump_content_version, aget_api_json as get_api_json # Cached public reads
+from .page_cache import cached_page, render_page
+from .async_api_client import async_api
+from .view_helpers import BACKEND_API_URL, is_authenticated
+from .views import logout_view, posts_changed_hook
+
+__all__ = [
+    'home', 'all_posts', 'post_detail', 'login_view', 'register_view', 'logout_view',
+    'profile_view', 'create_post_view', 'update_post_view', 'delete_post_view',
+    'posts_changed_hook',
+]
+
+
+async def get_json(api_url, request):
+    """GET an authenticated endpoint and return its JSON (raises like requests)."""
+    response = await async_api.get(api_url, request=request)
+    response.raise_for_status()
+    return response.json()
+
+async def outcome(call):
+    """await call, or the requests exception it raised (see view_helpers)."""
+    try:
+        return await call
+    except requests.exceptions.RequestException as e:
+        return e
+
+async def checked(call):
+    """await an API call and raise_for_status() on its response."""
+    response = await call
+    response.raise_for_status()
+    return response
+
+
+# --- Page Views ---
+
+@cached_page
+async def home(request):
+    # Recent posts and (when logged in) the profile are fetched concurrently
+    calls = [get_api_json(helpers.RECENT_POSTS_URL)]
+    if is_authenticated(request):
+        calls.append(get_json(helpers.PROFILE_URL, request))
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    return render_page(request, 'index.html', helpers.home_context(request, *results))
+
+@cached_page
+async def all_posts(request):
+    data = await outcome(get_api_json(helpers.POSTS_URL, params=helpers.cursor_params(request)))
+    return render_page(request, 'all_posts.html', helpers.all_posts_context(request, data))
+
+@cached_page
+async def post_detail(request, post_id):
+    post = await outcome(get_api_json(helpers.post_url(post_id)))
+    return render_page(request, 'post_detail.html', helpers.post_detail_context(request, post))
+
+
+# --- Post Management Views ---
+
+async def create_post_view(request):
+    if not is_authenticated(request):
+        return redirect('login') # Must be logged in
+
+    if request.method == 'POST':
+        try:
+            api_url = f"{BACKEND_API_URL}/posts/create/"
+            response = await checked(async_api.post(api_url, request=request, data=helpers.post_form_data(request)))
+            await abump_content_version() # Don't serve pages cached before our own write
+            return helpers.created_post_redirect(response)
+        except requests.exceptions.RequestException as e:
+            return render(request, 'create_post.html', helpers.create_post_context(request, e))
+
+    return render(request, 'create_post.html', helpers.create_post_context(request))
+
+async def update_post_view(request, post_id):
+    if not is_authenticated(request):
+        return redirect('login')
+
+    error = None
+    errors_dict = None
+    post_data = None
+    api_url_detail = helpers.post_url(post_id)
+
+    if request.method == 'POST':
+        api_url_update = f"{BACKEND_API_URL}/posts/{post_id}/update/"
+        # The original post is only shown if the update fails, so fetch it
+        # alongside the PUT instead of after it
+        update_result, post_data = await asyncio.gather(
+            checked(async_api.put(api_url_update, request=request, data=helpers.post_form_data(request))),
+            get_json(api_url_detail, request),
+            return_exceptions=True,
+        )
+        if not helpers.failed(update_result):
+            await abump_content_version() # Don't serve pages cached before our own write
+            return redirect('post_detail', post_id=post_id)
+        submitted, error, errors_dict = helpers.update_failure(request, update_result)
+        post_data = submitted or post_data
+    else:
+        post_data = await outcome(get_json(api_url_detail, request))
+
+    if helpers.failed(post_data):
+        if helpers.session_expired(request, post_data):
+            return redirect('login')
+        error = helpers.fetch_error(post_data, 'post to update')
+        post_data = None
+
+    context = helpers.update_post_context(post_id, post_data, error, errors_dict)
+    return render(request, 'update_post.html', context)
+
+async def delete_post_view(request, post_id):
+    if not is_authenticated(request):
+        return redirect('login')
+
+    error = None
+    api_url = helpers.post_url(post_id)
+
+    if request.method == 'POST':
+        api_url_delete = f"{BACKEND_API_URL}/posts/{post_id}/delete/"
+        # Details are only needed to re-render after a failed delete; fetch both at once
+        delete_result, post_data = await asyncio.gather(
+            checked(async_api.delete(api_url_delete, request=request)),
+            get_json(api_url, request),
+            return_exceptions=True,
+        )
+        if not helpers.failed(delete_result):
+            await abump_content_version() # Don't serve pages cached before our own write
+            return redirect('all_posts')
+        error = helpers.delete_failure(delete_result)
+    else:
+        post_data = await outcome(get_json(api_url, request))
+
+    if helpers.failed(post_data):
+        if helpers.session_expired(request, post_data):
+            return redirect('login')
+        fetch_error = helpers.fetch_error(post_data, 'post details')
+        error = error or fetch_error
+        post_data = None
+
+    context = helpers.delete_post_context(post_id, post_data, error)
+    return render(request, 'delete_post.html', context)
+
+
+# --- Profile View ---
+
+async def profile_view(request):
+    if not is_authenticated(request):
+        return redirect('login') # Redirect to login if no token
+
+    error = None
+
+    if request.method == 'POST':
+        try:
+            api_url = f"{BACKEND_API_URL}/auth/profile/update/"
+            await checked(async_api.put(api_url, request=request, data=helpers.profile_form_data(request)))
+            return redirect('profile')
+        except requests.exceptions.RequestException as e:
+            context, error = helpers.profile_update_failure(request, e)
+            if context is not None:
+                return render(request, 'profile.html', context)
+
+    profile_data = await outcome(get_json(helpers.PROFILE_URL, request))
+    if helpers.failed(profile_data):
+        if helpers.session_expired(request, profile_data): # Handle expired/invalid token
+            return redirect('login')
+        error = helpers.fetch_error(profile_data, 'profile')
+        profile_data = None
+
+    # "My posts" needs the username from the profile, so it follows that call
+    posts_url = helpers.author_posts_url(profile_data)
+    my_posts = await outcome(get_api_json(posts_url, params=helpers.cursor_params(request))) if posts_url else None
+
+    context = helpers.profile_context(profile_data, my_posts, error)
+    return render(request, 'profile.html', context)
+
+
+# --- Authentication Views ---
+
+async def login_view(request):
+    """
+    The profile GET needs the token from the POST, so these two calls stay
+    sequential; both reuse pooled connections.
+    """
+    if is_authenticated(request):
+         return redirect('home')
+
+    error = None
+    if request.method == 'POST':
+        try:
+            response_token = await checked(async_api.post(helpers.TOKEN_URL, data=helpers.login_credentials(request)))
+            access_token = response_token.json().get('access')
+
+            if access_token:
+                helpers.store_token(request, access_token)
+                helpers.store_profile(request, await outcome(get_json(helpers.PROFILE_URL, request)))
+                return redirect('home')
+            else:
+                error = "Login failed: No token received from API."
+        except requests.exceptions.RequestException as e:
+            error = helpers.login_failure(e)
+
+    return render(request, 'login.html', helpers.login_context(error))
+
+async def register_view(request):
+    if is_authenticated(request):
+         return redirect('home')
+
+    if request.method == 'POST':
+        try:
+            await checked(async_api.post(helpers.REGISTER_URL, data=helpers.registration_data(request)))
+            return redirect('login')
+        except requests.exceptions.RequestException as e:
+            return render(request, 'register.html', helpers.register_context(e))
+
+    return render(request, 'register.html', helpers.register_context())
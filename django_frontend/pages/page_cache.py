@@ -0,0 +1,174 @@
+# In django_frontend/pages/page_cache.py
+
+"""
+Full-page cache for the public pages (home, all posts, post detail).
+
+Rendered HTML is stored per URL (path + query string) and per auth state:
+one copy for anonymous visitors, and one per logged-in user, because those
+pages show the user's own links (Edit/Delete on their posts, the greeting).
+A warm hit skips both the backend call and template rendering.
+
+Keys embed the content version from api_cache.py, so bumping it drops every
+cached page at once. The backend reports post changes in two ways:
+
+* webhook: the backend POSTs to /hooks/posts-changed/ (signed with
+  WEBHOOK_SECRET, see BLOG_CHANGE_WEBHOOK in the backend settings);
+* version poll: at most once per POLL_INTERVAL the frontend reads
+  /api/posts/version/ and bumps the version when it changed.
+
+Pages that rendered an api_error are never stored (see render_page).
+"""
+import asyncio
+import hashlib
+import hmac
+from functools import wraps
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import render
+from django.utils.cache import patch_cache_control
+
+from .api_cache import abump_content_version, acontent_version, bump_content_version, content_version
+from .api_client import api
+from .async_api_client import async_api
+
+DEFAULTS = {
+    'ENABLED': True,
+    'TIMEOUT': 60 * 5,     # Upper bound; changes invalidate pages through the content version
+    'POLL_INTERVAL': 5,    # Seconds between backend version checks (0 disables polling)
+    'WEBHOOK_SECRET': '',  # Shared with the backend; empty disables the webhook
+}
+
+KEY_PREFIX = 'page:'
+BACKEND_VERSION_KEY = 'frontend:backend-version'
+POLL_LOCK_KEY = 'frontend:version-poll'
+SIGNATURE_HEADER = 'HTTP_X_BLOG_SIGNATURE'
+
+
+def page_cache_settings():
+    return {**DEFAULTS, **getattr(settings, 'FRONTEND_PAGE_CACHE', {})}
+
+
+def auth_variant(request):
+    """'anon', 'user:<id>', or None when a logged-in session has no profile id (not cached)."""
+    if 'access_token' not in request.session:
+        return 'anon'
+    user_id = (request.session.get('user_profile') or {}).get('id')
+    return f"user:{user_id}" if user_id is not None else None
+
+
+def page_cache_key(request, version):
+    digest = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f"{KEY_PREFIX}{version}:{auth_variant(request)}:{digest}"
+
+
+def render_page(request, template_name, context):
+    """render(), but pages showing an api_error are marked uncacheable."""
+    response = render(request, template_name, context)
+    if context.get('api_error'):
+        patch_cache_control(response, no_store=True)
+    return response
+
+
+def is_cacheable(response):
+    return (response.status_code == 200 and not response.streaming
+            and 'no-store' not in response.get('Cache-Control', ''))
+
+
+def cached_entry(response):
+    return (response.content, list(response.headers.items()))
+
+
+def response_from_entry(entry):
+    content, headers = entry
+    response = HttpResponse(content)
+    for name, value in headers:
+        response.headers[name] = value
+    return response
+
+
+# --- Backend change notifications ---
+
+def remember_backend_version(remote_version):
+    """Bump the content version when the backend's version moved."""
+    if remote_version and cache.get(BACKEND_VERSION_KEY) != remote_version:
+        cache.set(BACKEND_VERSION_KEY, remote_version, None)
+        bump_content_version()
+
+def poll_backend_version():
+    interval = page_cache_settings()['POLL_INTERVAL']
+    if not interval or not cache.add(POLL_LOCK_KEY, 1, interval):
+        return
+    try:
+        response = api.get(f"{settings.BACKEND_API_URL}/posts/version/")
+        response.raise_for_status()
+        remember_backend_version(response.json().get('version'))
+    except requests.exceptions.RequestException as e:
+        print(f"API Version Poll Error: {e}")
+
+async def apoll_backend_version():
+    interval = page_cache_settings()['POLL_INTERVAL']
+    if not interval or not await cache.aadd(POLL_LOCK_KEY, 1, interval):
+        return
+    try:
+        response = await async_api.get(f"{settings.BACKEND_API_URL}/posts/version/")
+        response.raise_for_status()
+        remote_version = response.json().get('version')
+    except requests.exceptions.RequestException as e:
+        print(f"API Version Poll Error: {e}")
+        return
+    if remote_version and await cache.aget(BACKEND_VERSION_KEY) != remote_version:
+        await cache.aset(BACKEND_VERSION_KEY, remote_version, None)
+        await abump_content_version()
+
+def valid_signature(request):
+    """HMAC-SHA256 of the body with WEBHOOK_SECRET, hex, in X-Blog-Signature."""
+    secret = page_cache_settings()['WEBHOOK_SECRET']
+    if not secret:
+        return False
+    expected = hmac.new(secret.encode(), request.body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, request.META.get(SIGNATURE_HEADER, ''))
+
+
+# --- View decorator ---
+
+def cached_page(view_func):
+    """Serve GETs of a page view from the page cache (sync and async views)."""
+    def should_cache(request, options):
+        # No id: users would share one "user:None" copy of their personalised page
+        return options['ENABLED'] and request.method in ('GET', 'HEAD') and auth_variant(request) is not None
+
+    if asyncio.iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            options = page_cache_settings()
+            if not should_cache(request, options):
+                return await view_func(request, *args, **kwargs)
+            await apoll_backend_version()
+            key = page_cache_key(request, await acontent_version())
+            entry = await cache.aget(key)
+            if entry is not None:
+                return response_from_entry(entry)
+            response = await view_func(request, *args, **kwargs)
+            if is_cacheable(response):
+                await cache.aset(key, cached_entry(response), options['TIMEOUT'])
+            return response
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        options = page_cache_settings()
+        if not should_cache(request, options):
+            return view_func(request, *args, **kwargs)
+        poll_backend_version()
+        key = page_cache_key(request, content_version())
+        entry = cache.get(key)
+        if entry is not None:
+            return response_from_entry(entry)
+        response = view_func(request, *args, **kwargs)
+        if is_cacheable(response):
+            cache.set(key, cached_entry(response), options['TIMEOUT'])
+        return response
+    return wrapper
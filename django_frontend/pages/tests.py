@@ -1,3 +1,296 @@
-from django.test import TestCase
+import asyncio
+import hashlib
+import hmac
+import threading
+import time
+from unittest import mock
 
-# Create your tests here.
+import requests
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+
+from . import api_cache, async_views, page_cache, views
+from .api_client import IDEMPOTENT_METHODS, BackendAPIClient
+from .async_api_client import AsyncBackendAPIClient, httpx
+
+
+def api_response(status_code=200, data=None, headers=None):
+    response = mock.Mock(status_code=status_code, headers=headers or {})
+    response.json.return_value = data
+    response.raise_for_status.return_value = None
+    return response
+
+
+class ConditionalApiGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(FRONTEND_API_CACHE={'TTL': 0, 'STALE_WHILE_REVALIDATE': 0})
+    @mock.patch.object(views.api, 'get')
+    def test_revalidates_and_reuses_body_on_304(self, get):
+        get.return_value = api_response(data=[{'id': 1}], headers={'ETag': '"abc"'})
+        self.assertEqual(views.get_api_json('http://api/recent-posts/'), [{'id': 1}])
+
+        get.return_value = api_response(status_code=304)
+        self.assertEqual(views.get_api_json('http://api/recent-posts/'), [{'id': 1}])
+        self.assertEqual(get.call_args.kwargs['headers'], {'If-None-Match': '"abc"'})
+
+
+class PublicApiCacheTests(TestCase):
+    url = 'http://api/posts/'
+
+    def setUp(self):
+        cache.clear()
+
+    def store(self, data, age):
+        cache.set(api_cache.api_cache_key(self.url), {
+            'etag': '"v1"', 'last_modified': None, 'data': data, 'fetched_at': time.time() - age,
+            'version': api_cache.content_version(),
+        })
+
+    @mock.patch.object(api_cache.api, 'get')
+    def test_fresh_entry_needs_no_backend_call(self, get):
+        get.return_value = api_response(data=[{'id': 1}])
+        self.assertEqual(api_cache.get_api_json(self.url), [{'id': 1}])
+        self.assertEqual(api_cache.get_api_json(self.url), [{'id': 1}])
+        self.assertEqual(get.call_count, 1)
+
+    @mock.patch.object(api_cache, '_revalidate_in_background')
+    @mock.patch.object(api_cache.api, 'get')
+    def test_stale_entry_is_served_while_one_refresh_runs(self, get, revalidate):
+        self.store([{'id': 1}], age=60)  # Past TTL, inside stale-while-revalidate
+        self.assertEqual(api_cache.get_api_json(self.url), [{'id': 1}])
+        self.assertEqual(api_cache.get_api_json(self.url), [{'id': 1}])
+        get.assert_not_called()
+        self.assertEqual(revalidate.call_count, 1)  # The refresh lock stops a second one
+
+    @mock.patch.object(api_cache.api, 'get')
+    def test_stale_entry_is_served_when_backend_is_down(self, get):
+        self.store([{'id': 1}], age=3600)
+        get.side_effect = requests.exceptions.ConnectionError('refused')
+        self.assertEqual(api_cache.get_api_json(self.url), [{'id': 1}])
+
+        not_found = api_response(status_code=404)
+        not_found.raise_for_status.side_effect = requests.exceptions.HTTPError(response=not_found)
+        get.side_effect, get.return_value = None, not_found
+        with self.assertRaises(requests.exceptions.HTTPError):
+            api_cache.get_api_json(self.url)
+
+    @mock.patch.object(api_cache.api, 'get')
+    def test_concurrent_misses_make_one_backend_call(self, get):
+        def slow_get(*args, **kwargs):
+            time.sleep(0.1)
+            return api_response(data=[{'id': 1}])
+        get.side_effect = slow_get
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(api_cache.get_api_json(self.url)))
+                   for _ in range(5)]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+        self.assertEqual(results, [[{'id': 1}]] * 5)
+        self.assertEqual(get.call_count, 1)
+
+    def test_async_concurrent_misses_make_one_backend_call(self):
+        async def slow_get(*args, **kwargs):
+            await asyncio.sleep(0.1)
+            return api_response(data=[{'id': 1}])
+
+        async def readers():
+            return await asyncio.gather(*[api_cache.aget_api_json(self.url) for _ in range(5)])
+
+        with mock.patch.object(api_cache.async_api, 'get', side_effect=slow_get) as get:
+            results = async_to_sync(readers)()
+        self.assertEqual(results, [[{'id': 1}]] * 5)
+        self.assertEqual(get.call_count, 1)
+
+
+class BackendAPIClientTests(TestCase):
+    def setUp(self):
+        self.client_under_test = BackendAPIClient()
+        self.addCleanup(self.client_under_test.reset)
+
+    def test_session_is_pooled_and_retries_idempotent_methods_only(self):
+        with self.settings(BACKEND_API_CLIENT={'POOL_SIZE': 7, 'RETRIES': 4}):
+            adapter = self.client_under_test.session.get_adapter('http://127.0.0.1:8001/api/')
+        self.assertEqual(adapter._pool_maxsize, 7)
+        self.assertEqual(adapter.max_retries.total, 4)
+        self.assertNotIn('POST', adapter.max_retries.allowed_methods)
+        self.assertEqual(set(adapter.max_retries.allowed_methods), IDEMPOTENT_METHODS)
+        self.assertIs(self.client_under_test.session, self.client_under_test.session)
+
+    def test_injects_token_and_timeouts(self):
+        request = mock.Mock(session={'access_token': 'tok'})
+        with mock.patch.object(self.client_under_test.session, 'request') as send:
+            self.client_under_test.get('http://api/auth/profile/', request=request)
+        headers = send.call_args.kwargs['headers']
+        self.assertEqual(headers['Authorization'], 'Bearer tok')
+        self.assertEqual(send.call_args.kwargs['timeout'], (3.05, 10))
+
+    def test_anonymous_requests_have_no_auth_header(self):
+        request = mock.Mock(session={})
+        with mock.patch.object(self.client_under_test.session, 'request') as send:
+            self.client_under_test.post('http://api/auth/register/', request=request, data={})
+        self.assertNotIn('Authorization', send.call_args.kwargs['headers'])
+
+
+@mock.patch('pages.async_api_client.asyncio.sleep', mock.AsyncMock())
+class AsyncBackendAPIClientTests(TestCase):
+    def run_with_transport(self, handler, method, url, **kwargs):
+        client_under_test = AsyncBackendAPIClient()
+
+        async def call():
+            client_under_test._clients[asyncio.get_running_loop()] = httpx.AsyncClient(
+                transport=httpx.MockTransport(handler))
+            try:
+                return await client_under_test.request(method, url, **kwargs)
+            finally:
+                await client_under_test.aclose()
+        return async_to_sync(call)()
+
+    def test_retries_idempotent_5xx_then_returns_response(self):
+        statuses = iter([503, 200])
+        response = self.run_with_transport(
+            lambda request: httpx.Response(next(statuses), json=[{'id': 1}]),
+            'GET', 'http://api/posts/', request=mock.Mock(session={'access_token': 'tok'}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [{'id': 1}])
+
+    def test_post_is_not_retried_and_errors_look_like_requests(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503, text='down')
+        response = self.run_with_transport(handler, 'POST', 'http://api/posts/create/')
+        self.assertEqual(len(calls), 1)
+        with self.assertRaises(requests.exceptions.HTTPError) as raised:
+            response.raise_for_status()
+        self.assertEqual(raised.exception.response.status_code, 503)
+
+        def refuse(request):
+            raise httpx.ConnectError('refused')
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.run_with_transport(refuse, 'GET', 'http://api/posts/')
+
+
+@override_settings(FRONTEND_PAGE_CACHE={'ENABLED': False})
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_home_fetches_posts_and_profile_concurrently(self):
+        async def slow_get(url, request=None, **kwargs):
+            await asyncio.sleep(0.2)
+            data = {'username': 'alice'} if 'profile' in url else [{'id': 1}]
+            return api_response(data=data)
+
+        request = RequestFactory().get('/')
+        request.session = {'access_token': 'tok'}
+        with mock.patch.object(async_views.async_api, 'get', side_effect=slow_get), \
+                mock.patch.object(async_views, 'render_page') as render:
+            started = time.monotonic()
+            async_to_sync(async_views.home)(request)
+            elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.35)  # Sequential calls would take 0.4s
+        context = render.call_args.args[2]
+        self.assertEqual(context['recent_posts'], [{'id': 1}])
+        self.assertEqual(context['profile'], {'username': 'alice'})
+
+
+@override_settings(FRONTEND_PAGE_CACHE={'POLL_INTERVAL': 0, 'WEBHOOK_SECRET': 's3cret'})
+class PageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @mock.patch.object(views.api, 'get')
+    def test_warm_hit_skips_backend_and_rendering(self, get):
+        get.return_value = api_response(data=[{'id': 1, 'title': 'Cached page', 'author': {'username': 'a'}}])
+        first = self.client.get('/')
+        self.assertContains(first, 'Cached page')
+
+        with mock.patch.object(views, 'render_page') as render_page:
+            second = self.client.get('/')
+        render_page.assert_not_called()
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(second.content, first.content)
+
+    def test_variants_per_auth_state(self):
+        request = RequestFactory().get('/posts/?cursor=abc')
+        request.session = {}
+        anonymous = page_cache.page_cache_key(request, 1)
+        request.session = {'access_token': 'tok', 'user_profile': {'id': 7, 'username': 'alice'}}
+        self.assertNotEqual(page_cache.page_cache_key(request, 1), anonymous)
+        self.assertIn(':user:7:', page_cache.page_cache_key(request, 1))
+        request.session = {'access_token': 'tok', 'user_profile': {}}
+        self.assertIsNone(page_cache.auth_variant(request))
+
+    @mock.patch.object(views.api, 'get')
+    def test_sessions_without_profile_id_are_not_cached(self, get):
+        get.return_value = api_response(data=[{'id': 1, 'title': 'Personal', 'author': {'username': 'a'}}])
+        session = self.client.session
+        session['access_token'] = 'tok'
+        session.save()
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+        with mock.patch.object(views, 'render_page', wraps=views.render_page) as render_page:
+            self.client.get('/')
+            self.client.get('/')
+        self.assertEqual(render_page.call_count, 2)
+
+    @mock.patch.object(views.api, 'get')
+    def test_error_pages_are_not_cached(self, get):
+        get.side_effect = requests.exceptions.ConnectionError('refused')
+        self.client.get('/')
+        self.client.get('/')
+        self.assertEqual(get.call_count, 2)
+
+    def post_hook(self, body, secret='s3cret'):
+        signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        return self.client.post('/hooks/posts-changed/', body, content_type='application/json',
+                                HTTP_X_BLOG_SIGNATURE=signature)
+
+    def test_signed_webhook_drops_cached_pages(self):
+        before = api_cache.content_version()
+        self.assertEqual(self.post_hook(b'{"version": "1.1"}', secret='wrong').status_code, 403)
+        self.assertEqual(api_cache.content_version(), before)
+
+        self.assertEqual(self.post_hook(b'{"version": "1.1"}').status_code, 204)
+        self.assertNotEqual(api_cache.content_version(), before)
+        bumped = api_cache.content_version()
+        self.post_hook(b'{"version": "1.1"}')  # Same backend version: nothing new
+        self.assertEqual(api_cache.content_version(), bumped)
+
+    @override_settings(FRONTEND_PAGE_CACHE={'POLL_INTERVAL': 5})
+    @mock.patch.object(views.api, 'get')
+    def test_version_poll_is_rate_limited(self, get):
+        get.return_value = api_response(data={'version': '1.1'})
+        before = api_cache.content_version()
+        page_cache.poll_backend_version()
+        page_cache.poll_backend_version()
+        self.assertEqual(get.call_count, 1)
+        self.assertNotEqual(api_cache.content_version(), before)
+
+
+class ProfilePageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        session = self.client.session
+        session['access_token'] = 'tok'
+        session.save()
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key # Signed-cookie sessions
+
+    @mock.patch.object(views.api, 'get')
+    def test_lists_my_posts_from_author_feed(self, get):
+        feed = {
+            'next': 'http://api/authors/alice/posts/?cursor=older', 'previous': None,
+            'results': [{'id': 3, 'title': 'Alice writes', 'created_at': '2025-01-01T00:00:00Z', 'excerpt': 'Hello'}],
+        }
+        get.side_effect = lambda url, **kwargs: api_response(
+            data=feed if url.endswith('/authors/alice/posts/') else {'username': 'alice', 'email': 'a@example.com'})
+        response = self.client.get('/profile/')
+        self.assertContains(response, 'Alice writes')
+        self.assertContains(response, '?cursor=older')
+        self.assertEqual(get.call_args.args[0], f'{views.BACKEND_API_URL}/authors/alice/posts/')
@@ -0,0 +1,284 @@
+# In django_frontend/pages/view_helpers.py
+
+"""
+The parts of the page views that don't talk to the backend.
+
+views.py (sync) and async_views.py (async) make the backend calls their own
+way, then hand the outcomes to the helpers here: API URLs and form payloads,
+the mapping of API errors to the messages the templates show, session
+clean-up after a 401, and the template contexts. An outcome is either the
+decoded JSON / response, or the requests exception the call raised (as
+asyncio.gather(..., return_exceptions=True) returns them), so both modules
+share one code path per view after the I/O.
+"""
+from urllib.parse import parse_qs, quote, urlparse
+
+import requests
+from django.conf import settings
+from django.shortcuts import redirect
+
+# Define the base URL of your backend API (see BACKEND_API_URL in settings)
+BACKEND_API_URL = getattr(settings, 'BACKEND_API_URL', 'http://127.0.0.1:8001/api') # Port 8001 for backend
+
+
+# --- Helper function to check auth status ---
+def is_authenticated(request):
+    return 'access_token' in request.session
+
+# --- Helper to pull the opaque cursor out of an API pagination link ---
+def cursor_from_link(link):
+    if not link:
+        return None
+    return parse_qs(urlparse(link).query).get('cursor', [None])[0]
+
+def cursor_params(request):
+    """Pass the page cursor straight through to the API (keyset pagination)."""
+    return {'cursor': request.GET['cursor']} if request.GET.get('cursor') else None
+
+
+# --- Outcomes and errors ---
+
+def failed(outcome):
+    """True for a failed backend call; anything but a requests error is re-raised."""
+    if isinstance(outcome, requests.exceptions.RequestException):
+        return True
+    if isinstance(outcome, BaseException):
+        raise outcome
+    return False
+
+def session_expired(request, error):
+    """After a 401 from the API, drop the tokens; True if the view should redirect to login."""
+    response = getattr(error, 'response', None)
+    if response is None or response.status_code != 401:
+        return False
+    request.session.pop('access_token', None)
+    request.session.pop('refresh_token', None)
+    return True
+
+def fetch_error(error, what):
+    """api_error for a page whose backing GET failed."""
+    print(f"API Fetch Error ({what}): {error}")
+    return f"Could not fetch {what} from API: {error}"
+
+def form_errors(error, action, auth_message=None):
+    """Field errors for a form whose submission the API refused ({field: [messages]})."""
+    if not isinstance(error, requests.exceptions.HTTPError):
+        print(f"API {action} Connection Error: {error}")
+        return {'connection_error': [f"Could not connect to {action.lower()} API: {error}"]}
+    status = error.response.status_code
+    print(f"API {action} Error ({status}): {error}")
+    if status == 400:
+        return error.response.json() # Validation errors
+    if auth_message and status in (401, 403):
+        return {'auth_error': [auth_message]}
+    return {'api_error': [f"API Error ({status}): {error.response.text}"]}
+
+
+# --- Public pages ---
+
+RECENT_POSTS_URL = f"{BACKEND_API_URL}/recent-posts/"
+POSTS_URL = f"{BACKEND_API_URL}/posts/"
+PROFILE_URL = f"{BACKEND_API_URL}/auth/profile/"
+
+def post_url(post_id):
+    return f"{BACKEND_API_URL}/posts/{post_id}/"
+
+def home_context(request, recent_posts, profile=None):
+    error = None
+    if failed(recent_posts):
+        error = f"Could not fetch recent posts from API: {recent_posts}"
+        print(f"API Error (home): {recent_posts}")
+        recent_posts = []
+    if profile is not None and failed(profile):
+        print(f"API Profile Fetch Error (home): {profile}") # Page still renders without it
+        profile = None
+    return {
+        'recent_posts': recent_posts,
+        'profile': profile,
+        'api_error': error,
+        'user_is_authenticated': is_authenticated(request) # Pass auth status to template
+    }
+
+def all_posts_context(request, data):
+    error = None
+    posts_data = []
+    older_cursor = newer_cursor = None
+    if failed(data):
+        error = f"Could not fetch posts from API: {data}"
+        print(f"API Error (all_posts): {data}")
+    else:
+        posts_data = data.get('results', data) if isinstance(data, dict) else data
+        if isinstance(data, dict):
+            older_cursor = cursor_from_link(data.get('next'))
+            newer_cursor = cursor_from_link(data.get('previous'))
+    return {
+        'posts': posts_data,
+        'older_cursor': older_cursor,
+        'newer_cursor': newer_cursor,
+        'api_error': error,
+        'user_is_authenticated': is_authenticated(request)
+    }
+
+def post_detail_context(request, post):
+    error = None
+    if failed(post):
+        if isinstance(post, requests.exceptions.HTTPError) and post.response.status_code == 404:
+            error = "Post not found."
+        else:
+            error = f"Could not fetch post detail from API: {post}"
+        print(f"API Error (post_detail): {post}")
+        post = None
+    return {
+        'post': post,
+        'api_error': error,
+        'user_is_authenticated': is_authenticated(request)
+    }
+
+
+# --- Post management ---
+
+def post_form_data(request):
+    return {
+        'title': request.POST.get('title'),
+        'content': request.POST.get('content'),
+        # Add 'featured_image' if your form supports it
+    }
+
+def created_post_redirect(response):
+    """Redirect to the post the API just created (or the list without its id)."""
+    new_post_id = response.json().get('id')
+    if new_post_id:
+        return redirect('post_detail', post_id=new_post_id)
+    return redirect('all_posts') # Fallback redirect
+
+def create_post_context(request, error=None):
+    if error is None:
+        return {'user_is_authenticated': True}
+    errors = form_errors(error, 'Create Post', 'Authentication failed or forbidden. Please log in again.')
+    return {'errors': errors, 'user_is_authenticated': True, 'submitted_data': request.POST}
+
+def update_failure(request, error):
+    """(post data to show, api_error, field errors) after a failed PUT."""
+    if isinstance(error, requests.exceptions.HTTPError):
+        errors = form_errors(error, 'Update Post', 'Update failed. Check permissions or log in again.')
+        return request.POST, None, errors # Re-render the form with what was submitted
+    print(f"API Update Post Connection Error: {error}")
+    return None, f"Could not connect to update post API: {error}", None
+
+def update_post_context(post_id, post, error=None, errors=None):
+    return {
+        'post': post, # Contains either fetched data or failed POST data
+        'api_error': error,
+        'errors': errors,
+        'user_is_authenticated': True,
+        'post_id': post_id # Pass post_id for form action URL
+    }
+
+def delete_failure(error):
+    if isinstance(error, requests.exceptions.HTTPError):
+        status = error.response.status_code
+        print(f"API Delete Post Error ({status}): {error}")
+        if status in (401, 403): return "Delete failed. Check permissions or log in again."
+        if status == 404: return "Post not found."
+        return f"API Error during delete ({status}): {error.response.text}"
+    print(f"API Delete Post Connection Error: {error}")
+    return f"Could not connect to delete post API: {error}"
+
+def delete_post_context(post_id, post, error=None):
+    return {
+        'post': post,
+        'api_error': error,
+        'user_is_authenticated': True,
+        'post_id': post_id
+    }
+
+
+# --- Profile ---
+
+def profile_form_data(request):
+    return {
+        'first_name': request.POST.get('first_name', ''),
+        'last_name': request.POST.get('last_name', ''),
+        'email': request.POST.get('email', '')
+    }
+
+def profile_update_failure(request, error):
+    """(context to re-render the form with, or None; api_error) after a failed profile PUT."""
+    if isinstance(error, requests.exceptions.HTTPError):
+        errors = form_errors(error, 'Profile Update')
+        return {'profile': request.POST, 'errors': errors, 'user_is_authenticated': True}, None
+    print(f"API Profile Update Connection Error: {error}")
+    return None, f"Could not connect to update profile API: {error}"
+
+def author_posts_url(profile):
+    """The backend's per-author feed for "My posts", or None without a username."""
+    if profile and profile.get('username'):
+        return f"{BACKEND_API_URL}/authors/{quote(profile['username'])}/posts/"
+    return None
+
+def profile_context(profile, posts=None, error=None):
+    my_posts, older_cursor, newer_cursor, posts_error = [], None, None, None
+    if posts is not None and failed(posts):
+        posts_error = f"Could not fetch your posts from API: {posts}"
+        print(f"API Error (profile posts): {posts}")
+    elif posts is not None:
+        my_posts = posts.get('results', [])
+        older_cursor = cursor_from_link(posts.get('next'))
+        newer_cursor = cursor_from_link(posts.get('previous'))
+    return {
+        'profile': profile, # This will be the user data dict from API
+        'my_posts': my_posts,
+        'older_cursor': older_cursor,
+        'newer_cursor': newer_cursor,
+        'posts_error': posts_error,
+        'api_error': error,
+        'user_is_authenticated': True
+    }
+
+
+# --- Authentication ---
+
+TOKEN_URL = f"{BACKEND_API_URL.replace('/api', '')}/api/token/"
+REGISTER_URL = f"{BACKEND_API_URL}/auth/register/"
+
+def login_credentials(request):
+    return {'username': request.POST.get('username'), 'password': request.POST.get('password')}
+
+def login_failure(error):
+    if isinstance(error, requests.exceptions.HTTPError):
+        status = error.response.status_code
+        print(f"API Login HTTP Error ({status}): {error}")
+        if status == 401: return "Invalid username or password."
+        return f"API Error during login ({status}): {error.response.text}"
+    print(f"API Login Connection Error: {error}")
+    return f"Could not connect to login API: {error}"
+
+def store_token(request, access_token):
+    request.session['access_token'] = access_token
+    request.session.set_expiry(0)
+
+def store_profile(request, profile):
+    """Keep what the page cache and templates need (id, username) in the session."""
+    if failed(profile):
+        print(f"!!! EXCEPTION during profile fetch: {profile}") # Logged in anyway
+        return
+    request.session['user_profile'] = {
+        'id': profile.get('id'),
+        'username': profile.get('username')
+    }
+
+def login_context(error=None):
+    return {'error': error, 'user_is_authenticated': False}
+
+def registration_data(request):
+    return {
+        'username': request.POST.get('username'),
+        'email': request.POST.get('email'),
+        'password': request.POST.get('password'),
+        'first_name': request.POST.get('first_name', ''),
+        'last_name': request.POST.get('last_name', '')
+    }
+
+def register_context(error=None):
+    errors = form_errors(error, 'Registration') if error is not None else None
+    return {'errors': errors, 'user_is_authenticated': False}
@@ -1,14 +1,29 @@
 # In django_frontend/pages/views.py
 
+from django.http import HttpResponse, HttpResponseForbidden
 from django.shortcuts import render, redirect
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+import json
 import requests
-
-# Define the base URL of your backend API
-BACKEND_API_URL = 'http://127.0.0.1:8001/api' # Port 8001 for backend
-
-# --- Helper function to check auth status ---
-def is_authenticated(request):
-    return 'access_token' in request.session
+from . import view_helpers as helpers # Contexts and error messages shared with async_views.py
+from .api_client import api # Pooled keep-alive client with timeouts/retries
+from .api_cache import bump_content_version, get_api_json # Cached public reads (TTL, stale-while-revalidate)
+from .page_cache import cached_page, remember_backend_version, render_page, valid_signature
+from .view_helpers import BACKEND_API_URL, is_authenticated
+
+def get_json(api_url, request):
+    """GET an authenticated endpoint and return its JSON (raises like requests)."""
+    response = api.get(api_url, request=request)
+    response.raise_for_status()
+    return response.json()
+
+def outcome(call, *args, **kwargs):
+    """call(*args, **kwargs), or the requests exception it raised (see view_helpers)."""
+    try:
+        return call(*args, **kwargs)
+    except requests.exceptions.RequestException as e:
+        return e
 
 # --- Page Views ---
 
@@ -24,61 +39,31 @@ def update_post_view(request, post_id):
     error = None
     errors_dict = None
     post_data = None
-    access_token = request.session.get('access_token')
-    api_url_detail = f"{BACKEND_API_URL}/posts/{post_id}/"
-    headers = {'Authorization': f'Bearer {access_token}'}
+    api_url_detail = helpers.post_url(post_id)
 
     # --- Handle POST request (Form Submission) ---
     if request.method == 'POST':
         try:
-            update_data = {
-                'title': request.POST.get('title'),
-                'content': request.POST.get('content'),
-            }
             api_url_update = f"{BACKEND_API_URL}/posts/{post_id}/update/"
-            response = requests.put(api_url_update, headers=headers, data=update_data) # Use PUT
+            response = api.put(api_url_update, request=request, data=helpers.post_form_data(request)) # Use PUT
             response.raise_for_status()
+            bump_content_version() # Don't serve pages cached before our own write
 
             # Success! Redirect back to the post detail page
             return redirect('post_detail', post_id=post_id)
-
-        except requests.exceptions.HTTPError as e:
-             if e.response.status_code == 400: errors_dict = e.response.json()
-             elif e.response.status_code in [401, 403]: errors_dict = {'auth_error': ['Update failed. Check permissions or log in again.']}
-             else: errors_dict = {'api_error': [f"API Error ({e.response.status_code}): {e.response.text}"]}
-             print(f"API Update Post Error ({e.response.status_code}): {e}")
-             # Re-render form with errors, use POST data for field values
-             post_data = request.POST # Show submitted data
         except requests.exceptions.RequestException as e:
-            error = f"Could not connect to update post API: {e}"
-            print(f"API Update Post Connection Error: {e}")
-            # Fall through to GET logic to fetch original post data
+            post_data, error, errors_dict = helpers.update_failure(request, e)
 
-    # --- Handle GET request (Show Form) or Re-render after POST error ---
-    # Fetch original post data if not already fetched or if POST failed without specific field errors
-    if not post_data or error:
-        try:
-            response = requests.get(api_url_detail, headers=headers) # Fetch needed even for POST error display
-            response.raise_for_status()
-            fetched_post_data = response.json()
-            # If re-rendering after POST error, keep submitted data, else use fetched data
-            if not post_data:
-                post_data = fetched_post_data
+    # --- Handle GET request (Show Form) or after a failed connection ---
+    if not post_data:
+        post_data = outcome(get_json, api_url_detail, request)
+        if helpers.failed(post_data):
+            if helpers.session_expired(request, post_data):
+                return redirect('login')
+            error = helpers.fetch_error(post_data, 'post to update')
+            post_data = None
 
-        except requests.exceptions.RequestException as e:
-            error = f"Could not fetch post to update from API: {e}"
-            print(f"API Update Post Fetch Error: {e}")
-            if e.response and e.response.status_code == 401:
-                 if 'access_token' in request.session: del request.session['access_token']
-                 return redirect('login')
-
-    context = {
-        'post': post_data, # Contains either fetched data or failed POST data
-        'api_error': error,
-        'errors': errors_dict,
-        'user_is_authenticated': True,
-        'post_id': post_id # Pass post_id for form action URL
-    }
+    context = helpers.update_post_context(post_id, post_data, error, errors_dict)
     return render(request, 'update_post.html', context)
 
 
@@ -91,55 +76,32 @@ def delete_post_view(request, post_id):
         return redirect('login')
 
     error = None
-    post_data = None
-    access_token = request.session.get('access_token')
-    api_url = f"{BACKEND_API_URL}/posts/{post_id}/"
-    headers = {'Authorization': f'Bearer {access_token}'}
 
     # --- Handle POST request (Confirmation) ---
     if request.method == 'POST':
         try:
             api_url_delete = f"{BACKEND_API_URL}/posts/{post_id}/delete/"
-            response = requests.delete(api_url_delete, headers=headers)
+            response = api.delete(api_url_delete, request=request)
             response.raise_for_status() # Check for errors (401, 403, 404, 500)
+            bump_content_version() # Don't serve pages cached before our own write
 
             # Success! Redirect to the list of all posts
             return redirect('all_posts')
-
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code in [401, 403]: error = "Delete failed. Check permissions or log in again."
-            elif e.response.status_code == 404: error = "Post not found."
-            else: error = f"API Error during delete ({e.response.status_code}): {e.response.text}"
-            print(f"API Delete Post Error ({e.response.status_code}): {e}")
-            # Fall through to re-render confirmation page with error
         except requests.exceptions.RequestException as e:
-            error = f"Could not connect to delete post API: {e}"
-            print(f"API Delete Post Connection Error: {e}")
-            # Fall through to re-render confirmation page with error
+            error = helpers.delete_failure(e) # Re-render confirmation page with error
 
-    # --- Handle GET request (Show Confirmation) or Re-render after POST error ---
-    # Fetch post data to display confirmation details
-    if not post_data: # Only fetch if not re-rendering after POST error
-        try:
-            response = requests.get(api_url, headers=headers)
-            response.raise_for_status()
-            post_data = response.json()
-        except requests.exceptions.RequestException as e:
-            # If fetching fails, show error but maybe still allow delete attempt
-            fetch_error = f"Could not fetch post details from API: {e}"
-            print(f"API Delete Post Fetch Error: {e}")
-            if e.response and e.response.status_code == 401:
-                if 'access_token' in request.session: del request.session['access_token']
-                return redirect('login')
-            if not error: error = fetch_error # Show fetch error if no delete error occurred
-
-    context = {
-        'post': post_data,
-        'api_error': error,
-        'user_is_authenticated': True,
-        'post_id': post_id
-    }
+    # --- Show Confirmation (or re-render after POST error) ---
+    post_data = outcome(get_json, helpers.post_url(post_id), request)
+    if helpers.failed(post_data):
+        if helpers.session_expired(request, post_data):
+            return redirect('login')
+        fetch_error = helpers.fetch_error(post_data, 'post details')
+        error = error or fetch_error # Show fetch error if no delete error occurred
+        post_data = None
+
+    context = helpers.delete_post_context(post_id, post_data, error)
     return render(request, 'delete_post.html', context)
+
 # --- Create Post View ---
 def create_post_view(request):
     """
@@ -149,46 +111,19 @@ def create_post_view(request):
     if not is_authenticated(request):
         return redirect('login') # Must be logged in
 
-    errors = None
-    access_token = request.session.get('access_token')
-
     if request.method == 'POST':
         try:
-            post_data = {
-                'title': request.POST.get('title'),
-                'content': request.POST.get('content'),
-                # Add 'featured_image' if your form supports it
-            }
             api_url = f"{BACKEND_API_URL}/posts/create/"
-            headers = {'Authorization': f'Bearer {access_token}'}
-
-            response = requests.post(api_url, headers=headers, data=post_data)
+            response = api.post(api_url, request=request, data=helpers.post_form_data(request))
             response.raise_for_status() # Check for errors
-
-            # Success! Get the ID of the newly created post from the API response
-            new_post_data = response.json()
-            new_post_id = new_post_data.get('id')
-            if new_post_id:
-                return redirect('post_detail', post_id=new_post_id) # Redirect to the new post
-            else:
-                return redirect('all_posts') # Fallback redirect
-
-        except requests.exceptions.HTTPError as e:
-             if e.response.status_code == 400: errors = e.response.json() # Validation errors
-             elif e.response.status_code in [401, 403]: errors = {'auth_error': ['Authentication failed or forbidden. Please log in again.']}
-             else: errors = {'api_error': [f"API Error ({e.response.status_code}): {e.response.text}"]}
-             print(f"API Create Post Error ({e.response.status_code}): {e}")
+            bump_content_version() # Don't serve pages cached before our own write
+            return helpers.created_post_redirect(response) # Redirect to the new post
         except requests.exceptions.RequestException as e:
-            errors = {'connection_error': [f"Could not connect to create post API: {e}"]}
-            print(f"API Create Post Connection Error: {e}")
+            # Re-render form with errors if POST failed
+            return render(request, 'create_post.html', helpers.create_post_context(request, e))
 
-        # Re-render form with errors if POST failed
-        context = {'errors': errors, 'user_is_authenticated': True, 'submitted_data': request.POST}
-        return render(request, 'create_post.html', context)
+    return render(request, 'create_post.html', helpers.create_post_context(request))
 
-    else: # GET request
-        context = {'user_is_authenticated': True}
-        return render(request, 'create_post.html', context)
 def profile_view(request):
     """
     Fetches user profile from backend API and renders profile page.
@@ -198,126 +133,48 @@ def profile_view(request):
         return redirect('login') # Redirect to login if no token
 
     error = None
-    profile_data = None
-    access_token = request.session.get('access_token')
 
     # Handle profile update form submission
     if request.method == 'POST':
         try:
-            update_data = {
-                'first_name': request.POST.get('first_name', ''),
-                'last_name': request.POST.get('last_name', ''),
-                'email': request.POST.get('email', '')
-            }
             api_url = f"{BACKEND_API_URL}/auth/profile/update/"
-            headers = {'Authorization': f'Bearer {access_token}'}
-            response = requests.put(api_url, headers=headers, data=update_data) # Use PUT or PATCH
+            response = api.put(api_url, request=request, data=helpers.profile_form_data(request)) # Use PUT or PATCH
             response.raise_for_status()
             # Successfully updated, redirect back to profile page to show changes
             return redirect('profile')
-
-        except requests.exceptions.HTTPError as e:
-             if e.response.status_code == 400: errors_dict = e.response.json()
-             else: errors_dict = {'api_error': [f"API Error ({e.response.status_code}): {e.response.text}"]}
-             print(f"API Profile Update Error ({e.response.status_code}): {e}")
-             # Re-render form with errors
-             profile_data = request.POST # Show submitted data again
-             context = {'profile': profile_data, 'errors': errors_dict, 'user_is_authenticated': True}
-             return render(request, 'profile.html', context)
         except requests.exceptions.RequestException as e:
-            error = f"Could not connect to update profile API: {e}"
-            print(f"API Profile Update Connection Error: {e}")
-            # Fall through to render profile page with connection error
+            context, error = helpers.profile_update_failure(request, e)
+            if context is not None: # Re-render form with errors
+                return render(request, 'profile.html', context)
 
-    # Fetch profile data for GET request or after failed POST
-    if not profile_data: # Only fetch if not re-rendering after failed POST
-        try:
-            api_url = f"{BACKEND_API_URL}/auth/profile/"
-            headers = {'Authorization': f'Bearer {access_token}'}
-            response = requests.get(api_url, headers=headers)
-            response.raise_for_status()
-            profile_data = response.json()
-            print("--- Profile Data Received by Frontend View ---")
-            print(profile_data)
-            print("--- End Profile Data ---")
+    profile_data = outcome(get_json, helpers.PROFILE_URL, request)
+    if helpers.failed(profile_data):
+        if helpers.session_expired(request, profile_data): # Handle expired/invalid token
+            return redirect('login')
+        error = helpers.fetch_error(profile_data, 'profile')
+        profile_data = None
 
-        except requests.exceptions.RequestException as e:
-            error = f"Could not fetch profile from API: {e}"
-            print(f"API Profile Fetch Error: {e}")
-            if e.response and e.response.status_code == 401: # Handle expired/invalid token
-                 # Clear session and redirect to login
-                 if 'access_token' in request.session: del request.session['access_token']
-                 if 'refresh_token' in request.session: del request.session['refresh_token']
-                 return redirect('login')
-
-    context = {
-        'profile': profile_data, # This will be the user data dict from API
-        'api_error': error,
-        'user_is_authenticated': True
-    }
+    # "My posts": the backend's per-author feed, one keyset page at a time
+    posts_url = helpers.author_posts_url(profile_data)
+    my_posts = outcome(get_api_json, posts_url, params=helpers.cursor_params(request)) if posts_url else None
+
+    context = helpers.profile_context(profile_data, my_posts, error)
     return render(request, 'profile.html', context)
 
+@cached_page # Rendered HTML per URL and auth state (pages/page_cache.py)
 def home(request):
-    error = None
-    recent_posts_data = []
-    try:
-        api_url = f"{BACKEND_API_URL}/recent-posts/"
-        response = requests.get(api_url)
-        response.raise_for_status()
-        recent_posts_data = response.json()
-    except requests.exceptions.RequestException as e:
-        error = f"Could not fetch recent posts from API: {e}"
-        print(f"API Error (home): {e}")
-
-    context = {
-        'recent_posts': recent_posts_data,
-        'api_error': error,
-        'user_is_authenticated': is_authenticated(request) # Pass auth status to template
-    }
-    return render(request, 'index.html', context)
+    recent_posts = outcome(get_api_json, helpers.RECENT_POSTS_URL)
+    return render_page(request, 'index.html', helpers.home_context(request, recent_posts))
 
+@cached_page # Rendered HTML per URL and auth state (pages/page_cache.py)
 def all_posts(request):
-    error = None
-    posts_data = []
-    try:
-        api_url = f"{BACKEND_API_URL}/posts/"
-        response = requests.get(api_url)
-        response.raise_for_status()
-        data = response.json()
-        posts_data = data.get('results', data) if isinstance(data, dict) else data
-    except requests.exceptions.RequestException as e:
-        error = f"Could not fetch posts from API: {e}"
-        print(f"API Error (all_posts): {e}")
-
-    context = {
-        'posts': posts_data,
-        'api_error': error,
-        'user_is_authenticated': is_authenticated(request)
-    }
-    return render(request, 'all_posts.html', context)
+    data = outcome(get_api_json, helpers.POSTS_URL, params=helpers.cursor_params(request))
+    return render_page(request, 'all_posts.html', helpers.all_posts_context(request, data))
 
+@cached_page # Rendered HTML per URL and auth state (pages/page_cache.py)
 def post_detail(request, post_id):
-    error = None
-    post_data = None
-    try:
-        api_url = f"{BACKEND_API_URL}/posts/{post_id}/"
-        response = requests.get(api_url)
-        response.raise_for_status()
-        post_data = response.json()
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 404: error = "Post not found."
-        else: error = f"Could not fetch post detail from API: {e}"
-        print(f"API Error (post_detail 404/500): {e}")
-    except requests.exceptions.RequestException as e:
-        error = f"Could not fetch post detail from API: {e}"
-        print(f"API Error (post_detail other): {e}")
-
-    context = {
-        'post': post_data,
-        'api_error': error,
-        'user_is_authenticated': is_authenticated(request)
-    }
-    return render(request, 'post_detail.html', context)
+    post = outcome(get_api_json, helpers.post_url(post_id))
+    return render_page(request, 'post_detail.html', helpers.post_detail_context(request, post))
 
 # --- Authentication Views ---
 
@@ -330,68 +187,25 @@ def login_view(request):
 
     error = None
     if request.method == 'POST':
-        username = request.POST.get('username')
-        password = request.POST.get('password')
-        print(f"\nAttempting login for user: {username}") # DEBUG
         try:
             # Step 1: Get Tokens
-            api_token_url = f"{BACKEND_API_URL.replace('/api', '')}/api/token/"
-            print(f"Calling token URL: {api_token_url}") # DEBUG
-            response_token = requests.post(api_token_url, data={'username': username, 'password': password})
-            print(f"Token response status: {response_token.status_code}") # DEBUG
+            response_token = api.post(helpers.TOKEN_URL, data=helpers.login_credentials(request))
             response_token.raise_for_status()
-            token_data = response_token.json()
-            access_token = token_data.get('access')
+            access_token = response_token.json().get('access')
 
             if access_token:
-                print("Token received successfully.") # DEBUG
                 # Step 2: Store Token in Session
-                request.session['access_token'] = access_token
-                request.session.set_expiry(0)
-                print("Token stored in session")
-
+                helpers.store_token(request, access_token)
                 # Step 3: Fetch User Profile using the new token
-                try:
-                    print("Attempting to fetch profile...") # DEBUG
-                    api_profile_url = f"{BACKEND_API_URL}/auth/profile/"
-                    headers = {'Authorization': f'Bearer {access_token}'}
-                    print(f"Calling profile URL: {api_profile_url}") # DEBUG
-                    response_profile = requests.get(api_profile_url, headers=headers)
-                    print(f"Profile fetch response status: {response_profile.status_code}") # DEBUG
-                    response_profile.raise_for_status() # Check for HTTP errors (4xx, 5xx)
-                    user_profile_data = response_profile.json()
-
-                    print("Fetched Profile Data:", user_profile_data) # DEBUG
-
-                    # Store necessary profile info (like username or ID) in session
-                    request.session['user_profile'] = {
-                        'id': user_profile_data.get('id'),
-                        'username': user_profile_data.get('username')
-                    }
-                    print("User profile stored in session") # DEBUG
-                except requests.exceptions.RequestException as profile_e:
-                    # Log the specific error during profile fetch
-                    print(f"!!! EXCEPTION during profile fetch: {profile_e}") # DEBUG
-                    # Decide how to handle this - maybe still redirect but log error?
-                    # error = "Login succeeded, but failed to fetch profile details." # Option to show user
-
-                print("Redirecting to home after profile fetch attempt...") # DEBUG
+                helpers.store_profile(request, outcome(get_json, helpers.PROFILE_URL, request))
                 return redirect('home') # Redirect after successful login AND profile fetch attempt
             else:
                 error = "Login failed: No token received from API."
-                print("Login failed: No access token in response.") # DEBUG
-
-        except requests.exceptions.HTTPError as e:
-             if e.response.status_code == 401: error = "Invalid username or password."
-             else: error = f"API Error during login ({e.response.status_code}): {e.response.text}"
-             print(f"API Login HTTP Error ({e.response.status_code}): {e}") # DEBUG
         except requests.exceptions.RequestException as e:
-            error = f"Could not connect to login API: {e}"
-            print(f"API Login Connection Error: {e}") # DEBUG
+            error = helpers.login_failure(e)
 
     # Render login page if GET or if POST failed
-    context = {'error': error, 'user_is_authenticated': False}
-    return render(request, 'login.html', context)
+    return render(request, 'login.html', helpers.login_context(error))
 
 def register_view(request):
     """
@@ -400,34 +214,17 @@ def register_view(request):
     if is_authenticated(request):
          return redirect('home')
 
-    errors = None
     if request.method == 'POST':
-        data_to_send = {
-            'username': request.POST.get('username'),
-            'email': request.POST.get('email'),
-            'password': request.POST.get('password'),
-            'first_name': request.POST.get('first_name', ''),
-            'last_name': request.POST.get('last_name', '')
-        }
         try:
-            api_url = f"{BACKEND_API_URL}/auth/register/"
-            response = requests.post(api_url, data=data_to_send)
+            response = api.post(helpers.REGISTER_URL, data=helpers.registration_data(request))
             response.raise_for_status()
 
             # SUCCESS: Redirect to login page
             return redirect('login')
-
-        except requests.exceptions.HTTPError as e:
-             if e.response.status_code == 400: errors = e.response.json()
-             else: errors = {'api_error': [f"API Error ({e.response.status_code}): {e.response.text}"]}
-             print(f"API Registration Error ({e.response.status_code}): {e}")
-             print("API Response:", e.response.text)
         except requests.exceptions.RequestException as e:
-            errors = {'connection_error': [f"Could not connect to registration API: {e}"]}
-            print(f"API Registration Connection Error: {e}")
+            return render(request, 'register.html', helpers.register_context(e))
 
-    context = {'errors': errors, 'user_is_authenticated': False}
-    return render(request, 'register.html', context)
+    return render(request, 'register.html', helpers.register_context())
 
 def logout_view(request):
     """
@@ -440,8 +237,28 @@ def logout_view(request):
     print("Token removed from session")
     return redirect('home')
 
+# --- Backend change webhook ---
+@csrf_exempt # Server-to-server call, authenticated by its HMAC signature instead
+@require_POST
+def posts_changed_hook(request):
+    """
+    Called by the backend after posts (or their authors) change. Drops the
+    cached pages and public API reads so the next visit renders fresh data.
+    """
+    if not valid_signature(request):
+        return HttpResponseForbidden()
+    try:
+        version = json.loads(request.body or b'{}').get('version')
+    except (ValueError, AttributeError):
+        version = None
+    if version:
+        remember_backend_version(version)
+    else:
+        bump_content_version()
+    return HttpResponse(status=204)
+
 # --- TODO: Add create_post_view, profile_view, update_post_view, delete_post_view ---
 # These will need to:
 # 1. Check if 'access_token' is in request.session. If not, redirect to login.
 # 2. Include the token in the 'Authorization: Bearer <token>' header when calling the backend API.
-# Example: headers={'Authorization': f'Bearer {request.session["access_token"]}'}
\ No newline at end of file
+# Example: api.get(url, request=request) sends 'Authorization: Bearer <token>' from the session
\ No newline at end of file
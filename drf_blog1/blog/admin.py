@@ -1,10 +1,162 @@
+"""
+Post admin, built for very large post tables.
+
+The stock changelist runs COUNT(*) over the filtered and the unfiltered
+table, a LIKE '%x%' scan over content for searches, and loads every
+column (content included) plus one author query per row. Here:
+
+* counts are estimated: the unfiltered total comes from the archive table
+  (blog/archive.py), filtered counts stop at COUNT_LIMIT rows, and
+  show_full_result_count is off. Pages past an estimate are still served
+  (the estimate may be low). "Show exact count" runs the real COUNT(*),
+  and stays on while paging through the results;
+* searches use the full-text index (blog/search.py);
+* the author is joined in, and content is never loaded for the list.
+
+The login form turns a refusal from the password pool (blog/passwords.py)
+into a form error, where it would otherwise be a 500.
+"""
 from django.contrib import admin
-from .models import Post
+from django.contrib.admin.forms import AdminAuthenticationForm
+from django.contrib.admin.views.main import ChangeList
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.utils.dates import MONTHS
+from django.utils.functional import cached_property
+
+from .archive import month_range, total_posts
+from .models import Post, PostArchiveMonth
+from .passwords import LoginOverloaded
+from .search import search_posts
+
+EXACT_COUNT_VAR = 'exact_count'
+COUNT_LIMIT = 10_000
+
+
+class PooledAdminAuthenticationForm(AdminAuthenticationForm):
+    def clean(self):
+        try:
+            return super().clean()
+        except LoginOverloaded as exc:
+            raise ValidationError(exc.message, code='login_overloaded')
+
+
+admin.site.login_form = PooledAdminAuthenticationForm
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator whose count is cheap to get, and flagged when it is not exact."""
+
+    def __init__(self, *args, exact=False, exact_count_url=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.exact = exact
+        self.exact_count_url = exact_count_url
+        self.estimated = False
+
+    @cached_property
+    def count(self):
+        if self.exact:
+            return super().count
+        self.estimated = True
+        if not self.object_list.query.where:
+            return total_posts()
+        # COUNT(*) over a LIMITed subquery: stops after COUNT_LIMIT + 1 rows
+        bounded = self.object_list.order_by()[:COUNT_LIMIT + 1].count()
+        self.estimated = bounded > COUNT_LIMIT
+        return min(bounded, COUNT_LIMIT)
+
+    def validate_number(self, number):
+        if not (self.count and self.estimated):
+            return super().validate_number(number)
+        # Rows may go on past an estimated count: only check that it is a page number
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.estimated:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page # Not clamped to the estimate
+        return self._get_page(self.object_list[bottom:bottom + self.per_page], number, self)
+
+
+class PostChangeList(ChangeList):
+    def __init__(self, request, *args, **kwargs):
+        self.exact_count = getattr(request, '_exact_count', False)
+        super().__init__(request, *args, **kwargs)
+
+    def get_query_string(self, new_params=None, remove=None):
+        # changelist_view took the flag out of the parameters; keep it in page links
+        if self.exact_count:
+            new_params = {EXACT_COUNT_VAR: '1', **(new_params or {})}
+        return super().get_query_string(new_params, remove)
+
+    def get_queryset(self, request):
+        # The list shows no body text: don't read it for 100 rows per page
+        return super().get_queryset(request).defer('content')
+
+
+class ArchiveMonthFilter(admin.SimpleListFilter):
+    """
+    Filter by month, with the choices read from PostArchiveMonth. Replaces
+    date_hierarchy, whose year/month/day links GROUP BY the whole post
+    table on every changelist load.
+    """
+    title = 'month'
+    parameter_name = 'month'
+
+    def lookups(self, request, model_admin):
+        months = PostArchiveMonth.objects.filter(post_count__gt=0).values_list('year', 'month', 'post_count')
+        return [(f'{year}-{month:02d}', f'{MONTHS[month]} {year} ({count})') for year, month, count in months]
+
+    def queryset(self, request, queryset):
+        if not self.value():
+            return queryset
+        try:
+            year, month = map(int, self.value().split('-'))
+            start, end = month_range(year, month)
+        except ValueError:
+            return queryset.none()
+        return queryset.filter(created_at__gte=start, created_at__lt=end)
+
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
     list_display = ['title', 'author', 'created_at']
-    list_filter = ['created_at']
-    search_fields = ['title', 'content']
-    date_hierarchy = 'created_at'
+    list_filter = [ArchiveMonthFilter, 'created_at']
+    list_select_related = ['author']
+    search_fields = ['title', 'content'] # Searched through the full-text index, see get_search_results
     ordering = ['-created_at']
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+    def changelist_view(self, request, extra_context=None):
+        # Not a field lookup: take it out before ChangeList validates the query string
+        if EXACT_COUNT_VAR in request.GET:
+            request.GET = request.GET.copy()
+            del request.GET[EXACT_COUNT_VAR]
+            request._exact_count = True
+        return super().changelist_view(request, extra_context)
+
+    def get_changelist(self, request, **kwargs):
+        return PostChangeList
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        query = request.GET.copy()
+        query[EXACT_COUNT_VAR] = '1'
+        return self.paginator(
+            queryset, per_page, orphans, allow_empty_first_page,
+            exact=getattr(request, '_exact_count', False),
+            exact_count_url=f'?{query.urlencode()}',
+        )
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        # Full-text match instead of LIKE scans, keeping the changelist's own ordering
+        return search_posts(queryset, search_term).order_by(*queryset.query.order_by), False
@@ -1,6 +1,22 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
+
+
+def restore_search_triggers(sender, using='default', **kwargs):
+    # SQLite rebuilds blog_post on some ALTERs, which silently drops its triggers
+    from .search import get_search_backend
+    backend = get_search_backend(using)
+    if hasattr(backend, 'install_triggers'):
+        backend.install_triggers()
 
 
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
+
+    def ready(self):
+        from . import signals  # noqa: F401 (registers cache invalidation receivers)
+        post_migrate.connect(restore_search_triggers, sender=self)
+        from .database import configure_sqlite_connection
+        connection_created.connect(configure_sqlite_connection) # WAL, busy_timeout, ...
@@ -0,0 +1,106 @@
+"""
+Post archive: how many posts were created in each month (PostArchiveMonth).
+
+Counts are kept up to date as posts come and go instead of being computed
+on read: the Post post_save (created) / post_delete receivers in
+blog/signals.py call add_posts() / remove_posts(), and the bulk_create
+paths that send no signals (the bulk endpoint, the importer) call
+add_posts() themselves. created_at is set once, so a post never moves
+between months.
+
+Reading the archive (/api/archive/, the admin month filter) is a scan of a
+table with one row per month. `manage.py rebuild_post_archive` recounts it
+from blog_post, e.g. after writes that bypassed the ORM.
+"""
+import datetime
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear, Greatest
+from django.utils import timezone
+
+from .models import Post, PostArchiveMonth
+
+
+def month_of(moment):
+    """(year, month) of a datetime in the current time zone."""
+    if timezone.is_aware(moment):
+        moment = timezone.localtime(moment)
+    return moment.year, moment.month
+
+
+def month_range(year, month):
+    """[start, end) of a month as aware datetimes, for created_at range lookups."""
+    start = datetime.datetime(year, month, 1)
+    end = datetime.datetime(year + month // 12, month % 12 + 1, 1)
+    return timezone.make_aware(start), timezone.make_aware(end)
+
+
+def _months(created_ats):
+    # Sorted so concurrent writers lock the rows in the same order
+    return sorted(Counter(month_of(moment) for moment in created_ats if moment is not None).items())
+
+
+def add_posts(created_ats):
+    """Count new posts, given their created_at values."""
+    months = _months(created_ats)
+    if not months:
+        return
+    with transaction.atomic():
+        PostArchiveMonth.objects.bulk_create(
+            [PostArchiveMonth(year=year, month=month) for (year, month), _ in months],
+            ignore_conflicts=True,
+        )
+        for (year, month), count in months:
+            PostArchiveMonth.objects.filter(year=year, month=month).update(post_count=F('post_count') + count)
+
+
+def remove_posts(created_ats):
+    """Uncount deleted posts, given their created_at values."""
+    with transaction.atomic():
+        for (year, month), count in _months(created_ats):
+            PostArchiveMonth.objects.filter(year=year, month=month).update(
+                post_count=Greatest(F('post_count') - count, 0)
+            )
+
+
+def month_counts(queryset):
+    """(year, month, count) rows for a Post queryset: the full GROUP BY that rebuilds use."""
+    return (
+        queryset.order_by()
+        .annotate(year=ExtractYear('created_at'), month=ExtractMonth('created_at'))
+        .values_list('year', 'month')
+        .annotate(count=Count('id'))
+    )
+
+
+def rebuild():
+    """Recount every month from blog_post; returns the number of months."""
+    with transaction.atomic():
+        PostArchiveMonth.objects.all().delete()
+        rows = PostArchiveMonth.objects.bulk_create(
+            PostArchiveMonth(year=year, month=month, post_count=count)
+            for year, month, count in month_counts(Post.objects.all())
+        )
+    return len(rows)
+
+
+def total_posts():
+    """Number of posts according to the archive: a sum over a few hundred rows, not COUNT(*) of blog_post."""
+    return PostArchiveMonth.objects.aggregate(total=Sum('post_count'))['total'] or 0
+
+
+def archive():
+    """
+    Years newest first, each with its total and its months newest first:
+    [{"year": 2025, "count": 31, "months": [{"month": 10, "count": 12}, ...]}, ...]
+    """
+    years = []
+    buckets = PostArchiveMonth.objects.filter(post_count__gt=0).values_list('year', 'month', 'post_count')
+    for year, month, count in buckets:
+        if not years or years[-1]['year'] != year:
+            years.append({'year': year, 'count': 0, 'months': []})
+        years[-1]['count'] += count
+        years[-1]['months'].append({'month': month, 'count': count})
+    return years
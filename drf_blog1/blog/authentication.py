@@ -0,0 +1,153 @@
+"""
+JWT authentication with the token's user cached in memory.
+
+simplejwt's JWTAuthentication validates the token without touching the
+database, then SELECTs the user on every request. CachedJWTAuthentication
+keeps recently seen users in a per-process LRU with a TTL, so a client
+calling the API repeatedly with the same token costs no query after the
+first call.
+
+Saving or deleting a user (blog/signals.py) drops its entry here and
+replaces the user's stamp in the cache ALIAS. Every entry remembers the
+stamp it was stored under and a hit is only used while the stamp is
+unchanged, so a deactivation or password change made in one worker locks
+the user out of all of them on their next request. That only holds if the
+alias is shared by all workers: with ENABLED = None (the default) the cache
+turns itself on only for such an alias, and forcing it on for a
+LocMemCache raises check blog.W003. queryset.update() calls, which send no
+signals, are caught up by the TTL.
+
+Every request gets its own User instance, built from the cached column
+values, so a view that modifies request.user can't leak the change into
+another request.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import is_process_local
+
+DEFAULTS = {
+    'ENABLED': None,  # None: on only if ALIAS is shared between processes
+    'ALIAS': 'default',  # Holds the per-user stamps
+    'TTL': 60,  # Seconds; bounds staleness after queryset.update()
+    'MAX_ENTRIES': 10_000,
+}
+
+
+def auth_cache_settings():
+    options = {**DEFAULTS, **getattr(settings, 'BLOG_AUTH_CACHE', {})}
+    if options['ENABLED'] is None:
+        options['ENABLED'] = not is_process_local(options['ALIAS'])
+    return options
+
+
+@checks.register(checks.Tags.caches)
+def check_auth_cache(app_configs, **kwargs):
+    options = {**DEFAULTS, **getattr(settings, 'BLOG_AUTH_CACHE', {})}
+    if options['ENABLED'] and is_process_local(options['ALIAS']):
+        return [checks.Warning(
+            f"BLOG_AUTH_CACHE keeps user stamps in the per-process LocMemCache alias '{options['ALIAS']}'.",
+            hint='Other workers keep authenticating a deactivated user until TTL expires. Point '
+                 'ALIAS at a cache shared by all workers, or leave ENABLED = None for single-process use.',
+            id='blog.W003',
+        )]
+    return []
+
+
+def stamp_key(user_id):
+    return f'blog:auth:user:{user_id}'
+
+
+def current_stamp(options, user_id):
+    cache = caches[options['ALIAS']]
+    key = stamp_key(user_id)
+    stamp = cache.get(key)
+    if stamp is None:
+        # add() so concurrent first readers agree on one stamp
+        cache.add(key, time.time_ns(), timeout=None)
+        stamp = cache.get(key)
+    return stamp
+
+
+class UserCache:
+    """Thread-safe LRU of user id -> (expiry, stamp, db alias, field names, values)."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1:]
+
+    def set(self, user_id, stamp, user, ttl, max_entries):
+        field_names = tuple(field.attname for field in user._meta.concrete_fields)
+        values = tuple(getattr(user, name) for name in field_names)
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + ttl, stamp, user._state.db, field_names, values)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+def forget_user(user):
+    """Drop a user from the authentication cache of every process (on save/delete)."""
+    user_id = str(getattr(user, api_settings.USER_ID_FIELD))
+    user_cache.delete(user_id)
+    options = auth_cache_settings()
+    if options['ENABLED']:
+        # A new stamp: entries other processes hold for this user stop matching
+        caches[options['ALIAS']].set(stamp_key(user_id), time.time_ns(), timeout=None)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        options = auth_cache_settings()
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if not options['ENABLED'] or user_id is None:
+            return super().get_user(validated_token)
+
+        key = str(user_id)
+        stamp = current_stamp(options, key) # Read before the query, so a racing save wins
+        cached = user_cache.get(key)
+        if cached is None or cached[0] != stamp:
+            user = super().get_user(validated_token) # Query, plus simplejwt's checks
+            user_cache.set(key, stamp, user, options['TTL'], options['MAX_ENTRIES'])
+            return user
+
+        user = self.user_model.from_db(*cached[1:])
+        # The checks simplejwt runs after its query, against the cached row
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        if getattr(api_settings, 'CHECK_REVOKE_TOKEN', False):
+            from rest_framework_simplejwt.utils import get_md5_hash_password
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+        return user
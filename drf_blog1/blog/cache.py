@@ -0,0 +1,173 @@
+"""
+Versioned read-through cache for the public post endpoints.
+
+Rendered responses are cached under keys that embed "generation" counters:
+
+* a global post generation, bumped on every Post save/delete, for lists;
+* a per-post generation, bumped when that post changes, for details;
+* a user generation, bumped on User save/delete, because responses embed
+  author data.
+
+Bumping a counter makes every key built from the old value unreachable, so
+writes (API views, admin, shell) invalidate exactly the affected entries with
+no TTL staleness. Counters are seeded from the clock, so an evicted counter
+never falls back to a value that old entries were stored under.
+
+That only holds if every worker process sees the same counters, so the
+cache alias must be shared (file-based, Redis, Memcached, ...). With
+ENABLED = None (the default) the response cache turns itself on only for
+such an alias; a per-process LocMemCache leaves it off. Forcing it on for
+a LocMemCache (tests, single-process servers) raises check blog.W001.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+POSTS_GENERATION_KEY = 'blog:gen:posts'
+USERS_GENERATION_KEY = 'blog:gen:users'
+
+DEFAULTS = {
+    'ENABLED': None,  # None: on only if ALIAS is shared between processes
+    'ALIAS': 'default',
+    'TIMEOUT': 60 * 60 * 24,
+    'KEY_PREFIX': 'blog:resp',
+}
+
+
+def is_process_local(alias):
+    return isinstance(caches[alias], LocMemCache)
+
+
+def cache_settings():
+    options = {**DEFAULTS, **getattr(settings, 'BLOG_RESPONSE_CACHE', {})}
+    if options['ENABLED'] is None:
+        options['ENABLED'] = not is_process_local(options['ALIAS'])
+    return options
+
+
+@checks.register(checks.Tags.caches)
+def check_response_cache(app_configs, **kwargs):
+    options = {**DEFAULTS, **getattr(settings, 'BLOG_RESPONSE_CACHE', {})}
+    if options['ENABLED'] and is_process_local(options['ALIAS']):
+        return [checks.Warning(
+            f"BLOG_RESPONSE_CACHE uses the per-process LocMemCache alias '{options['ALIAS']}'.",
+            hint='Writes only invalidate the worker that handled them. Point ALIAS at a cache '
+                 'shared by all workers, or leave ENABLED = None for single-process use.',
+            id='blog.W001',
+        )]
+    return []
+
+
+def get_cache():
+    return caches[cache_settings()['ALIAS']]
+
+
+def post_generation_key(post_id):
+    return f'blog:gen:post:{post_id}'
+
+
+# --- Generation counters ---
+
+def _seed():
+    return time.time_ns()
+
+def _get_generations(*keys):
+    cache = get_cache()
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            # add() so concurrent first readers agree on one seed
+            cache.add(key, _seed(), timeout=None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+def _bump(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Missing (never read, or evicted): a fresh seed is newer than any old value
+        cache.set(key, _seed(), timeout=None)
+
+def bump_post_generation(*post_ids):
+    """Invalidate list responses and the detail responses of these posts."""
+    _bump(POSTS_GENERATION_KEY)
+    for post_id in post_ids:
+        _bump(post_generation_key(post_id))
+
+def bump_user_generation():
+    """Invalidate every cached response that embeds author data."""
+    _bump(USERS_GENERATION_KEY)
+
+
+# --- Version functions for cached views ---
+
+def list_version(request, **kwargs):
+    return '.'.join(map(str, _get_generations(POSTS_GENERATION_KEY, USERS_GENERATION_KEY)))
+
+def detail_version(request, id=None, **kwargs):
+    return '.'.join(map(str, _get_generations(post_generation_key(id), USERS_GENERATION_KEY)))
+
+
+# --- Response cache ---
+
+def response_cache_key(request, endpoint, version):
+    # Host matters because image URLs and pagination links are absolute
+    variant = '|'.join([
+        request.get_host(),
+        request.path,
+        request.META.get('HTTP_ACCEPT', ''),
+        '&'.join(f'{k}={v}' for k, v in sorted(request.GET.items())),
+    ])
+    digest = hashlib.md5(variant.encode()).hexdigest()
+    return f"{cache_settings()['KEY_PREFIX']}:{endpoint}:{version}:{digest}"
+
+def cached_response(endpoint, version_func):
+    """
+    Cache successful GET responses of a view under a versioned key.
+    Hits answer If-None-Match / If-Modified-Since from the stored ETag and
+    Last-Modified headers, so a revalidation costs no query at all.
+    Requests carrying credentials bypass the cache so authentication errors
+    still surface.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            options = cache_settings()
+            if (not options['ENABLED'] or request.method != 'GET'
+                    or 'HTTP_AUTHORIZATION' in request.META):
+                return view_func(request, *args, **kwargs)
+
+            cache = get_cache()
+            key = response_cache_key(request, endpoint, version_func(request, **kwargs))
+            cached = cache.get(key)
+            if cached is not None:
+                content, headers = cached
+                response = HttpResponse(content)
+                for name, value in headers:
+                    response.headers[name] = value
+                response.headers['X-Cache'] = 'HIT'
+                return get_conditional_response(
+                    request,
+                    etag=response.get('ETag'),
+                    last_modified=parse_http_date_safe(response.get('Last-Modified')),
+                    response=response,
+                )
+
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                if hasattr(response, 'render'):
+                    response.render()
+                cache.set(key, (response.content, list(response.headers.items())), options['TIMEOUT'])
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,88 @@
+"""
+ETag / Last-Modified validators for the public post endpoints.
+
+Validators come from cheap queries (updated_at of a post, or
+max(updated_at) + count for a list) run before any serialization. Django's
+condition() decorator answers If-None-Match / If-Modified-Since with a 304
+without loading a single row. ETags also fold in the query string and
+Accept header.
+
+Responses embed author data that Post.updated_at knows nothing about, so
+both validators also take the "authors" change marker (blog/markers.py):
+the ETag includes it and Last-Modified is the later of the two. Everything
+comes from the database, so every worker computes the same validators.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.views.decorators.http import condition
+from rest_framework.exceptions import ValidationError
+
+from . import markers
+from .filters import filter_posts
+from .models import Post
+
+
+def _etag(request, *parts):
+    variant = '|'.join(map(str, [
+        *parts,
+        request.META.get('HTTP_ACCEPT', ''),
+        request.path,
+        request.GET.urlencode(),
+    ]))
+    return hashlib.sha1(variant.encode()).hexdigest()
+
+
+# --- Post list / recent posts ---
+
+def _latest(*moments):
+    moments = [moment for moment in moments if moment is not None]
+    return max(moments) if moments else None
+
+def _list_stats(request, username=None):
+    # condition() calls the etag and last-modified functions separately; query once
+    if not hasattr(request, '_post_list_stats'):
+        try:
+            queryset = filter_posts(Post.objects.all(), request, username)
+        except ValidationError:
+            # Bad ?created_after= etc.: no validators, the view answers 400
+            request._post_list_stats = {'last_modified': None, 'count': None}
+        else:
+            stats = queryset.order_by().aggregate(updated_at=Max('updated_at'), count=Count('id'))
+            stats['authors_changed_at'] = markers.changed_at(markers.AUTHORS)
+            stats['last_modified'] = _latest(stats['updated_at'], stats['authors_changed_at'])
+            request._post_list_stats = stats
+    return request._post_list_stats
+
+def list_etag(request, *args, username=None, **kwargs):
+    stats = _list_stats(request, username)
+    if stats['count'] is None:
+        return None
+    return _etag(request, 'list', stats['updated_at'], stats['count'], stats['authors_changed_at'])
+
+def list_last_modified(request, *args, username=None, **kwargs):
+    return _list_stats(request, username)['last_modified']
+
+
+# --- Post detail ---
+
+def _detail_stamps(request, id):
+    """(updated_at, authors marker) in one query; (None, None) for a missing post."""
+    if not hasattr(request, '_post_stamps'):
+        request._post_stamps = Post.objects.filter(id=id).annotate(
+            authors_changed_at=markers.changed_at_subquery(markers.AUTHORS),
+        ).values_list('updated_at', 'authors_changed_at').first() or (None, None)
+    return request._post_stamps
+
+def detail_etag(request, id=None, **kwargs):
+    updated_at, authors_changed_at = _detail_stamps(request, id)
+    if updated_at is None:
+        return None  # Let the view return its 404
+    return _etag(request, 'detail', id, updated_at, authors_changed_at)
+
+def detail_last_modified(request, id=None, **kwargs):
+    return _latest(*_detail_stamps(request, id))
+
+
+conditional_post_list = condition(etag_func=list_etag, last_modified_func=list_last_modified)
+conditional_post_detail = condition(etag_func=detail_etag, last_modified_func=detail_last_modified)
@@ -0,0 +1,38 @@
+"""
+Per-connection SQLite tuning, applied from the connection_created signal.
+
+Stock SQLite uses a rollback journal, so one writer blocks every reader,
+and a locked database fails fast. These PRAGMAs let the API serve
+concurrent requests:
+
+* journal_mode=WAL   readers don't block the writer or each other;
+* busy_timeout       wait for a lock (ms) instead of "database is locked";
+* synchronous=NORMAL fsync at checkpoints only, which is safe under WAL;
+* mmap_size          read pages through memory mapping;
+* cache_size         negative values are KiB of page cache per connection.
+
+BLOG_SQLITE_PRAGMAS in settings holds overrides only; they are merged
+over these defaults (None disables one).
+"""
+from django.conf import settings
+
+DEFAULT_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'busy_timeout': 20000,
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -16000,
+}
+
+
+def sqlite_pragmas():
+    pragmas = {**DEFAULT_SQLITE_PRAGMAS, **getattr(settings, 'BLOG_SQLITE_PRAGMAS', {})}
+    return {name: value for name, value in pragmas.items() if value is not None}
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f'PRAGMA {name} = {value}')
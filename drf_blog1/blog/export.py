@@ -0,0 +1,100 @@
+"""
+Streaming NDJSON export of posts, shared by GET /api/posts/export/ and
+`manage.py export_posts`.
+
+Posts are read with .iterator(chunk_size=...), so only one chunk of rows is
+in memory at a time, and encoded one JSON object per line:
+
+    {"id": 1, "title": "...", "content": "...", "author": "alice",
+     "created_at": "2025-01-01T12:00:00Z", "updated_at": "...",
+     "featured_image": "blog_images/1.jpg"}
+
+featured_image is the storage name, not a URL, so `import_posts` can
+re-attach the file. Output can be gzipped as it streams.
+"""
+import datetime
+import json
+import zlib
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.utils import encoders
+
+from . import renderers
+from .models import Post
+
+DEFAULT_CHUNK_SIZE = 2000
+
+EXPORT_FIELDS = ('id', 'title', 'content', 'created_at', 'updated_at', 'featured_image')
+
+
+def parse_moment(value):
+    """
+    Parse an ISO datetime or date (a date means its midnight) into an aware
+    datetime. Raises ValueError for anything else.
+    """
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"'{value}' is not an ISO date or datetime.")
+        moment = datetime.datetime.combine(day, datetime.time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def export_queryset(created_after=None, created_before=None, author=None):
+    """Posts to export, oldest id first, with only the exported columns loaded."""
+    queryset = (
+        Post.objects.select_related('author')
+        .only(*EXPORT_FIELDS, 'author__username')
+        .order_by('id')
+    )
+    if created_after is not None:
+        queryset = queryset.filter(created_at__gte=created_after)
+    if created_before is not None:
+        queryset = queryset.filter(created_at__lt=created_before)
+    if author is not None:
+        queryset = queryset.filter(author__username=author)
+    return queryset
+
+
+def post_record(post):
+    return {
+        'id': post.id,
+        'title': post.title,
+        'content': post.content,
+        'author': post.author.username,
+        'created_at': post.created_at,
+        'updated_at': post.updated_at,
+        'featured_image': post.featured_image.name or None,
+    }
+
+
+def _stdlib_dumps(data):
+    return json.dumps(data, cls=encoders.JSONEncoder, ensure_ascii=False).encode()
+
+dumps = renderers.dumps or _stdlib_dumps
+
+
+def ndjson_lines(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield one encoded line per post, batching lines per chunk of rows."""
+    batch = []
+    for post in queryset.iterator(chunk_size=chunk_size):
+        batch.append(dumps(post_record(post)))
+        if len(batch) >= chunk_size:
+            yield b'\n'.join(batch) + b'\n'
+            batch = []
+    if batch:
+        yield b'\n'.join(batch) + b'\n'
+
+
+def gzip_stream(chunks, level=6):
+    """gzip-compress an iterable of bytes as it is consumed."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,144 @@
+"""
+Fast read path for the post endpoints.
+
+FastSerializer compiles a (possibly trimmed) DRF serializer into a flat plan
+of (output key, .values() column, converter) entries once per request, then
+builds each row straight from queryset.values(). No model instances are
+created and none of DRF's per-field get_attribute/to_representation
+dispatch runs per row. The output is identical to serializer.data; see
+FastSerializerParityTests in blog/tests.py.
+
+Enable with BLOG_FAST_SERIALIZERS = True in settings.
+"""
+from rest_framework import serializers
+from rest_framework.fields import ISO_8601
+from rest_framework.settings import api_settings
+
+# DRF fields whose to_representation is the identity for values read from the DB
+PASSTHROUGH_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.BooleanField,
+    serializers.ReadOnlyField,
+)
+
+
+class UnsupportedField(Exception):
+    """The serializer uses a field the fast path cannot reproduce exactly."""
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if not value:
+            return None
+        if value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+def _file_converter(field, model_field):
+    if not getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL):
+        return lambda name: name or None
+    storage = model_field.storage
+    request = field.context.get('request')
+
+    def convert(name):
+        if not name:
+            return None
+        url = storage.url(name)
+        return request.build_absolute_uri(url) if request is not None else url
+    return convert
+
+
+def _converter(field, model):
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, serializers.FileField):
+        return _file_converter(field, model._meta.get_field(field.source))
+    if isinstance(field, PASSTHROUGH_FIELDS):
+        return None
+    if isinstance(field, (serializers.SerializerMethodField, serializers.RelatedField, serializers.BaseSerializer)):
+        raise UnsupportedField(field.field_name)
+    return field.to_representation
+
+
+def compile_plan(serializer, prefix=''):
+    """
+    Turn serializer fields into [(key, column, converter_or_None, nested_plan)].
+    Only plain model attributes and nested ModelSerializers are supported.
+    """
+    model = serializer.Meta.model
+    plan = []
+    for field in serializer._readable_fields:
+        if field.source == '*' or '.' in field.source:
+            raise UnsupportedField(field.field_name)
+        column = prefix + field.source
+        if isinstance(field, serializers.ModelSerializer):
+            nested = compile_plan(field, prefix=f'{column}__')
+            # values('author') yields the FK id, which doubles as the None check
+            plan.append((field.field_name, column, None, nested))
+        else:
+            plan.append((field.field_name, column, _converter(field, model), None))
+    return plan
+
+
+def _plan_columns(plan):
+    columns = []
+    for _, column, _, nested in plan:
+        columns.append(column)
+        if nested:
+            columns += _plan_columns(nested)
+    return columns
+
+
+def _build(plan, row):
+    data = {}
+    for key, column, convert, nested in plan:
+        value = row[column]
+        if value is None:
+            data[key] = None
+        elif nested is not None:
+            data[key] = _build(nested, row)
+        elif convert is None:
+            data[key] = value
+        else:
+            data[key] = convert(value)
+    return data
+
+
+class FastSerializer:
+    """Serializes .values() rows exactly like the given DRF serializer."""
+
+    def __init__(self, serializer):
+        self.serializer = getattr(serializer, 'child', serializer)
+        self.plan = compile_plan(self.serializer)
+        self.columns = list(dict.fromkeys(_plan_columns(self.plan)))
+
+    @classmethod
+    def for_serializer(cls, serializer):
+        """Return a FastSerializer, or None if the serializer can't be compiled."""
+        try:
+            return cls(serializer)
+        except UnsupportedField:
+            return None
+
+    def values(self, queryset, *extra):
+        # Annotations (e.g. search_rank) stay available for ordering/pagination
+        columns = dict.fromkeys([*self.columns, *extra, *queryset.query.annotation_select])
+        return queryset.values(*columns)
+
+    def to_representation(self, row):
+        return _build(self.plan, row)
+
+    def many(self, rows):
+        plan = self.plan
+        return [_build(plan, row) for row in rows]
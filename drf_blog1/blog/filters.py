@@ -0,0 +1,63 @@
+"""
+Post list filters shared by the list views and their ETag/Last-Modified
+validators (blog/conditional.py), so both see the same rows.
+
+* ?search=   full-text match (blog/search.py)
+* ?author=   one author's posts, by username; /api/authors/<username>/posts/
+             passes the username from the URL instead. The username is
+             resolved to an id once, so the filter is a plain author_id
+             lookup served by the (author, -created_at) index.
+* ?created_after= / ?created_before=
+             ISO date or datetime; created_at >= after and < before, a
+             range on the created_at indexes. /api/archive/ months map to
+             created_after=2025-10-01&created_before=2025-11-01.
+"""
+from django.contrib.auth.models import User
+from rest_framework.exceptions import ValidationError
+
+from .export import parse_moment
+from .search import search_posts
+
+DATE_RANGE_LOOKUPS = {'created_after': 'created_at__gte', 'created_before': 'created_at__lt'}
+
+
+def requested_author(request, username=None):
+    return username or request.GET.get('author') or None
+
+
+def author_id_for(request, username):
+    """Id of the user with this username (None if there is none), looked up once per request."""
+    request = getattr(request, '_request', request)  # DRF Request -> HttpRequest
+    memo = request.__dict__.setdefault('_blog_author_ids', {})
+    if username not in memo:
+        memo[username] = User.objects.filter(username=username).values_list('id', flat=True).first()
+    return memo[username]
+
+
+def requested_date_range(request):
+    """created_at lookups for ?created_after= / ?created_before=; ValidationError (400) if unparsable."""
+    lookups, errors = {}, {}
+    for param, lookup in DATE_RANGE_LOOKUPS.items():
+        value = request.GET.get(param)
+        if value:
+            try:
+                lookups[lookup] = parse_moment(value)
+            except ValueError as exc:
+                errors[param] = [str(exc)]
+    if errors:
+        raise ValidationError(errors)
+    return lookups
+
+
+def filter_posts(queryset, request, username=None, search=True):
+    """Apply the author, date range and (if `search`) search filters of a list request."""
+    queryset = queryset.filter(**requested_date_range(request))
+    username = requested_author(request, username)
+    if username is not None:
+        author_id = author_id_for(request, username)
+        queryset = queryset.filter(author_id=author_id) if author_id is not None else queryset.none()
+    search_query = request.GET.get('search') if search else None
+    if search_query:
+        # Full-text index lookup, best matches first (see blog/search.py)
+        queryset = search_posts(queryset, search_query)
+    return queryset
@@ -0,0 +1,40 @@
+"""
+The part of blog/passwords.py that runs inside the hashing processes.
+
+Kept apart because spawned workers import this module before Django is
+set up, so it must not import models (or anything that does).
+"""
+from django.contrib.auth import hashers
+from django.contrib.auth.hashers import check_password, make_password
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """
+    scrypt at OWASP's recommended cost: N=2**17, r=8, p=1 (128 MiB and about
+    half a second of one core per check). Django's default, N=2**14, is below
+    OWASP's minimum for p=1; hashes made with it are upgraded at the next
+    login, since must_update() compares the stored parameters to these.
+    """
+    work_factor = 2 ** 17
+    # hashlib.scrypt refuses to use more than maxmem (0 = OpenSSL's 32 MiB)
+    maxmem = 2 * 128 * work_factor * hashers.ScryptPasswordHasher.block_size
+
+
+def init_worker():
+    # Spawned processes start blank: load the project settings (PASSWORD_HASHERS)
+    import django
+    django.setup()
+
+
+def verify_password(password, encoded):
+    """
+    (correct?, new hash or None) for a password against a stored hash; the
+    new hash is set when the stored one should be upgraded. encoded=None
+    hashes once anyway, so unknown usernames take as long as known ones.
+    """
+    if encoded is None:
+        make_password(password)
+        return False, None
+    rehashed = []
+    correct = check_password(password, encoded, setter=lambda raw: rehashed.append(make_password(raw)))
+    return correct, rehashed[0] if rehashed else None
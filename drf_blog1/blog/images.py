@@ -0,0 +1,186 @@
+"""
+Resized renditions of Post.featured_image.
+
+Each uploaded image gets one file per (size, format), e.g. for
+blog_images/cover.jpg:
+
+    blog_images/renditions/cover-thumbnail.webp   (and .jpg)
+    blog_images/renditions/cover-card.webp
+    blog_images/renditions/cover-full.webp
+
+Renditions are re-encoded from decoded pixels, so EXIF/XMP metadata (GPS
+position, camera serials, ...) is dropped; the EXIF orientation is applied
+first so nothing ends up sideways. Images are never upscaled.
+
+Generation runs off the request path: the create/update views call
+schedule() and the work starts on a thread pool once the transaction
+commits (Pillow releases the GIL while resizing and encoding). When it is
+done, Post.image_renditions records the stored names, and the serializers
+expose them as URLs. `manage.py generate_image_renditions` backfills
+existing posts in parallel.
+"""
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .cache import bump_post_generation
+from .listing import sync_posts
+from .models import Post
+from .webhooks import notify_change
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'SIZES': {'thumbnail': 320, 'card': 640, 'full': 1600},  # Longest side, px
+    'FORMATS': ['webp', 'jpeg'],
+    'QUALITY': 80,
+    'WORKERS': 2,  # 0 generates inline (tests, scripts)
+}
+
+EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg'}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def rendition_settings():
+    return {**DEFAULTS, **getattr(settings, 'BLOG_IMAGE_RENDITIONS', {})}
+
+
+def rendition_name(image_name, size_name, fmt):
+    directory, filename = os.path.split(image_name)
+    stem = os.path.splitext(filename)[0]
+    return f'{directory}/renditions/{stem}-{size_name}.{EXTENSIONS[fmt]}'
+
+
+# --- Encoding ---
+
+def _flatten(image):
+    """RGB copy for formats without alpha, composited on white."""
+    if image.mode == 'RGBA':
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def render(source, options):
+    """
+    Yield (size name, format, width, height, encoded bytes) for one image.
+    `source` is a binary file object with the original.
+    """
+    with Image.open(source) as original:
+        original = ImageOps.exif_transpose(original)
+        if original.mode not in ('RGB', 'RGBA'):
+            original = original.convert('RGBA' if original.has_transparency_data else 'RGB')
+        for size_name, longest in options['SIZES'].items():
+            image = original.copy()
+            image.thumbnail((longest, longest), Image.LANCZOS)  # Keeps aspect ratio, never upscales
+            for fmt in options['FORMATS']:
+                buffer = io.BytesIO()
+                if fmt == 'jpeg':
+                    _flatten(image).save(buffer, 'JPEG', quality=options['QUALITY'], optimize=True, progressive=True)
+                else:
+                    image.save(buffer, 'WEBP', quality=options['QUALITY'], method=4)
+                yield size_name, fmt, image.width, image.height, buffer.getvalue()
+
+
+def delete_renditions(renditions, keep=()):
+    for rendition in renditions.values():
+        for fmt in EXTENSIONS:
+            name = rendition.get(fmt)
+            if name and name not in keep:
+                default_storage.delete(name)
+
+
+# --- Pipeline ---
+
+def generate_for_post(post_id, options=None, force=False):
+    """Create renditions for a post's current image; returns the new map (None if skipped)."""
+    options = options or rendition_settings()
+    post = Post.objects.filter(pk=post_id).only('id', 'featured_image', 'image_renditions').first()
+    if post is None:
+        return None
+    image_name = post.featured_image.name
+    # Uploads are content-addressed (blog/uploads.py): posts sharing an image share its renditions
+    shared = (
+        Post.objects.filter(featured_image=image_name).exclude(pk=post_id).exclude(image_renditions={})
+        .values_list('image_renditions', flat=True).first()
+    ) if image_name and not force else None
+    renditions = shared or {}
+    if image_name and not shared:
+        try:
+            with default_storage.open(image_name, 'rb') as source:
+                for size_name, fmt, width, height, data in render(source, options):
+                    name = rendition_name(image_name, size_name, fmt)
+                    default_storage.delete(name)  # Keep the predictable name on regeneration
+                    rendition = renditions.setdefault(size_name, {'width': width, 'height': height})
+                    rendition[fmt] = default_storage.save(name, ContentFile(data))
+        except (OSError, Image.DecompressionBombError) as exc:
+            # Unreadable or missing original: keep serving it as uploaded
+            logger.warning('Image renditions for post %s failed: %s', post_id, exc)
+            delete_renditions(renditions)
+            return None
+
+    with transaction.atomic():
+        # Only if the image didn't change meanwhile (a newer job handles that one).
+        # updated_at moves too: the ETag / Last-Modified validators are built from it.
+        updated = Post.objects.filter(pk=post_id, featured_image=image_name).update(
+            image_renditions=renditions, updated_at=timezone.now(),
+        )
+        if not updated:
+            if not shared:
+                delete_renditions(renditions)
+            return None
+        sync_posts([post_id])  # update() sends no signals
+        bump_post_generation(post_id)
+        transaction.on_commit(notify_change)
+    kept = {name for rendition in renditions.values() for name in rendition.values() if isinstance(name, str)}
+    release_renditions(post.image_renditions, keep=kept)
+    return renditions
+
+
+def release_renditions(renditions, keep=()):
+    """Delete the files of a post's former renditions, unless another post still shows them."""
+    if renditions and not Post.objects.filter(image_renditions=renditions).exists():
+        delete_renditions(renditions, keep=keep)
+
+
+def _run_job(post_id):
+    # Pool threads live outside the request cycle: manage their connections here
+    close_old_connections()
+    try:
+        generate_for_post(post_id)
+    except Exception:
+        logger.exception('Image renditions for post %s failed', post_id)
+    finally:
+        close_old_connections()
+
+
+def get_executor(workers):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(workers, thread_name_prefix='image-renditions')
+        return _executor
+
+
+def schedule(post_id):
+    """Generate a post's renditions in the background once the current transaction commits."""
+    options = rendition_settings()
+    if not options['ENABLED']:
+        return
+    if not options['WORKERS']:
+        transaction.on_commit(lambda: generate_for_post(post_id, options))
+    else:
+        transaction.on_commit(lambda: get_executor(options['WORKERS']).submit(_run_job, post_id))
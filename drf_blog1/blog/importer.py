@@ -0,0 +1,217 @@
+"""
+Bulk import of posts from NDJSON or CSV, used by `manage.py import_posts`.
+
+Records use the export format (blog/export.py): title, content, author
+(username), and optionally created_at, updated_at and featured_image. Rows
+are validated, their authors resolved through a username -> id cache (one
+query per batch for names not seen before), and written with bulk_create in
+one transaction per batch. After each batch commits, a checkpoint file
+records how many input records were consumed, so an interrupted import
+resumes where it stopped.
+
+Image files are stored under content-addressed names, like uploads
+(blog/uploads.py), so an image shared by many records is stored once. They
+can be copied on a thread pool while rows keep flowing; copied names are
+attached with bulk_update as the copies finish. Checkpoints only
+track rows, so a crash mid-import can leave the last posts without images.
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from . import renderers
+from .archive import add_posts as add_archive_posts
+from .export import parse_moment
+from .listing import sync_posts
+from .models import Post
+from .uploads import store_image_file
+
+DEFAULT_BATCH_SIZE = 5000
+TITLE_MAX_LENGTH = Post._meta.get_field('title').max_length
+
+
+class RowError(ValueError):
+    pass
+
+
+# --- Reading ---
+
+def detect_format(path):
+    name = path[:-3] if path.endswith('.gz') else path
+    return 'csv' if name.endswith('.csv') else 'ndjson'
+
+
+def open_source(path):
+    """Binary stream for a path ('-' is stdin); .gz files are decompressed."""
+    raw = sys.stdin.buffer if path == '-' else open(path, 'rb')
+    return gzip.open(raw) if path.endswith('.gz') else raw
+
+
+def read_records(stream, fmt):
+    """Yield dicts (or RowError for unparseable lines), one per input record."""
+    if fmt == 'csv':
+        yield from csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8', newline=''))
+        return
+    loads = renderers.loads or json.loads
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            record = loads(line)
+        except (ValueError, renderers.DecodeError) as exc:
+            yield RowError(f'Invalid JSON: {exc}')
+            continue
+        yield record if isinstance(record, dict) else RowError('Expected a JSON object.')
+
+
+# --- Checkpoints ---
+
+def load_checkpoint(path):
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path) as checkpoint:
+        return json.load(checkpoint)['position']
+
+def save_checkpoint(path, position, imported):
+    if not path:
+        return
+    # Write-then-rename so a crash never leaves a half-written checkpoint
+    with open(path + '.tmp', 'w') as checkpoint:
+        json.dump({'position': position, 'imported': imported}, checkpoint)
+    os.replace(path + '.tmp', path)
+
+
+# --- Import ---
+
+def copy_image(source_path):
+    """Copy one image into media storage; returns the stored name."""
+    try:
+        return store_image_file(source_path)
+    except ValueError as exc:
+        raise RowError(str(exc))
+
+
+class PostImporter:
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, default_author=None,
+                 media_source=None, image_workers=0):
+        self.batch_size = batch_size
+        self.media_source = media_source
+        self.image_workers = image_workers
+        self.author_ids = {}  # username -> id (None when unknown)
+        self.default_author_id = None
+        if default_author:
+            self.default_author_id = self.resolve_authors([default_author]).get(default_author)
+            if self.default_author_id is None:
+                raise RowError(f"Default author '{default_author}' does not exist.")
+        self.imported = 0
+        self.errors = []  # (position, message)
+        self._pool = ThreadPoolExecutor(image_workers) if image_workers else None
+        self._copies = []  # (future, post)
+
+    # Authors
+
+    def resolve_authors(self, usernames):
+        missing = {name for name in usernames if name not in self.author_ids}
+        if missing:
+            found = dict(User.objects.filter(username__in=missing).values_list('username', 'id'))
+            for name in missing:
+                self.author_ids[name] = found.get(name)
+        return self.author_ids
+
+    # Rows
+
+    def build_post(self, record, author_ids, now):
+        title, content = record.get('title') or '', record.get('content') or ''
+        if not isinstance(title, str) or not isinstance(content, str):
+            raise RowError('title and content must be strings.')
+        title = title.strip()
+        if not title:
+            raise RowError('title is required.')
+        if len(title) > TITLE_MAX_LENGTH:
+            raise RowError(f'title is longer than {TITLE_MAX_LENGTH} characters.')
+        if not content:
+            raise RowError('content is required.')
+        author = record.get('author')
+        author_id = (author_ids.get(author) if isinstance(author, str) else None) or self.default_author_id
+        if author_id is None:
+            raise RowError(f"Unknown author '{author}'.")
+        try:
+            created_at = parse_moment(record['created_at']) if record.get('created_at') else now
+            updated_at = parse_moment(record['updated_at']) if record.get('updated_at') else created_at
+        except ValueError as exc:
+            raise RowError(str(exc))
+
+        post = Post(title=title, content=content, author_id=author_id,
+                    created_at=created_at, updated_at=updated_at)
+        post.keep_timestamps = True # bulk_create keeps the source's dates
+        post.refresh_summary()
+        image = record.get('featured_image')
+        if image and not self.media_source:
+            post.featured_image.name = image  # Already in media storage (e.g. our own export)
+        elif image:
+            source_path = os.path.join(self.media_source, image)
+            if not os.path.isfile(source_path):
+                raise RowError(f'featured_image {source_path} not found.')
+            if self._pool is None:
+                post.featured_image.name = copy_image(source_path)
+            else:
+                post._image_source = source_path
+        return post
+
+    def write_batch(self, batch):
+        """Validate and insert one batch of (position, record) pairs."""
+        records = [(position, record) for position, record in batch if not isinstance(record, RowError)]
+        self.errors.extend((position, str(record)) for position, record in batch if isinstance(record, RowError))
+        author_ids = self.resolve_authors({record.get('author') for _, record in records
+                                           if isinstance(record.get('author'), str)})
+
+        now = timezone.now()
+        posts = []
+        for position, record in records:
+            try:
+                posts.append(self.build_post(record, author_ids, now))
+            except RowError as exc:
+                self.errors.append((position, str(exc)))
+
+        with transaction.atomic():
+            Post.objects.bulk_create(posts, batch_size=self.batch_size)
+            sync_posts([post.pk for post in posts]) # bulk_create sends no signals
+            add_archive_posts(post.created_at for post in posts)
+        self.imported += len(posts)
+
+        for post in posts:
+            source_path = getattr(post, '_image_source', None)
+            if source_path:
+                self._copies.append((self._pool.submit(copy_image, source_path), post))
+        self.attach_copied_images()
+
+    def attach_copied_images(self, wait=False):
+        """bulk_update the image names of finished copies (all of them if wait)."""
+        done, pending = [], []
+        for item in self._copies:
+            (done if wait or item[0].done() else pending).append(item)
+        self._copies = pending
+        if not done:
+            return
+        posts = []
+        for future, post in done:
+            try:
+                post.featured_image.name = future.result()
+                posts.append(post)
+            except (OSError, RowError) as exc:
+                self.errors.append((None, f'Copying image for post {post.pk} failed: {exc}'))
+        Post.objects.bulk_update(posts, ['featured_image'], batch_size=self.batch_size)
+        sync_posts([post.pk for post in posts])
+
+    def finish(self):
+        if self._pool is not None:
+            self.attach_copied_images(wait=True)
+            self._pool.shutdown()
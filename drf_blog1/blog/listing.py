@@ -0,0 +1,153 @@
+"""
+Denormalized post listing (PostListing) for the list endpoints.
+
+Each row copies a post's list fields together with its author's, so the
+post list and recent posts are read from one table, in index order, with
+no join to auth_user. ListingSerializer compiles PostListSerializer (after
+?fields= / ?exclude=) like FastSerializer does, then reads the matching
+PostListing columns, so responses are identical to the regular path.
+
+Rows are maintained by Post/User signals (blog/signals.py) and, for
+bulk_create/bulk_update paths that send no signals, by explicit
+sync_posts() calls. `manage.py rebuild_post_listing` rebuilds the table
+from scratch, e.g. right after enabling BLOG_POST_LISTING.
+"""
+from django.conf import settings
+from django.db import transaction
+
+from .fast_serializers import FastSerializer, UnsupportedField
+from .models import Post, PostListing
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# Post ORM paths read by PostListSerializer -> PostListing columns
+COLUMNS = {
+    'id': 'id',
+    'title': 'title',
+    'created_at': 'created_at',
+    'featured_image': 'featured_image',
+    'image_renditions': 'image_renditions',
+    'excerpt': 'excerpt',
+    'word_count': 'word_count',
+    'reading_time': 'reading_time',
+    'author': 'author_id',
+    'author__id': 'author_id',
+    'author__username': 'author_username',
+    'author__first_name': 'author_first_name',
+    'author__last_name': 'author_last_name',
+    'author__email': 'author_email',
+}
+
+AUTHOR_FIELDS = ['author_username', 'author_first_name', 'author_last_name', 'author_email']
+AUTHOR_SOURCE_FIELDS = {'username', 'first_name', 'last_name', 'email'}
+LISTING_FIELDS = ['title', 'excerpt', 'word_count', 'reading_time', 'author_id', *AUTHOR_FIELDS, 'created_at', 'featured_image', 'image_renditions']
+
+def listing_enabled():
+    return getattr(settings, 'BLOG_POST_LISTING', False)
+
+
+# --- Reading ---
+
+def _remap(plan):
+    remapped = []
+    for key, column, convert, nested in plan:
+        if column not in COLUMNS:
+            raise UnsupportedField(key)
+        remapped.append((key, COLUMNS[column], convert, _remap(nested) if nested else None))
+    return remapped
+
+
+class ListingSerializer(FastSerializer):
+    """FastSerializer whose rows come from PostListing instead of Post."""
+
+    def __init__(self, serializer):
+        super().__init__(serializer)
+        self.plan = _remap(self.plan)
+        self.columns = list(dict.fromkeys(COLUMNS[column] for column in self.columns))
+
+
+def listing_serializer_for(serializer):
+    """ListingSerializer for a list serializer, or None to read Post as usual."""
+    if not listing_enabled():
+        return None
+    return ListingSerializer.for_serializer(serializer)
+
+
+# --- Maintenance ---
+
+def listing_from_post(post):
+    author = post.author
+    return PostListing(
+        id=post.pk,
+        title=post.title,
+        excerpt=post.excerpt,
+        word_count=post.word_count,
+        reading_time=post.reading_time,
+        author_id=author.pk,
+        author_username=author.username,
+        author_first_name=author.first_name,
+        author_last_name=author.last_name,
+        author_email=author.email,
+        created_at=post.created_at,
+        featured_image=post.featured_image.name or None,
+        image_renditions=post.image_renditions,
+    )
+
+
+def _upsert(posts):
+    PostListing.objects.bulk_create(
+        [listing_from_post(post) for post in posts],
+        update_conflicts=True, unique_fields=['id'], update_fields=LISTING_FIELDS,
+    )
+
+
+def sync_posts(post_ids):
+    """Bring the listing rows of these posts up to date (deleting gone ones)."""
+    if not listing_enabled():
+        return
+    post_ids = list(post_ids)
+    posts = list(Post.objects.filter(id__in=post_ids).select_related('author').defer('content'))
+    with transaction.atomic():
+        _upsert(posts)
+        gone = set(post_ids) - {post.pk for post in posts}
+        if gone:
+            PostListing.objects.filter(id__in=gone).delete()
+
+
+def sync_post(post):
+    if listing_enabled():
+        _upsert([post])
+
+
+def remove_post(post_id):
+    if listing_enabled():
+        PostListing.objects.filter(id=post_id).delete()
+
+
+def sync_author(user):
+    """Copy a user's current name fields onto all of their listing rows."""
+    if listing_enabled():
+        PostListing.objects.filter(author_id=user.pk).update(
+            author_username=user.username,
+            author_first_name=user.first_name,
+            author_last_name=user.last_name,
+            author_email=user.email,
+        )
+
+
+def rebuild(chunk_size=DEFAULT_CHUNK_SIZE):
+    """Recreate every listing row from Post in one transaction; returns the count."""
+    total = 0
+    with transaction.atomic():
+        PostListing.objects.all().delete()
+        queryset = Post.objects.select_related('author').defer('content').order_by('id')
+        last_id = 0
+        while True:
+            # Keyset walk over the primary key: flat cost per chunk
+            posts = list(queryset.filter(id__gt=last_id)[:chunk_size])
+            if not posts:
+                break
+            PostListing.objects.bulk_create([listing_from_post(post) for post in posts])
+            total += len(posts)
+            last_id = posts[-1].pk
+    return total
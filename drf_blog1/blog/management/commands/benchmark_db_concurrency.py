@@ -0,0 +1,113 @@
+import logging
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from blog.database import DEFAULT_SQLITE_PRAGMAS
+from blog.models import Post
+
+# "stock": Django defaults (rollback journal, a new connection per request).
+# "tuned": the project defaults (WAL etc. and persistent connections).
+SCENARIOS = {
+    'stock': {'pragmas': {**dict.fromkeys(DEFAULT_SQLITE_PRAGMAS), 'journal_mode': 'DELETE'}, 'conn_max_age': 0},
+    'tuned': {'pragmas': None, 'conn_max_age': 60},
+}
+
+
+class Command(BaseCommand):
+    help = ('Hammer the post API from parallel threads against a scratch SQLite file, '
+            'with stock settings and with the tuned connection settings.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--requests', type=int, default=200, help='Requests per thread.')
+        parser.add_argument('--write-ratio', type=float, default=0.1,
+                            help='Share of requests that create a post.')
+        parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), default=['stock', 'tuned'])
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.use_scratch_database(os.path.join(tmp, 'bench.sqlite3'))
+            # The response cache would hide the database; measure the database
+            with override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False}, ALLOWED_HOSTS=['localhost']):
+                call_command('migrate', verbosity=0)
+                user = User.objects.create_user(username='bench', password='unused-password')
+                Post.objects.bulk_create(
+                    Post(title=f'Seed post {i}', content='Lorem ipsum ' * 50, author=user) for i in range(500)
+                )
+                for name in options['scenarios']:
+                    self.report(name, self.run_scenario(name, user, options))
+            connections.close_all()
+
+    def use_scratch_database(self, path):
+        connections.close_all()
+        for settings_dict in (connections.settings['default'], connections['default'].settings_dict):
+            settings_dict['ENGINE'] = 'django.db.backends.sqlite3'
+            settings_dict['NAME'] = path
+
+    def run_scenario(self, name, user, options):
+        scenario = SCENARIOS[name]
+        connections.close_all()
+        connections.settings['default']['CONN_MAX_AGE'] = scenario['conn_max_age']
+
+        overrides = {} if scenario['pragmas'] is None else {'BLOG_SQLITE_PRAGMAS': scenario['pragmas']}
+        latencies, errors = [], []
+        lock = threading.Lock()
+        post_ids = list(Post.objects.values_list('id', flat=True)[:200])
+
+        def worker(seed):
+            rng = random.Random(seed)
+            client = APIClient(HTTP_HOST='localhost')
+            client.force_authenticate(user)
+            mine, failed = [], 0
+            for _ in range(options['requests']):
+                started = time.perf_counter()
+                try:
+                    roll = rng.random()
+                    if roll < options['write_ratio']:
+                        response = client.post('/api/posts/create/', {'title': 'Bench', 'content': 'Body'}, format='json')
+                    elif roll < 0.5:
+                        response = client.get('/api/posts/')
+                    else:
+                        response = client.get(f'/api/posts/{rng.choice(post_ids)}/')
+                    if response.status_code >= 500:
+                        failed += 1
+                except OperationalError: # "database is locked"
+                    failed += 1
+                mine.append(time.perf_counter() - started)
+            connections.close_all()
+            with lock:
+                latencies.extend(mine)
+                errors.append(failed)
+
+        request_logger = logging.getLogger('django.request')
+        level, request_logger.level = request_logger.level, logging.CRITICAL # Counted, not logged
+        with override_settings(**overrides):
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(options['threads'])]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        request_logger.setLevel(level)
+        return {'elapsed': elapsed, 'latencies': latencies, 'errors': sum(errors)}
+
+    def report(self, name, result):
+        latencies = sorted(result['latencies'])
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        self.stdout.write(
+            f"{name:>6}: {len(latencies) / result['elapsed']:8.0f} req/s   "
+            f"p50 {statistics.median(latencies) * 1000:6.1f} ms   "
+            f"p95 {p95 * 1000:6.1f} ms   errors {result['errors']}"
+        )
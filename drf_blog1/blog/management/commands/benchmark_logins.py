@@ -0,0 +1,104 @@
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from blog import passwords
+
+PASSWORD = 'Bench-password-1'
+
+# "stock": Django's defaults (PBKDF2, checked inline on the request thread).
+# "pooled": the project settings (scrypt/Argon2, checked in the process pool).
+SCENARIOS = {
+    'stock': {
+        'PASSWORD_HASHERS': ['django.contrib.auth.hashers.PBKDF2PasswordHasher'],
+        'AUTHENTICATION_BACKENDS': ['django.contrib.auth.backends.ModelBackend'],
+    },
+    'pooled': {},
+}
+
+
+class Command(BaseCommand):
+    help = ('Log in through /api/token/ from parallel threads against a scratch SQLite file, '
+            'with stock password hashing and with the pooled hashers; reports logins/sec per core.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent clients (web worker threads).')
+        parser.add_argument('--logins', type=int, default=10, help='Logins per thread.')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Hashing processes for "pooled".')
+        parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), default=['stock', 'pooled'])
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.use_scratch_database(os.path.join(tmp, 'bench.sqlite3'))
+            with override_settings(ALLOWED_HOSTS=['localhost']):
+                call_command('migrate', verbosity=0)
+                for name in options['scenarios']:
+                    self.report(name, self.run_scenario(name, options))
+            connections.close_all()
+
+    def use_scratch_database(self, path):
+        connections.close_all()
+        for settings_dict in (connections.settings['default'], connections['default'].settings_dict):
+            settings_dict['ENGINE'] = 'django.db.backends.sqlite3'
+            settings_dict['NAME'] = path
+
+    def run_scenario(self, name, options):
+        pool = {**passwords.password_pool_settings(), 'WORKERS': options['workers'],
+                'MAX_PENDING': max(options['threads'], passwords.password_pool_settings()['MAX_PENDING'])}
+        latencies, refused = [], []
+        lock = threading.Lock()
+
+        def worker(index):
+            client = APIClient(HTTP_HOST='localhost')
+            mine, overloaded = [], 0
+            for _ in range(options['logins']):
+                started = time.perf_counter()
+                response = client.post('/api/token/', {'username': f'{name}-{index}', 'password': PASSWORD}, format='json')
+                if response.status_code == 429:
+                    overloaded += 1
+                elif response.status_code != 200:
+                    raise RuntimeError(f'Login failed: {response.status_code} {response.content[:200]}')
+                mine.append(time.perf_counter() - started)
+            connections.close_all()
+            with lock:
+                latencies.extend(mine)
+                refused.append(overloaded)
+
+        request_logger = logging.getLogger('django.request')
+        level, request_logger.level = request_logger.level, logging.CRITICAL # Counted, not logged
+        with override_settings(BLOG_PASSWORD_POOL=pool, **SCENARIOS[name]):
+            encoded = make_password(PASSWORD) # One hash for every bench user: setup stays fast
+            User.objects.bulk_create(User(username=f'{name}-{i}', password=encoded) for i in range(options['threads']))
+            if settings.AUTHENTICATION_BACKENDS == ['blog.passwords.PooledModelBackend']:
+                passwords.run_verify(PASSWORD, encoded) # Start the pool outside the timing
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(options['threads'])]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        request_logger.setLevel(level)
+        return {'elapsed': elapsed, 'latencies': latencies, 'refused': sum(refused), 'hasher': encoded.split('$')[0]}
+
+    def report(self, name, result):
+        latencies = sorted(result['latencies'])
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        rate = (len(latencies) - result['refused']) / result['elapsed']
+        self.stdout.write(
+            f"{name:>6} ({result['hasher']}): {rate:7.1f} logins/s   {rate / os.cpu_count():7.1f} per core   "
+            f"p50 {statistics.median(latencies) * 1000:7.1f} ms   "
+            f"p95 {p95 * 1000:7.1f} ms   429s {result['refused']}"
+        )
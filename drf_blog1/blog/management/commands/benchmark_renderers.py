@@ -0,0 +1,59 @@
+import datetime
+import time
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from blog import renderers
+from blog.renderers import FastJSONRenderer
+
+
+def post_payload(count):
+    """A paginated post-list response shaped like PostListSerializer output."""
+    now = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    author = {
+        'id': 1, 'username': 'author', 'first_name': 'Ada',
+        'last_name': 'Lovelace', 'email': 'ada@example.com',
+    }
+    results = [
+        {
+            'id': i,
+            'title': f'Post number {i} about Django performance',
+            'author': author,
+            'created_at': now - datetime.timedelta(minutes=i),
+            'featured_image': f'http://localhost:8001/media/blog_images/{i}.jpg' if i % 3 else None,
+            'request_id': uuid.uuid4(),
+            'score': Decimal('4.25'),
+        }
+        for i in range(count)
+    ]
+    return {'next': None, 'previous': None, 'results': results}
+
+
+class Command(BaseCommand):
+    help = 'Compare FastJSONRenderer with the stock DRF JSONRenderer on post-list payloads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 10000],
+                            help='Number of posts per payload.')
+        parser.add_argument('--repeat', type=int, default=20, help='Renders per measurement.')
+
+    def time_render(self, renderer, data, repeat):
+        renderer.render(data)  # warm up
+        start = time.perf_counter()
+        for _ in range(repeat):
+            output = renderer.render(data)
+        return (time.perf_counter() - start) / repeat, len(output)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Accelerated engine: {renderers.ENGINE or 'none (stdlib fallback)'}")
+        for size in options['sizes']:
+            data = post_payload(size)
+            stock, stock_bytes = self.time_render(JSONRenderer(), data, options['repeat'])
+            fast, fast_bytes = self.time_render(FastJSONRenderer(), data, options['repeat'])
+            self.stdout.write(
+                f"{size:>7} posts: stock {stock * 1000:8.2f} ms, fast {fast * 1000:8.2f} ms, "
+                f"speedup {stock / fast:5.1f}x ({stock_bytes} / {fast_bytes} bytes)"
+            )
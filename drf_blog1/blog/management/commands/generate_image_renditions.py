@@ -0,0 +1,43 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from blog.images import generate_for_post, rendition_settings
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Generate resized featured_image renditions for existing posts, in parallel.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Images processed at once.')
+        parser.add_argument('--force', action='store_true',
+                            help='Regenerate posts that already have renditions (e.g. after changing SIZES).')
+
+    def handle(self, *args, **options):
+        queryset = Post.objects.exclude(featured_image='').exclude(featured_image__isnull=True)
+        if not options['force']:
+            queryset = queryset.filter(image_renditions={})
+        post_ids = list(queryset.order_by('id').values_list('id', flat=True))
+        settings = rendition_settings()
+
+        def work(post_id):
+            try:
+                return generate_for_post(post_id, settings, force=options['force']) is not None
+            finally:
+                connections.close_all()  # This worker thread's own connection
+
+        started = time.perf_counter()
+        if options['workers'] > 1:
+            with ThreadPoolExecutor(options['workers']) as pool:
+                done = sum(pool.map(work, post_ids))
+        else:
+            done = sum(generate_for_post(post_id, settings, force=options['force']) is not None for post_id in post_ids)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated renditions for {done} of {len(post_ids)} posts in {elapsed:.2f}s."
+        ))
+        if done < len(post_ids):
+            self.stdout.write(self.style.WARNING('Skipped posts had missing or unreadable images (see the log).'))
@@ -0,0 +1,86 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from blog.cache import bump_post_generation
+from blog.importer import (
+    DEFAULT_BATCH_SIZE, PostImporter, RowError,
+    detect_format, load_checkpoint, open_source, read_records, save_checkpoint,
+)
+from blog.webhooks import notify_change
+
+
+class Command(BaseCommand):
+    help = 'Import posts from NDJSON or CSV (optionally gzipped) with batched bulk inserts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='File to read ("-" for stdin). .csv and .gz are detected from the name.')
+        parser.add_argument('--format', choices=['ndjson', 'csv'], help='Override format detection.')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help='Rows per bulk insert and transaction.')
+        parser.add_argument('--default-author', help='Username for rows whose author is missing or unknown.')
+        parser.add_argument('--media-source', help='Directory that featured_image paths are relative to; '
+                                                   'files are copied into media storage. Without it, '
+                                                   'featured_image is kept as an existing storage name.')
+        parser.add_argument('--image-workers', type=int, default=0,
+                            help='Copy images on this many threads instead of inline.')
+        parser.add_argument('--checkpoint', help='File recording progress; rerun with the same file to resume.')
+
+    def handle(self, *args, **options):
+        source = options['source']
+        fmt = options['format'] or detect_format(source)
+        start = load_checkpoint(options['checkpoint'])
+        try:
+            importer = PostImporter(
+                batch_size=options['batch_size'],
+                default_author=options['default_author'],
+                media_source=options['media_source'],
+                image_workers=options['image_workers'],
+            )
+        except RowError as exc:
+            raise CommandError(str(exc))
+        if start:
+            self.stdout.write(f'Resuming after record {start}.')
+
+        started = time.perf_counter()
+        position = 0
+        try:
+            with open_source(source) as stream:
+                batch = []
+                for position, record in enumerate(read_records(stream, fmt), start=1):
+                    if position <= start:
+                        continue
+                    batch.append((position, record))
+                    if len(batch) >= options['batch_size']:
+                        self.write_batch(importer, batch, options, started)
+                        batch = []
+                if batch:
+                    self.write_batch(importer, batch, options, started)
+            importer.finish()
+        finally:
+            if importer.imported:
+                # bulk_create sends no post_save signals: invalidate caches once here
+                bump_post_generation()
+                transaction.on_commit(notify_change)
+
+        elapsed = time.perf_counter() - started
+        for error_position, message in importer.errors[:20]:
+            where = f'record {error_position}' if error_position else 'image copy'
+            self.stderr.write(f'{where}: {message}')
+        if len(importer.errors) > 20:
+            self.stderr.write(f'... and {len(importer.errors) - 20} more errors.')
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {importer.imported} posts in {elapsed:.1f}s '
+            f'({importer.imported / elapsed if elapsed else 0:,.0f} rows/sec), '
+            f'skipped {len(importer.errors)}.'
+        ))
+
+    def write_batch(self, importer, batch, options, started):
+        importer.write_batch(batch)
+        position = batch[-1][0]
+        save_checkpoint(options['checkpoint'], position, importer.imported)
+        if options['verbosity'] > 1:
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f'  {position} records read, {importer.imported} imported '
+                              f'({importer.imported / elapsed:,.0f} rows/sec)')
@@ -0,0 +1,16 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.archive import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recount the per-month post archive table (blog_postarchivemonth) from Post.'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        total = rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {total} archive months in {time.perf_counter() - started:.2f}s."
+        ))
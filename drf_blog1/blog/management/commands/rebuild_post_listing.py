@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.listing import DEFAULT_CHUNK_SIZE, listing_enabled, rebuild
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized post listing table (blog_postlisting) from Post.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help='Posts read and written per round trip.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        total = rebuild(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {total} listing rows in {time.perf_counter() - started:.2f}s."
+        ))
+        if not listing_enabled():
+            self.stdout.write(self.style.WARNING(
+                'BLOG_POST_LISTING is off: the list endpoints ignore the table and it is not kept up to date.'
+            ))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Create (if missing) and rebuild the full-text search index for posts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias to rebuild.')
+
+    def handle(self, *args, **options):
+        backend = get_search_backend(options['database'])
+        backend.install()
+        if not backend.is_available():
+            raise CommandError(
+                f"No full-text search support on the '{backend.connection.vendor}' backend; "
+                "search falls back to substring matching."
+            )
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt full-text search index ({backend.__class__.__name__})."
+        ))
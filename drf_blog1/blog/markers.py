@@ -0,0 +1,54 @@
+"""
+Database-backed change markers (ChangeMarker rows).
+
+Generation counters live in a cache, which may be per process; anything
+every worker has to agree on (ETags, Last-Modified, the content version sent
+to the frontend) is built from the database instead. Post rows carry their
+own updated_at; changes that don't touch them, like an author renaming
+themselves, touch a marker here in the same transaction.
+
+content_version() is the exception that proves the rule: with a cache alias
+shared by all workers it reads the generation counters (no query at all),
+otherwise it falls back to the database like the validators do.
+"""
+from django.db.models import Count, Max, Subquery
+from django.utils import timezone
+
+from .cache import cache_settings, is_process_local, list_version
+from .models import ChangeMarker, Post
+
+AUTHORS = 'authors'
+
+
+def touch(name):
+    ChangeMarker.objects.update_or_create(name=name, defaults={'changed_at': timezone.now()})
+
+
+def changed_at(name):
+    return ChangeMarker.objects.filter(name=name).values_list('changed_at', flat=True).first()
+
+
+def changed_at_subquery(name):
+    """changed_at as a subquery, to read it in the same query as post rows."""
+    return Subquery(ChangeMarker.objects.filter(name=name).values('changed_at')[:1])
+
+
+def _micros(moment):
+    return int(moment.timestamp() * 1_000_000) if moment else 0
+
+def database_version():
+    """Post count, newest updated_at and the authors marker, as one string."""
+    stats = Post.objects.order_by().aggregate(updated_at=Max('updated_at'), count=Count('id'))
+    return '.'.join(map(str, [
+        stats['count'], _micros(stats['updated_at']), _micros(changed_at(AUTHORS)),
+    ]))
+
+def content_version():
+    """
+    Moves whenever any post or author changes, and is the same in every
+    worker (GET /api/posts/version/ and the change webhook).
+    """
+    if is_process_local(cache_settings()['ALIAS']):
+        # Per-process counters are seeded per process; don't let workers disagree
+        return database_version()
+    return list_version(None)
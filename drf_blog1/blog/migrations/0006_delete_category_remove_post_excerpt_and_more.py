@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:50
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_auto_20251024_1612'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='Category',
+        ),
+        migrations.RemoveField(
+            model_name='post',
+            name='excerpt',
+        ),
+        migrations.RemoveField(
+            model_name='post',
+            name='publish_date',
+        ),
+        migrations.RemoveField(
+            model_name='post',
+            name='slug',
+        ),
+        migrations.RemoveField(
+            model_name='post',
+            name='status',
+        ),
+    ]
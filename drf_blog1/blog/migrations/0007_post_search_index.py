@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def install_search_index(apps, schema_editor):
+    from blog.search import get_search_backend
+    backend = get_search_backend(schema_editor.connection.alias)
+    backend.install()
+    if backend.is_available():
+        backend.rebuild() # Index the posts that already exist; triggers only see later writes
+
+
+def uninstall_search_index(apps, schema_editor):
+    from blog.search import get_search_backend
+    get_search_backend(schema_editor.connection.alias).uninstall()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_delete_category_remove_post_excerpt_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
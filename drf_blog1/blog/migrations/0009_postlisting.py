@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-18 07:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostListing',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200)),
+                ('excerpt', models.TextField(blank=True)),
+                ('author_id', models.IntegerField(db_index=True)),
+                ('author_username', models.CharField(max_length=150)),
+                ('author_first_name', models.CharField(blank=True, max_length=150)),
+                ('author_last_name', models.CharField(blank=True, max_length=150)),
+                ('author_email', models.CharField(blank=True, max_length=254)),
+                ('created_at', models.DateTimeField()),
+                ('featured_image', models.CharField(blank=True, max_length=100, null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['-created_at', 'id'], name='blog_listing_created_idx')],
+            },
+        ),
+    ]
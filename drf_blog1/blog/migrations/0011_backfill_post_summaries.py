@@ -0,0 +1,61 @@
+import math
+import re
+
+from django.db import migrations, transaction
+
+CHUNK_SIZE = 2000
+
+# A frozen copy of blog.models.summarize() as of this migration: later
+# changes to the live function must not change what this backfill wrote
+EXCERPT_LENGTH = 200
+WORDS_PER_MINUTE = 200
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def summarize(content, length=EXCERPT_LENGTH):
+    """(excerpt, word count, reading time in minutes) for a post body."""
+    text = WHITESPACE_RE.sub(' ', content or '').strip()
+    words = len(text.split(' ')) if text else 0
+    excerpt = text
+    if len(text) > length:
+        # Cut at a word boundary
+        excerpt = (text[:length].rsplit(' ', 1)[0] or text[:length]).rstrip(' .,;:') + '…'
+    return excerpt, words, math.ceil(words / WORDS_PER_MINUTE)
+
+
+def backfill(apps, schema_editor):
+    """Fill excerpt/word_count/reading_time in keyset-ordered chunks, one transaction each."""
+    Post = apps.get_model('blog', 'Post')
+    PostListing = apps.get_model('blog', 'PostListing')
+    using = schema_editor.connection.alias
+    last_id = 0
+    while True:
+        posts = list(
+            Post.objects.using(using).filter(id__gt=last_id).order_by('id').only('id', 'content')[:CHUNK_SIZE]
+        )
+        if not posts:
+            break
+        for post in posts:
+            post.excerpt, post.word_count, post.reading_time = summarize(post.content)
+        listings = PostListing.objects.using(using).in_bulk([post.id for post in posts])
+        for post in posts:
+            listing = listings.get(post.id)
+            if listing is not None:
+                listing.excerpt, listing.word_count, listing.reading_time = post.excerpt, post.word_count, post.reading_time
+        with transaction.atomic(using=using):
+            Post.objects.using(using).bulk_update(posts, ['excerpt', 'word_count', 'reading_time'])
+            PostListing.objects.using(using).bulk_update(listings.values(), ['excerpt', 'word_count', 'reading_time'])
+        last_id = posts[-1].id
+
+
+class Migration(migrations.Migration):
+    # Each chunk commits on its own, so a large table is not held in one transaction
+    atomic = False
+
+    dependencies = [
+        ('blog', '0010_post_summary_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 07:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_backfill_post_summaries'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='postlisting',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-18 07:29
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0012_post_image_renditions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='author',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='blog_posts', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='postlisting',
+            name='author_id',
+            field=models.IntegerField(),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', '-created_at'], name='blog_post_author_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postlisting',
+            index=models.Index(fields=['author_id', '-created_at'], name='blog_listing_author_idx'),
+        ),
+    ]
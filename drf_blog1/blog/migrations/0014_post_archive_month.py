@@ -0,0 +1,50 @@
+# Generated by Django 4.2.7 on 2026-10-18 07:34
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def backfill(apps, schema_editor):
+    """Count existing posts per month: the one full GROUP BY the archive ever needs."""
+    Post = apps.get_model('blog', 'Post')
+    PostArchiveMonth = apps.get_model('blog', 'PostArchiveMonth')
+    using = schema_editor.connection.alias
+    # Same query as blog.archive.month_counts(), frozen here with the historical models
+    month_counts = (
+        Post.objects.using(using).order_by()
+        .annotate(year=ExtractYear('created_at'), month=ExtractMonth('created_at'))
+        .values_list('year', 'month')
+        .annotate(count=Count('id'))
+    )
+    PostArchiveMonth.objects.using(using).bulk_create(
+        PostArchiveMonth(year=year, month=month, post_count=count)
+        for year, month, count in month_counts
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_author_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostArchiveMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('post_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-year', '-month'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='postarchivemonth',
+            constraint=models.UniqueConstraint(fields=('year', 'month'), name='blog_archive_month_unique'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,20 +1,146 @@
+import math
+import re
+
 from django.db import models
 from django.contrib.auth.models import User
-from django.utils import timezone
+
+EXCERPT_LENGTH = 200
+WORDS_PER_MINUTE = 200
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Derived from content on save; listed in update_fields whenever content is
+SUMMARY_FIELDS = ['excerpt', 'word_count', 'reading_time']
+
+
+def summarize(content, length=EXCERPT_LENGTH):
+    """(excerpt, word count, reading time in minutes) for a post body."""
+    text = WHITESPACE_RE.sub(' ', content or '').strip()
+    words = len(text.split(' ')) if text else 0
+    excerpt = text
+    if len(text) > length:
+        # Cut at a word boundary
+        excerpt = (text[:length].rsplit(' ', 1)[0] or text[:length]).rstrip(' .,;:') + '…'
+    return excerpt, words, math.ceil(words / WORDS_PER_MINUTE)
+
+
+class TimestampField(models.DateTimeField):
+    """
+    DateTimeField whose auto_now / auto_now_add an instance can opt out of by
+    setting keep_timestamps = True (imports keeping the source's dates).
+    Migrations see a plain DateTimeField.
+    """
+    def pre_save(self, model_instance, add):
+        if getattr(model_instance, 'keep_timestamps', False):
+            return getattr(model_instance, self.attname)
+        return super().pre_save(model_instance, add)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        return name, 'django.db.models.DateTimeField', args, kwargs
+
 
 class Post(models.Model):
     title = models.CharField(max_length=200)
     content = models.TextField()
-    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='blog_posts')
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    # Indexed by blog_post_author_created_idx below, which leads with author_id
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='blog_posts', db_index=False)
+    created_at = TimestampField(auto_now_add=True)
+    updated_at = TimestampField(auto_now=True)
     featured_image = models.ImageField(upload_to='blog_images/', blank=True, null=True)
+    # {"card": {"width": 640, "height": 427, "webp": <name>, "jpeg": <name>}, ...}, filled by blog/images.py
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
+    # Computed from content (summarize()) so lists never load the body
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH + 1, blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveIntegerField(default=0, editable=False) # Minutes
     
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['-created_at']),
+            # max(updated_at) for list ETag / Last-Modified validators
+            models.Index(fields=['updated_at']),
+            # Per-author feed: WHERE author_id = ? ORDER BY created_at DESC, straight from the index
+            models.Index(fields=['author', '-created_at'], name='blog_post_author_created_idx'),
         ]
     
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+    def refresh_summary(self):
+        """Recompute the excerpt/word count/reading time; bulk writes must call this."""
+        self.excerpt, self.word_count, self.reading_time = summarize(self.content)
+
+    def save(self, *args, **kwargs):
+        self.refresh_summary()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'content' in update_fields:
+            kwargs['update_fields'] = {*update_fields, *SUMMARY_FIELDS}
+        super().save(*args, **kwargs)
+
+
+class PostListing(models.Model):
+    """
+    Denormalized, read-only copy of what the post list shows, one row per
+    post, so listing is a single-table index scan with no join to auth_user.
+    Kept in sync by blog/listing.py; rebuild with `manage.py rebuild_post_listing`.
+    """
+    id = models.BigIntegerField(primary_key=True) # Same as Post.id
+    title = models.CharField(max_length=200)
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH + 1, blank=True)
+    word_count = models.PositiveIntegerField(default=0)
+    reading_time = models.PositiveIntegerField(default=0)
+    author_id = models.IntegerField()
+    author_username = models.CharField(max_length=150)
+    author_first_name = models.CharField(max_length=150, blank=True)
+    author_last_name = models.CharField(max_length=150, blank=True)
+    author_email = models.CharField(max_length=254, blank=True)
+    created_at = models.DateTimeField()
+    featured_image = models.CharField(max_length=100, blank=True, null=True) # Storage name, as on Post
+    image_renditions = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination order (-created_at, id)
+            models.Index(fields=['-created_at', 'id'], name='blog_listing_created_idx'),
+            # Per-author feed (and author renames)
+            models.Index(fields=['author_id', '-created_at'], name='blog_listing_author_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class PostArchiveMonth(models.Model):
+    """
+    Number of posts created in each calendar month (in TIME_ZONE), for
+    /api/archive/ and the admin's month filter. Incremented and decremented
+    by blog/archive.py as posts are created and deleted, so reading the
+    archive never scans blog_post.
+    """
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    post_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-year', '-month']
+        constraints = [
+            models.UniqueConstraint(fields=['year', 'month'], name='blog_archive_month_unique'),
+        ]
+
+    def __str__(self):
+        return f'{self.year}-{self.month:02d}: {self.post_count}'
+
+
+class ChangeMarker(models.Model):
+    """
+    When something that post rows don't record last changed, by name (e.g.
+    "authors": a username or name edit). Read by the HTTP validators and the
+    content version (blog/markers.py), which must agree across processes.
+    """
+    name = models.CharField(max_length=32, primary_key=True)
+    changed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f'{self.name}: {self.changed_at}'
@@ -0,0 +1,123 @@
+"""
+Password checks off the request thread, with admission control.
+
+Verifying a password is deliberately slow: a few hundred milliseconds of
+CPU for PBKDF2, about half a second for scrypt at the cost set in
+blog/hashing.py. If every request worker hashes inline, a burst of logins
+(everyone signing in at the start of a shift) takes all the CPUs, and reads
+queue behind it.
+
+PooledModelBackend replaces ModelBackend for authenticate(), which is
+called by /api/token/ and UserLoginSerializer. The hash runs in a small
+process pool (WORKERS processes, so it uses cores outside the web workers'
+GIL), and at most MAX_PENDING checks may be running or queued per web
+process. A login past that limit, or one that waits longer than TIMEOUT,
+fails fast with LoginOverloaded and does not add to the queue. That is a
+plain exception, since authenticate() is also called outside DRF:
+exception_handler() (REST_FRAMEWORK['EXCEPTION_HANDLER']) answers it with
+429 Too Many Requests and a Retry-After header, and the admin login form
+(blog/admin.py) shows it as a form error.
+
+Hashes made with an older or weaker hasher than PASSWORD_HASHERS[0] (e.g.
+PBKDF2 after switching to Argon2/scrypt) are rehashed by the pool on the
+next successful login, and the new hash is saved. `manage.py
+benchmark_logins` measures logins/sec before and after.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from rest_framework.exceptions import Throttled
+from rest_framework.views import exception_handler as default_exception_handler
+
+from .hashing import init_worker, verify_password
+
+DEFAULTS = {
+    'WORKERS': 2,  # Hashing processes; 0 hashes inline (tests, scripts)
+    'MAX_PENDING': 32,  # Checks running or queued per web process before 429s
+    'TIMEOUT': 10,  # Seconds a login may wait for its check
+    'RETRY_AFTER': 2,  # Seconds, sent with the 429
+}
+
+_executor = None
+_admission = None
+_lock = threading.Lock()
+
+
+def password_pool_settings():
+    return {**DEFAULTS, **getattr(settings, 'BLOG_PASSWORD_POOL', {})}
+
+
+class LoginOverloaded(Exception):
+    """Raised by authenticate() when the password pool is full or too slow."""
+    message = 'Too many logins in progress, please retry shortly.'
+
+    def __init__(self, retry_after):
+        super().__init__(self.message)
+        self.retry_after = retry_after
+
+
+def exception_handler(exc, context):
+    """DRF's handler, with LoginOverloaded answered as 429 + Retry-After."""
+    if isinstance(exc, LoginOverloaded):
+        exc = Throttled(wait=exc.retry_after, detail=exc.message, code='login_overloaded')
+    return default_exception_handler(exc, context)
+
+
+def get_executor(options):
+    global _executor, _admission
+    with _lock:
+        if _executor is None:
+            # spawn, not fork: web processes run threads (image renditions, cache refreshes)
+            _executor = ProcessPoolExecutor(
+                options['WORKERS'], mp_context=multiprocessing.get_context('spawn'), initializer=init_worker,
+            )
+            _admission = threading.BoundedSemaphore(options['MAX_PENDING'])
+        return _executor, _admission
+
+
+def run_verify(password, encoded):
+    """verify_password() in the pool, or LoginOverloaded if the pool is full or too slow."""
+    options = password_pool_settings()
+    if not options['WORKERS']:
+        return verify_password(password, encoded)
+    executor, admission = get_executor(options)
+    if not admission.acquire(blocking=False):
+        raise LoginOverloaded(options['RETRY_AFTER'])
+    try:
+        future = executor.submit(verify_password, password, encoded)
+    except Exception:
+        admission.release()
+        raise
+    future.add_done_callback(lambda _: admission.release()) # Counts queued checks until they finish
+    try:
+        return future.result(timeout=options['TIMEOUT'])
+    except FutureTimeoutError:
+        raise LoginOverloaded(options['RETRY_AFTER'])
+
+
+class PooledModelBackend(ModelBackend):
+    """ModelBackend with the hash check run by run_verify()."""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            run_verify(password, None)
+            return None
+        correct, rehashed = run_verify(password, user.password)
+        if not correct:
+            return None
+        if rehashed:
+            user.password = rehashed
+            user.save(update_fields=['password'])
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,101 @@
+"""
+High-speed JSON renderer and parser for the API.
+
+Uses orjson when installed, then msgspec, and otherwise falls back to DRF's
+stdlib-json implementation, so the API works (just slower) without either.
+datetime and UUID are encoded natively by the accelerated libraries; Decimal
+and anything else DRF's JSONEncoder knows (lazy strings, timedelta,
+querysets, ...) go through a default hook that reuses that encoder, so the
+output matches the stock JSONRenderer.
+
+Compare with the stock renderer using: python manage.py benchmark_renderers
+"""
+import decimal
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+_drf_encoder = encoders.JSONEncoder()
+
+
+def encode_default(obj):
+    """Encode types the accelerated library doesn't handle, exactly as DRF would."""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    return _drf_encoder.default(obj)
+
+
+if orjson is not None:
+    ENGINE = 'orjson'
+    _orjson_options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def dumps(data):
+        return orjson.dumps(data, default=encode_default, option=_orjson_options)
+
+    loads = orjson.loads
+    EncodeError = orjson.JSONEncodeError
+    DecodeError = orjson.JSONDecodeError
+elif msgspec is not None:
+    ENGINE = 'msgspec'
+    # msgspec writes Decimal as a string by default; DRF writes a number
+    _encoder = msgspec.json.Encoder(enc_hook=encode_default, decimal_format='number')
+    _decoder = msgspec.json.Decoder()
+    dumps = _encoder.encode
+    loads = _decoder.decode
+    EncodeError = msgspec.EncodeError
+    DecodeError = msgspec.DecodeError
+else:
+    ENGINE = None
+    dumps = loads = None
+    EncodeError = DecodeError = ValueError
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer backed by orjson/msgspec when available."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # Pretty-printing (?format=json; indent=4, browsable API) and ASCII-only
+        # output are rare; leave those to the stock renderer.
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if dumps is None or indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = dumps(data)
+        except EncodeError:
+            # e.g. integers wider than 64 bits; stdlib json copes with those
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same JavaScript-safety escaping as JSONRenderer
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser backed by orjson/msgspec when available."""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if loads is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            # Both libraries reject NaN/Infinity, matching STRICT_JSON
+            return loads(stream.read())
+        except DecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
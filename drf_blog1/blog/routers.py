@@ -0,0 +1,206 @@
+"""
+Primary/replica database routing for API requests.
+
+Writes always go to the primary ('default'). Reads made while serving a
+GET/HEAD/OPTIONS request go to a replica from BLOG_DB_ROUTING['REPLICAS'],
+picked once per request so all its queries see one consistent snapshot:
+
+* round_robin:  replicas take turns;
+* least_loaded: the replica with the fewest requests in flight in this
+  process.
+
+Reads stay on the primary:
+
+* for the rest of a request once it has written anything;
+* for PIN_SECONDS after an authenticated user's successful write
+  (read-your-writes), so a post is visible to its author right after
+  creating or editing it, whatever the replication lag. The pin is keyed
+  by user id in the CACHE alias, which must be shared by all workers
+  (check blog.W002); before DRF has authenticated the request (e.g. the
+  ETag validator query in blog/conditional.py) the user id is read from
+  the bearer token;
+* outside requests (management commands, shell, tests without the
+  middleware), where stale data would be surprising.
+
+PrimaryPinningMiddleware tracks the current request for the router. It
+must be installed for replicas to be used at all.
+"""
+import itertools
+import threading
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.utils.functional import SimpleLazyObject, empty
+
+from .cache import is_process_local
+
+PRIMARY = 'default'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+DEFAULTS = {
+    'REPLICAS': [],
+    'STRATEGY': 'round_robin',  # or 'least_loaded'
+    'PIN_SECONDS': 10,
+    'CACHE': 'default',  # Alias holding the pins; shared by all workers
+}
+
+_current_request = ContextVar('blog_db_request', default=None)
+
+
+def routing_settings():
+    return {**DEFAULTS, **getattr(settings, 'BLOG_DB_ROUTING', {})}
+
+
+@checks.register(checks.Tags.caches, checks.Tags.database)
+def check_pin_cache(app_configs, **kwargs):
+    options = routing_settings()
+    if options['REPLICAS'] and is_process_local(options['CACHE']):
+        return [checks.Warning(
+            f"BLOG_DB_ROUTING pins writers to the primary in the per-process LocMemCache alias '{options['CACHE']}'.",
+            hint='A request served by another worker reads from a replica right after the write. '
+                 'Point CACHE at a cache shared by all workers.',
+            id='blog.W002',
+        )]
+    return []
+
+
+def pin_key(user_id):
+    return f'blog:db:pin:{user_id}'
+
+
+def pin_cache():
+    return caches[routing_settings()['CACHE']]
+
+
+def known_user(request):
+    """The request's user if already resolved, without triggering a lookup."""
+    user = request.__dict__.get('user')
+    if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+        return None # Session user not loaded; loading it would query (and recurse)
+    return user
+
+
+def token_user_id(request):
+    """User id from a valid bearer token, before (and without) DRF authentication."""
+    if '_blog_token_user' not in request.__dict__:
+        # Deferred: simplejwt imports auth models, and routers load with the settings
+        from rest_framework_simplejwt.authentication import JWTAuthentication
+        from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+        from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+        authentication = JWTAuthentication()
+        user_id = None
+        header = authentication.get_header(request)
+        raw_token = authentication.get_raw_token(header) if header else None
+        if raw_token is not None:
+            try:
+                user_id = authentication.get_validated_token(raw_token).get(jwt_settings.USER_ID_CLAIM)
+            except (InvalidToken, TokenError):
+                pass # DRF rejects it later; until then, read like an anonymous request
+        request._blog_token_user = user_id
+    return request._blog_token_user
+
+
+# --- Replica selection ---
+
+class ReplicaSelector:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cycle = None
+        self._replicas = None
+        self.in_flight = {}
+
+    def _sync(self, replicas):
+        if replicas != self._replicas:
+            self._replicas = list(replicas)
+            self._cycle = itertools.cycle(self._replicas)
+            self.in_flight = {alias: self.in_flight.get(alias, 0) for alias in self._replicas}
+
+    def acquire(self, replicas, strategy):
+        with self._lock:
+            self._sync(replicas)
+            if strategy == 'least_loaded':
+                alias = min(self._replicas, key=lambda alias: self.in_flight[alias])
+            else:
+                alias = next(self._cycle)
+            self.in_flight[alias] += 1
+            return alias
+
+    def release(self, alias):
+        with self._lock:
+            if alias in self.in_flight:
+                self.in_flight[alias] -= 1
+
+selector = ReplicaSelector()
+
+
+# --- Middleware ---
+
+class PrimaryPinningMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _current_request.set(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_request.reset(token)
+            replica = request.__dict__.pop('_blog_replica', None)
+            if replica:
+                selector.release(replica)
+
+        user = known_user(request)
+        if (request.method not in SAFE_METHODS and response.status_code < 400
+                and user is not None and user.is_authenticated):
+            # DRF copies the token-authenticated user onto the Django request
+            pin_cache().set(pin_key(user.pk), 1, routing_settings()['PIN_SECONDS'])
+        return response
+
+
+# --- Router ---
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        request = _current_request.get()
+        options = routing_settings()
+        if request is None or not options['REPLICAS'] or self.pinned(request, options):
+            return PRIMARY
+        replica = request.__dict__.get('_blog_replica')
+        if replica is None:
+            replica = request._blog_replica = selector.acquire(options['REPLICAS'], options['STRATEGY'])
+        return replica
+
+    def db_for_write(self, model, **hints):
+        request = _current_request.get()
+        if request is not None:
+            request._blog_wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {PRIMARY, *routing_settings()['REPLICAS']}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
+
+    @staticmethod
+    def pinned(request, options):
+        if request.method not in SAFE_METHODS or request.__dict__.get('_blog_wrote'):
+            return True
+        user = known_user(request)
+        if user is not None and user.is_authenticated:
+            user_id = user.pk
+        else:
+            # Not authenticated yet (conditional validators, the JWT user lookup itself)
+            user_id = token_user_id(request)
+        if user_id is None:
+            return False
+        checked = request.__dict__.get('_blog_pinned_for')
+        if checked is None or str(checked[0]) != str(user_id):
+            checked = request._blog_pinned_for = (user_id, pin_cache().get(pin_key(user_id)) is not None)
+        return checked[1]
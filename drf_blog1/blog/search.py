@@ -0,0 +1,249 @@
+"""
+Full-text search for Post.
+
+SQLite uses an FTS5 virtual table (blog_post_fts) that mirrors title/content
+through triggers. PostgreSQL uses a generated tsvector column with a GIN
+index. Both are created by migration 0007, so every write path (save, delete,
+bulk_create, queryset.update) keeps the index in sync without signals.
+"""
+import logging
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'blog_post_fts'
+PG_SEARCH_CONFIG = 'english'
+PG_SEARCH_INDEX = 'blog_post_search_idx'
+
+# Title matches count ten times as much as content matches
+TITLE_WEIGHT = 10.0
+CONTENT_WEIGHT = 1.0
+
+# Cap the number of terms so a pasted paragraph can't build a huge query
+MAX_SEARCH_TERMS = 16
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+SQLITE_SCHEMA = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, content,
+        content='blog_post', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )""",
+]
+
+SQLITE_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS blog_post_fts_ai AFTER INSERT ON blog_post BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS blog_post_fts_ad AFTER DELETE ON blog_post BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS blog_post_fts_au AFTER UPDATE OF title, content ON blog_post BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+]
+
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS blog_post_fts_ai',
+    'DROP TRIGGER IF EXISTS blog_post_fts_ad',
+    'DROP TRIGGER IF EXISTS blog_post_fts_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+POSTGRES_SCHEMA = [
+    f"""ALTER TABLE blog_post ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('{PG_SEARCH_CONFIG}'::regconfig, coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('{PG_SEARCH_CONFIG}'::regconfig, coalesce(content, '')), 'B')
+        ) STORED""",
+    f'CREATE INDEX IF NOT EXISTS {PG_SEARCH_INDEX} ON blog_post USING GIN (search_vector)',
+]
+
+POSTGRES_DROP = [
+    f'DROP INDEX IF EXISTS {PG_SEARCH_INDEX}',
+    'ALTER TABLE blog_post DROP COLUMN IF EXISTS search_vector',
+]
+
+
+def search_terms(query):
+    """Split a user query into lowercase word tokens."""
+    return TOKEN_RE.findall(query.lower())[:MAX_SEARCH_TERMS]
+
+
+class BaseSearchBackend:
+    """Filters and ranks a Post queryset for a search query."""
+
+    def __init__(self, using='default'):
+        self.using = using
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    def is_available(self):
+        return False
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+    def install(self):
+        pass
+
+    def uninstall(self):
+        pass
+
+    def rebuild(self):
+        pass
+
+
+class SubstringSearchBackend(BaseSearchBackend):
+    """The original LIKE '%x%' scan, used when no full-text index exists."""
+
+    def is_available(self):
+        return True
+
+    def search(self, queryset, query):
+        return queryset.filter(
+            Q(title__icontains=query) |
+            Q(content__icontains=query)
+        )
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """FTS5 external-content table ranked with bm25()."""
+
+    _available = None
+
+    def is_available(self):
+        if self._available is None:
+            with self.connection.cursor() as cursor:
+                self._available = FTS_TABLE in self.connection.introspection.table_names(cursor)
+        return self._available
+
+    def match_expression(self, terms):
+        # Every term is an implicit AND and matches as a prefix: "djan"* "rest"*
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def search(self, queryset, query):
+        match = self.match_expression(search_terms(query))
+        # bm25() is lower-is-better, so negate it to keep "higher rank first"
+        rank = RawSQL(
+            f'SELECT -bm25({FTS_TABLE}, %s, %s) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = "blog_post"."id"',
+            (TITLE_WEIGHT, CONTENT_WEIGHT, match),
+            output_field=FloatField(),
+        )
+        return queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,))
+        ).annotate(search_rank=rank).order_by('-search_rank', '-created_at', 'id')
+
+    def install(self):
+        try:
+            with self.connection.cursor() as cursor:
+                for statement in SQLITE_SCHEMA + SQLITE_TRIGGERS:
+                    cursor.execute(statement)
+        except Exception as e:
+            # SQLite builds without FTS5 keep working on the substring backend
+            logger.warning('Full-text search index not installed, using substring search: %s', e)
+        self._available = None
+
+    def install_triggers(self):
+        # Table rebuilds during later migrations drop triggers on blog_post
+        if self.is_available():
+            with self.connection.cursor() as cursor:
+                for statement in SQLITE_TRIGGERS:
+                    cursor.execute(statement)
+
+    def uninstall(self):
+        with self.connection.cursor() as cursor:
+            for statement in SQLITE_DROP:
+                cursor.execute(statement)
+        self._available = None
+
+    def rebuild(self):
+        self.install_triggers()
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Generated tsvector column with a GIN index, ranked with ts_rank()."""
+
+    _available = None
+
+    def is_available(self):
+        if self._available is None:
+            with self.connection.cursor() as cursor:
+                columns = self.connection.introspection.get_table_description(cursor, 'blog_post')
+            self._available = any(column.name == 'search_vector' for column in columns)
+        return self._available
+
+    def tsquery(self, terms):
+        # Every term is ANDed and matches as a prefix: djan:* & rest:*
+        return ' & '.join(f'{term}:*' for term in terms)
+
+    def search(self, queryset, query):
+        tsquery = self.tsquery(search_terms(query))
+        params = (PG_SEARCH_CONFIG, tsquery)
+        return queryset.alias(
+            search_match=RawSQL(
+                '"blog_post"."search_vector" @@ to_tsquery(%s::regconfig, %s)',
+                params, output_field=BooleanField(),
+            )
+        ).filter(search_match=True).annotate(
+            search_rank=RawSQL(
+                'ts_rank("blog_post"."search_vector", to_tsquery(%s::regconfig, %s))',
+                params, output_field=FloatField(),
+            )
+        ).order_by('-search_rank', '-created_at', 'id')
+
+    def install(self):
+        with self.connection.cursor() as cursor:
+            for statement in POSTGRES_SCHEMA:
+                cursor.execute(statement)
+        self._available = None
+
+    def uninstall(self):
+        with self.connection.cursor() as cursor:
+            for statement in POSTGRES_DROP:
+                cursor.execute(statement)
+        self._available = None
+
+    def rebuild(self):
+        # The column is generated by the database, so only the index can go stale
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'REINDEX INDEX {PG_SEARCH_INDEX}')
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+_backends = {}
+
+
+def get_search_backend(using='default'):
+    """Return the full-text backend for a database alias (cached per database)."""
+    connection = connections[using]
+    key = (using, connection.settings_dict['NAME'])
+    if key not in _backends:
+        backend_class = BACKENDS.get(connection.vendor, SubstringSearchBackend)
+        _backends[key] = backend_class(using)
+    return _backends[key]
+
+
+def search_posts(queryset, query):
+    """Filter a Post queryset by a ?search= query, best matches first."""
+    backend = get_search_backend(queryset.db)
+    if not search_terms(query) or not backend.is_available():
+        backend = SubstringSearchBackend(backend.using)
+    return backend.search(queryset, query)
@@ -1,34 +1,140 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
-from .models import Post
+from django.utils import timezone
+from .models import SUMMARY_FIELDS, Post
+from .uploads import RejectedUpload, StoredUpload
+
+# --- Sparse fieldsets (?fields= / ?exclude=) ---
+
+class SparseFieldsetMixin:
+    """
+    Accepts `fields` / `exclude` lists and drops every other field.
+    Dotted names reach into nested serializers: fields=['id', 'author.username'].
+    """
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        exclude = kwargs.pop('exclude', None)
+        super().__init__(*args, **kwargs)
+        if fields:
+            self._keep_fields(self, fields)
+        if exclude:
+            self._drop_fields(self, exclude)
+
+    @staticmethod
+    def _split(names, serializer):
+        selected = {}
+        for name in names:
+            head, _, rest = name.partition('.')
+            if head not in serializer.fields or (rest and not hasattr(serializer.fields[head], 'fields')):
+                raise serializers.ValidationError({'fields': [f"Unknown field '{name}'."]})
+            selected.setdefault(head, []).append(rest)
+        return selected
+
+    @classmethod
+    def _keep_fields(cls, serializer, names):
+        selected = cls._split(names, serializer)
+        for name in list(serializer.fields):
+            if name not in selected:
+                serializer.fields.pop(name)
+            elif all(selected[name]):
+                # Only sub-fields were named, e.g. author.username
+                cls._keep_fields(serializer.fields[name], selected[name])
+
+    @classmethod
+    def _drop_fields(cls, serializer, names):
+        for name, rest in cls._split(names, serializer).items():
+            if not all(rest):
+                serializer.fields.pop(name)
+            else:
+                cls._drop_fields(serializer.fields[name], rest)
+
+
+def selected_columns(serializer):
+    """
+    ORM paths read by a serializer's remaining fields, for queryset.only().
+    Nested serializers load their relation plus just the sub-fields they emit.
+    """
+    serializer = getattr(serializer, 'child', serializer)
+    columns = []
+    for field in serializer.fields.values():
+        if field.source == '*':
+            continue
+        columns.append(field.source.replace('.', '__'))
+        if hasattr(field, 'fields'):
+            columns += [f"{field.source}__{sub.source}" for sub in field.fields.values()]
+    return columns
+
+
+class ImageRenditionsField(serializers.Field):
+    """
+    Post.image_renditions with storage names turned into URLs:
+    {"card": {"width": 640, "height": 427, "webp": "http://.../cover-card.webp", "jpeg": "..."}, ...}
+    Empty until the background job (blog/images.py) has run.
+    """
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, renditions):
+        request = self.context.get('request')
+        storage = Post._meta.get_field('featured_image').storage
+        data = {}
+        for size_name, rendition in renditions.items():
+            data[size_name] = item = {}
+            for key, value in rendition.items():
+                if key in ('width', 'height'):
+                    item[key] = value
+                else:
+                    url = storage.url(value)
+                    item[key] = request.build_absolute_uri(url) if request is not None else url
+        return data
+
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'first_name', 'last_name', 'email']
 
-class PostListSerializer(serializers.ModelSerializer):
+class PostListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
+    featured_image_renditions = ImageRenditionsField(source='image_renditions')
     
     class Meta:
         model = Post
         fields = [
-            'id', 'title', 'author', 'created_at', 'featured_image'
+            'id', 'title', 'excerpt', 'word_count', 'reading_time',
+            'author', 'created_at', 'featured_image', 'featured_image_renditions'
         ]
 
-class PostDetailSerializer(serializers.ModelSerializer):
+class PostDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
+    featured_image_renditions = ImageRenditionsField(source='image_renditions')
     
     class Meta:
         model = Post
         fields = [
             'id', 'title', 'content', 'author', 
-            'created_at', 'updated_at', 'featured_image'
+            'created_at', 'updated_at', 'featured_image', 'featured_image_renditions'
         ]
         read_only_fields = ['created_at', 'updated_at']
 
+class StoredImageField(serializers.ImageField):
+    """
+    ImageField that accepts what blog/uploads.py already streamed to storage:
+    the stored name is assigned as is, with no second Pillow pass or copy.
+    Other uploads are validated as usual.
+    """
+    def to_internal_value(self, data):
+        if isinstance(data, RejectedUpload):
+            raise serializers.ValidationError(data.reason)
+        if isinstance(data, StoredUpload):
+            return data.name
+        return super().to_internal_value(data)
+
 class PostCreateSerializer(serializers.ModelSerializer):
+    featured_image = StoredImageField(required=False, allow_null=True, max_length=100)
+
     class Meta:
         model = Post
         fields = [
@@ -41,6 +147,42 @@ class PostCreateSerializer(serializers.ModelSerializer):
         validated_data['author'] = self.context['request'].user
         return super().create(validated_data)
 
+# --- Bulk writes (/api/posts/bulk/) ---
+
+class PostBulkListSerializer(serializers.ListSerializer):
+    """
+    List variant of PostCreateSerializer that writes the whole batch with one
+    bulk_create / bulk_update. Neither sends post_save signals, so callers
+    must invalidate caches themselves (see PostBulkView).
+    """
+    def create(self, validated_data):
+        author = self.context['request'].user
+        posts = [Post(author=author, **item) for item in validated_data]
+        for post in posts:
+            post.refresh_summary()  # save() isn't called
+        return Post.objects.bulk_create(posts)
+
+    def update(self, instances, validated_data):
+        """`instances` and `validated_data` are parallel lists."""
+        now = timezone.now()
+        fields = {'updated_at'}  # auto_now isn't applied by bulk_update
+        for post, item in zip(instances, validated_data):
+            for name, value in item.items():
+                setattr(post, name, value)
+            post.updated_at = now
+            fields.update(item)
+            if 'content' in item:
+                post.refresh_summary()
+                fields.update(SUMMARY_FIELDS)
+        Post.objects.bulk_update(instances, sorted(fields))
+        return instances
+
+class PostBulkSerializer(PostCreateSerializer):
+    class Meta(PostCreateSerializer.Meta):
+        # Images can't travel in a JSON batch; upload them one post at a time
+        fields = ['id', 'title', 'content']
+        list_serializer_class = PostBulkListSerializer
+
 # Authentication Serializers
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
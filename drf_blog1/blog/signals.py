@@ -0,0 +1,71 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import archive, listing, markers
+from .authentication import forget_user
+from .cache import bump_post_generation, bump_user_generation
+from .models import Post
+from .webhooks import notify_change
+
+
+def bump_now_and_on_commit(func, *args):
+    # The second bump stops a reader that raced the open transaction from
+    # caching pre-commit data under the new generation.
+    func(*args)
+    transaction.on_commit(lambda: func(*args))
+
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_post_responses(sender, instance, **kwargs):
+    bump_now_and_on_commit(bump_post_generation, instance.pk)
+    transaction.on_commit(notify_change)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_author_responses(sender, instance, created=False, update_fields=None, **kwargs):
+    # Only author fields appear in responses: registration (no posts yet),
+    # last_login and password saves leave every cached response valid
+    if created or (update_fields is not None and update_fields.isdisjoint(listing.AUTHOR_SOURCE_FIELDS)):
+        return
+    markers.touch(markers.AUTHORS) # Moves the HTTP validators of every worker
+    bump_now_and_on_commit(bump_user_generation)
+    transaction.on_commit(notify_change)
+
+
+@receiver([post_save, post_delete], sender=User)
+def forget_authenticated_user(sender, instance, **kwargs):
+    # Deactivation, password change, profile edit: next request reloads the user
+    forget_user(instance)
+
+
+# Denormalized list rows (blog/listing.py), written in the same transaction
+
+@receiver(post_save, sender=Post)
+def update_post_listing(sender, instance, **kwargs):
+    listing.sync_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_listing(sender, instance, **kwargs):
+    listing.remove_post(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def update_author_listings(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or not update_fields.isdisjoint(listing.AUTHOR_SOURCE_FIELDS):
+        listing.sync_author(instance) # Skips e.g. last_login updates on every login
+
+
+# Per-month post counts (blog/archive.py), written in the same transaction
+
+@receiver(post_save, sender=Post)
+def count_archive_post(sender, instance, created, **kwargs):
+    if created:
+        archive.add_posts([instance.created_at])
+
+
+@receiver(post_delete, sender=Post)
+def uncount_archive_post(sender, instance, **kwargs):
+    archive.remove_posts([instance.created_at])
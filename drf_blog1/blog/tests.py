@@ -1,11 +1,50 @@
 # Update blog/tests.py
-from django.test import TestCase
+import base64
+import gzip
+import hashlib
+import importlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.hashers import ScryptPasswordHasher, get_hasher, make_password
 from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
+from django.utils.http import http_date
 from rest_framework.test import APITestCase
 from rest_framework import status
-from .models import Post
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.tokens import RefreshToken
+from . import archive, passwords
+from .admin import PostAdmin
+from .authentication import CachedJWTAuthentication, check_auth_cache, user_cache
+from .cache import check_response_cache
+from .database import sqlite_pragmas
+from .filters import filter_posts
+from .models import Post, PostArchiveMonth, PostListing
+from blog_project.database import database_from_env, replica_databases
+from .images import _run_job, generate_for_post
+from .importer import load_checkpoint, save_checkpoint
+from .pagination import PostCursorPagination
+from .renderers import FastJSONParser, FastJSONRenderer
+from .routers import ReplicaSelector, check_pin_cache
+from .search import get_search_backend
 from django.utils import timezone
+from django.utils.translation import gettext_lazy
 
 class BlogAPITests(APITestCase):
     def setUp(self):
@@ -22,7 +61,7 @@ class BlogAPITests(APITestCase):
         )
     
     def test_post_list(self):
-        url = reverse('post-list')
+        url = reverse('post-list-api')
         response = self.client.get(url)
         print(f"Post list URL: {url}")
         print(f"Post list status: {response.status_code}")
@@ -34,6 +73,8 @@ class BlogAPITests(APITestCase):
             self.assertEqual(len(response.data), 1)
     
     def test_post_detail(self):
+        url = reverse('post-detail-api', kwargs={'id': self.post.id})
+        response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['title'], 'Test Post')
 
@@ -46,3 +87,1259 @@ class ModelTests(TestCase):
             author=user,
         )
         self.assertEqual(str(post), 'Model Test Post')
+
+    def test_summary_fields_follow_content(self):
+        user = User.objects.create_user(username='summary', password='test123')
+        post = Post.objects.create(title='Long', content='word ' * 450, author=user)
+        self.assertEqual((post.word_count, post.reading_time), (450, 3))
+        self.assertTrue(post.excerpt.endswith('…'))
+        self.assertLessEqual(len(post.excerpt), 201)
+
+        post.content = 'Now   short.'
+        post.save(update_fields=['content'])
+        post.refresh_from_db()
+        self.assertEqual((post.excerpt, post.word_count, post.reading_time), ('Now short.', 2, 1))
+
+    def test_backfill_migration(self):
+        from importlib import import_module
+        from django.apps import apps
+        migration = import_module('blog.migrations.0011_backfill_post_summaries')
+        user = User.objects.create_user(username='backfill', password='test123')
+        post = Post.objects.create(title='Old', content='one two three', author=user)
+        Post.objects.filter(pk=post.pk).update(excerpt='', word_count=0, reading_time=0)
+        with mock.patch.object(migration, 'CHUNK_SIZE', 1):
+            migration.backfill(apps, mock.Mock(connection=connection))
+        post.refresh_from_db()
+        self.assertEqual((post.excerpt, post.word_count), ('one two three', 3))
+
+
+class SearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='searcher', password='testpass123')
+        self.title_hit = Post.objects.create(
+            title='Django performance tips',
+            content='Some general advice.',
+            author=self.user,
+        )
+        self.content_hit = Post.objects.create(
+            title='Weekly notes',
+            content='We spent the week tuning django queries.',
+            author=self.user,
+        )
+        Post.objects.create(title='Unrelated', content='Nothing to see here.', author=self.user)
+
+    def search(self, query):
+        response = self.client.get(reverse('post-list-api'), {'search': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data['results'] if 'results' in response.data else response.data
+        return [post['id'] for post in data]
+
+    def test_ranks_title_matches_first(self):
+        self.assertEqual(self.search('django'), [self.title_hit.id, self.content_hit.id])
+
+    def test_prefix_matching(self):
+        self.assertEqual(self.search('perf'), [self.title_hit.id])
+        self.assertEqual(self.search('tun quer'), [self.content_hit.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.title_hit.title = 'Flask tips'
+        self.title_hit.content = 'Nothing about that framework.'
+        self.title_hit.save()
+        self.content_hit.delete()
+        self.assertEqual(self.search('django'), [])
+        self.assertEqual(self.search('flask'), [self.title_hit.id])
+
+    def test_punctuation_only_query_falls_back_to_substring(self):
+        self.assertEqual(self.search('!!!'), [])
+
+    def test_rebuild_command(self):
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search('django'), [self.title_hit.id, self.content_hit.id])
+
+    def test_migration_indexes_existing_posts(self):
+        migration = importlib.import_module('blog.migrations.0007_post_search_index')
+        get_search_backend().uninstall()
+        migration.install_search_index(None, mock.Mock(connection=connection))
+        self.assertEqual(self.search('django'), [self.title_hit.id, self.content_hit.id])
+
+
+class CursorPaginationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='pager', password='testpass123')
+        now = timezone.now()
+        # Pairs of posts share a timestamp so the id tiebreaker is exercised
+        for i in range(25):
+            post = Post.objects.create(title=f'Post {i}', content='Body', author=self.user)
+            Post.objects.filter(pk=post.pk).update(created_at=now - timezone.timedelta(minutes=i // 2))
+        self.expected = list(Post.objects.order_by('-created_at', 'id').values_list('id', flat=True))
+
+    def get_page(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_walks_forward_and_back_without_gaps(self):
+        page = self.get_page(reverse('post-list-api'), {'page_size': 10})
+        self.assertIsNone(page['previous'])
+        seen, pages = [], [page]
+        while True:
+            seen += [post['id'] for post in page['results']]
+            if not page['next']:
+                break
+            page = self.get_page(page['next'])
+            pages.append(page)
+        self.assertEqual(seen, self.expected)
+        self.assertEqual([len(p['results']) for p in pages], [10, 10, 5])
+
+        back = self.get_page(pages[-1]['previous'])
+        self.assertEqual([post['id'] for post in back['results']], self.expected[10:20])
+        back = self.get_page(back['previous'])
+        self.assertEqual([post['id'] for post in back['results']], self.expected[:10])
+        self.assertIsNone(back['previous'])
+
+    def test_page_size_is_capped(self):
+        with mock.patch.object(PostCursorPagination, 'max_page_size', 7):
+            page = self.get_page(reverse('post-list-api'), {'page_size': 10000})
+        self.assertEqual(len(page['results']), 7)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('post-list-api'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_mistyped_cursor_positions_are_invalid(self):
+        for position in (['x', 'y'], [1, 'x'], [None, None], [{'a': 1}, 2], ['2025-01-01T00:00:00+00:00', True]):
+            cursor = base64.urlsafe_b64encode(json.dumps({'p': position}).encode()).decode()
+            with self.subTest(position=position):
+                response = self.client.get(reverse('post-list-api'), {'cursor': cursor})
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='sparse', password='testpass123', email='s@example.com')
+        self.post = Post.objects.create(title='Sparse', content='A very long body', author=self.user)
+
+    def get(self, name, params, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(name, kwargs=kwargs), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        return response.data, sql
+
+    def test_list_never_reads_content(self):
+        data, sql = self.get('post-list-api', {})
+        self.assertNotIn('"blog_post"."content"', sql)
+        self.assertEqual(set(data['results'][0]), {
+            'id', 'title', 'excerpt', 'word_count', 'reading_time', 'author', 'created_at',
+            'featured_image', 'featured_image_renditions',
+        })
+
+    def test_fields_trims_output_and_columns(self):
+        data, sql = self.get('post-list-api', {'fields': 'id,title,author.username'})
+        self.assertEqual(data['results'][0], {'id': self.post.id, 'title': 'Sparse', 'author': {'username': 'sparse'}})
+        self.assertNotIn('"auth_user"."email"', sql)
+
+    def test_exclude_on_detail_defers_content(self):
+        data, sql = self.get('post-detail-api', {'exclude': 'content,author.email'}, id=self.post.id)
+        self.assertNotIn('content', data)
+        self.assertNotIn('email', data['author'])
+        self.assertNotIn('"blog_post"."content"', sql)
+
+    def test_recent_posts_fields(self):
+        data, _ = self.get('recent-posts-api', {'fields': 'id'})
+        self.assertEqual(data, [{'id': self.post.id}])
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(reverse('post-list-api'), {'fields': 'id,secret'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False})
+class FastSerializerParityTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='fast', password='testpass123', email='fast@example.com',
+            first_name='Fäst', last_name='Path',
+        )
+        self.other = User.objects.create_user(username='other', password='testpass123')
+        self.posts = [
+            Post.objects.create(title='Plain post', content='No image', author=self.user),
+            Post.objects.create(
+                title='Image post', content='With image', author=self.other,
+                featured_image='blog_images/cover photo é.jpg',
+            ),
+            Post.objects.create(title='Empty image', content='Blank', author=self.user, featured_image=''),
+        ]
+
+    def assert_parity(self, url, params=None):
+        with self.settings(BLOG_FAST_SERIALIZERS=False):
+            slow = self.client.get(url, params)
+        with self.settings(BLOG_FAST_SERIALIZERS=True):
+            with mock.patch('rest_framework.serializers.Serializer.to_representation') as drf:
+                fast = self.client.get(url, params)
+        self.assertEqual(fast.status_code, slow.status_code)
+        self.assertEqual(fast.content, slow.content)
+        if fast.status_code == status.HTTP_200_OK:
+            drf.assert_not_called()
+        return fast
+
+    def test_list(self):
+        self.assert_parity(reverse('post-list-api'))
+
+    def test_list_pages_and_cursors(self):
+        response = self.assert_parity(reverse('post-list-api'), {'page_size': 2})
+        self.assert_parity(response.data['next'])
+
+    def test_list_search(self):
+        self.assert_parity(reverse('post-list-api'), {'search': 'post'})
+
+    def test_list_sparse_fields(self):
+        self.assert_parity(reverse('post-list-api'), {'fields': 'id,featured_image,author.first_name'})
+        self.assert_parity(reverse('post-list-api'), {'exclude': 'author,created_at'})
+
+    def test_detail(self):
+        for post in self.posts:
+            self.assert_parity(reverse('post-detail-api', kwargs={'id': post.id}))
+        self.assert_parity(reverse('post-detail-api', kwargs={'id': 999999}))
+
+    def test_recent_posts(self):
+        self.assert_parity(reverse('recent-posts-api'))
+        self.assert_parity(reverse('recent-posts-api'), {'fields': 'title,author.username'})
+
+    def test_non_utc_timezone(self):
+        with self.settings(TIME_ZONE='America/New_York'):
+            self.assert_parity(reverse('post-list-api'))
+
+
+
+class AuthorFeedTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user(username='alice', password='testpass123')
+        self.bob = User.objects.create_user(username='bob', password='testpass123')
+        for i in range(5):
+            Post.objects.create(title=f'Alice {i}', content='Body', author=self.alice)
+            Post.objects.create(title=f'Bob {i}', content='Body', author=self.bob)
+
+    def titles(self, response):
+        return [post['title'] for post in response.data['results']]
+
+    def test_feed_pages_through_one_author_newest_first(self):
+        url = reverse('author-posts-api', kwargs={'username': 'alice'})
+        first = self.client.get(url, {'page_size': 3})
+        second = self.client.get(first.data['next'])
+        self.assertEqual(self.titles(first) + self.titles(second), [f'Alice {i}' for i in range(4, -1, -1)])
+        self.assertIsNone(second.data['next'])
+
+    def test_author_filter_on_post_list(self):
+        response = self.client.get(reverse('post-list-api'), {'author': 'bob'})
+        self.assertEqual(self.titles(response), [f'Bob {i}' for i in range(4, -1, -1)])
+        self.assertEqual(self.client.get(reverse('post-list-api'), {'author': 'nobody'}).data['results'], [])
+        self.assertEqual(self.client.get(reverse('author-posts-api', kwargs={'username': 'nobody'})).status_code,
+                         status.HTTP_404_NOT_FOUND)
+
+    def test_cached_responses_are_kept_apart_per_path(self):
+        everything = self.client.get(reverse('post-list-api'))
+        alices = self.client.get(reverse('author-posts-api', kwargs={'username': 'alice'}))
+        self.assertEqual(len(everything.data['results']), 10)
+        self.assertEqual(len(alices.data['results']), 5)
+
+    @override_settings(BLOG_POST_LISTING=True)
+    def test_listing_path_matches(self):
+        call_command('rebuild_post_listing', stdout=StringIO())
+        url = reverse('author-posts-api', kwargs={'username': 'alice'})
+        listed = self.client.get(url, {'page_size': 2})
+        with self.settings(BLOG_POST_LISTING=False, BLOG_RESPONSE_CACHE={'ENABLED': False}):
+            joined = self.client.get(url, {'page_size': 2})
+        self.assertEqual(listed.content, joined.content)
+
+    def test_feed_query_uses_composite_index(self):
+        queryset = Post.objects.filter(author_id=self.alice.id).order_by('-created_at', 'id')[:20]
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        self.assertIn('blog_post_author_created_idx', plan)
+
+class ArchiveTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='archivist', password='testpass123')
+        for title, moment in [('Oct A', '2025-10-03T10:00:00Z'), ('Oct B', '2025-10-30T23:00:00Z'),
+                              ('Nov', '2025-11-01T00:00:00Z'), ('Old', '2024-02-10T12:00:00Z')]:
+            post = Post.objects.create(title=title, content='Body', author=self.user)
+            Post.objects.filter(pk=post.pk).update(created_at=moment)
+        archive.rebuild() # The update() above moved posts between months behind the counters' back
+
+    def counts(self):
+        return list(PostArchiveMonth.objects.filter(post_count__gt=0).values_list('year', 'month', 'post_count'))
+
+    def test_archive_reads_only_the_summary_table(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('post-archive-api'))
+        self.assertEqual(response.data, [
+            {'year': 2025, 'count': 3, 'months': [{'month': 11, 'count': 1}, {'month': 10, 'count': 2}]},
+            {'year': 2024, 'count': 1, 'months': [{'month': 2, 'count': 1}]},
+        ])
+        self.assertFalse([q for q in queries.captured_queries if '"blog_post"' in q['sql']])
+
+    def test_counts_follow_creates_and_deletes(self):
+        post = Post.objects.create(title='Now', content='Body', author=self.user)
+        now = timezone.localtime(post.created_at)
+        self.assertIn((now.year, now.month, 1), self.counts())
+        Post.objects.filter(title__startswith='Oct').delete()
+        post.delete()
+        self.assertEqual(self.counts(), [(2025, 11, 1), (2024, 2, 1)])
+        self.assertEqual(self.client.get(reverse('post-archive-api')).data[0]['months'], [{'month': 11, 'count': 1}])
+
+    def test_bulk_paths_count_new_posts(self):
+        self.client.force_authenticate(self.user)
+        self.client.post(reverse('post-bulk-api'), [{'op': 'create', 'data': {'title': 'Bulk', 'content': 'Body'}}], format='json')
+        before = {(year, month): count for year, month, count in self.counts()}
+        archive.rebuild()
+        self.assertEqual({(year, month): count for year, month, count in self.counts()}, before)
+
+    def test_date_range_filters(self):
+        url = reverse('post-list-api')
+        response = self.client.get(url, {'created_after': '2025-10-01', 'created_before': '2025-11-01'})
+        self.assertEqual([post['title'] for post in response.data['results']], ['Oct B', 'Oct A'])
+        response = self.client.get(url, {'created_after': '2025-10-30T23:00:00Z'})
+        self.assertEqual([post['title'] for post in response.data['results']], ['Nov', 'Oct B'])
+        bad = self.client.get(url, {'created_before': 'soon'})
+        self.assertEqual(bad.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('created_before', bad.data)
+
+    @override_settings(BLOG_POST_LISTING=True)
+    def test_date_range_on_listing_path(self):
+        call_command('rebuild_post_listing', stdout=StringIO())
+        response = self.client.get(reverse('post-list-api'), {'created_before': '2025-01-01'})
+        self.assertEqual([post['title'] for post in response.data['results']], ['Old'])
+
+    def test_admin_month_filter(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'testpass123'))
+        response = self.client.get(reverse('admin:blog_post_changelist'), {'month': '2025-10'})
+        self.assertContains(response, 'October 2025 (2)')
+        self.assertEqual(response.context['cl'].result_count, 2)
+
+class PostAdminTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'testpass123')
+        self.client.force_login(self.admin)
+        for i in range(5):
+            Post.objects.create(title=f'Django tip {i}' if i % 2 else f'Other {i}', content='Long body ' * 50, author=self.admin)
+        self.url = reverse('admin:blog_post_changelist')
+
+    def get(self, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, params or {})
+        return response, [query['sql'] for query in queries.captured_queries]
+
+    def test_changelist_estimates_count_and_skips_content(self):
+        response, queries = self.get()
+        self.assertContains(response, 'about 5 posts')
+        self.assertContains(response, 'exact_count=1')
+        post_queries = [sql for sql in queries if 'FROM "blog_post"' in sql]
+        self.assertFalse([sql for sql in post_queries if 'COUNT(' in sql])
+        self.assertEqual(len(post_queries), 1) # Authors joined in, no query per row
+        self.assertNotIn('"blog_post"."content"', post_queries[0])
+        self.assertIn('"auth_user"', post_queries[0])
+
+    def test_exact_count_on_demand(self):
+        response, queries = self.get({'exact_count': '1'})
+        self.assertContains(response, '5 posts')
+        self.assertNotContains(response, 'about 5')
+        self.assertTrue([sql for sql in queries if 'COUNT(' in sql and 'blog_post' in sql])
+
+    def test_filtered_count_is_bounded(self):
+        with mock.patch('blog.admin.COUNT_LIMIT', 2):
+            response, _ = self.get({'month': timezone.now().strftime('%Y-%m')})
+        self.assertContains(response, 'about 2 posts')
+        self.assertEqual(self.get({'month': timezone.now().strftime('%Y-%m')})[0].context['cl'].result_count, 5)
+
+    def test_pages_past_the_estimate_are_served(self):
+        month = timezone.now().strftime('%Y-%m')
+        with mock.patch('blog.admin.COUNT_LIMIT', 2), mock.patch.object(PostAdmin, 'list_per_page', 1):
+            response, _ = self.get({'month': month, 'p': 4})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.context['cl'].result_list), 1)
+            response, _ = self.get({'month': month, 'p': 9})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(list(response.context['cl'].result_list), [])
+
+    def test_exact_count_is_kept_in_page_links(self):
+        with mock.patch.object(PostAdmin, 'list_per_page', 2):
+            response, _ = self.get({'exact_count': '1'})
+        self.assertContains(response, 'exact_count=1&amp;p=2')
+
+    def test_search_uses_full_text_index(self):
+        response, queries = self.get({'q': 'django'})
+        self.assertEqual(response.context['cl'].result_count, 2)
+        self.assertTrue([sql for sql in queries if 'blog_post_fts' in sql])
+        self.assertFalse([sql for sql in queries if 'LIKE' in sql and 'blog_post' in sql])
+
+@override_settings(BLOG_AUTH_CACHE={'ENABLED': True}) # Single process: LocMemCache is shared enough
+class CachedJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.user = User.objects.create_user(username='tokenuser', password='testpass123', email='t@example.com')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        self.url = reverse('profile-api')
+
+    def user_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [query['sql'] for query in queries.captured_queries if 'FROM "auth_user"' in query['sql']]
+
+    def test_repeat_requests_skip_the_user_query(self):
+        self.assertEqual(len(self.user_queries()), 1)
+        self.assertEqual(self.user_queries(), [])
+
+    def test_each_request_gets_its_own_instance(self):
+        authenticate = CachedJWTAuthentication().get_user
+        token = RefreshToken.for_user(self.user).access_token
+        first, second = authenticate(token), authenticate(token)
+        self.assertIsNot(first, second)
+        self.assertEqual((second.pk, second.username, second._state.adding), (self.user.pk, 'tokenuser', False))
+
+    def test_save_and_deactivation_invalidate(self):
+        self.user_queries()
+        self.client.patch(reverse('update-profile-api'), {'email': 'new@example.com'})
+        self.assertEqual(self.client.get(self.url).data['email'], 'new@example.com')
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivation_in_another_process_invalidates(self):
+        self.user_queries()
+        stale = dict(user_cache._entries) # This worker never sees the other one's signal
+        self.user.is_active = False
+        self.user.save()
+        user_cache._entries.update(stale)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_process_local_alias_is_off_unless_forced(self):
+        self.assertEqual([warning.id for warning in check_auth_cache(None)], ['blog.W003'])
+        with override_settings(BLOG_AUTH_CACHE={}):
+            self.assertEqual(check_auth_cache(None), [])
+            self.user_queries()
+            self.assertEqual(len(self.user_queries()), 1)
+
+    def test_entries_expire_and_are_bounded(self):
+        with override_settings(BLOG_AUTH_CACHE={'ENABLED': True, 'TTL': 60, 'MAX_ENTRIES': 1}):
+            self.user_queries()
+            other = User.objects.create_user(username='other', password='testpass123')
+            CachedJWTAuthentication().get_user(RefreshToken.for_user(other).access_token)
+            self.assertEqual(len(self.user_queries()), 1) # Evicted by the other user
+        with mock.patch('blog.authentication.time.monotonic', return_value=time.monotonic() + 61):
+            self.assertEqual(len(self.user_queries()), 1)
+
+@override_settings(BLOG_PASSWORD_POOL={'WORKERS': 0})
+class PasswordPoolTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='shift', password='unused')
+        self.user.password = make_password('Correct-horse-1', hasher='pbkdf2_sha256') # Stored before the switch
+        self.user.save()
+        self.url = reverse('token_obtain_pair')
+
+    def login(self, password):
+        return self.client.post(self.url, {'username': 'shift', 'password': password}, format='json')
+
+    def test_login_rehashes_with_preferred_hasher(self):
+        self.assertEqual(self.login('wrong').status_code, status.HTTP_401_UNAUTHORIZED)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$'))
+        self.assertEqual(self.login('Correct-horse-1').status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password.split('$')[0], get_hasher().algorithm)
+        self.assertTrue(self.user.check_password('Correct-horse-1'))
+        self.assertEqual(self.login('Correct-horse-1').status_code, status.HTTP_200_OK)
+
+    def test_overload_is_refused_with_429(self):
+        full = threading.BoundedSemaphore(1)
+        full.acquire()
+        with self.settings(BLOG_PASSWORD_POOL={'WORKERS': 1, 'RETRY_AFTER': 3}), \
+                mock.patch.object(passwords, 'get_executor', return_value=(mock.Mock(), full)) as get_executor:
+            response = self.login('Correct-horse-1')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '3')
+        get_executor.return_value[0].submit.assert_not_called()
+
+    def test_overload_is_a_form_error_on_admin_login(self):
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+        full = threading.BoundedSemaphore(1)
+        full.acquire()
+        with self.settings(BLOG_PASSWORD_POOL={'WORKERS': 1}), \
+                mock.patch.object(passwords, 'get_executor', return_value=(mock.Mock(), full)):
+            response = self.client.post(reverse('admin:login'), {'username': 'shift', 'password': 'Correct-horse-1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, passwords.LoginOverloaded.message)
+
+    def test_default_strength_scrypt_hashes_are_upgraded(self):
+        self.user.password = make_password('Correct-horse-1', hasher=ScryptPasswordHasher()) # Django's N=2**14
+        self.user.save()
+        self.assertTrue(self.user.password.startswith('scrypt$16384$'))
+        self.assertEqual(self.login('Correct-horse-1').status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith(f'scrypt${2 ** 17}$'))
+
+    def test_process_pool_verifies_and_releases_slots(self):
+        with self.settings(BLOG_PASSWORD_POOL={'WORKERS': 1, 'MAX_PENDING': 1}):
+            try:
+                self.assertEqual(passwords.run_verify('Correct-horse-1', self.user.password)[0], True)
+                self.assertEqual(passwords.run_verify('wrong', self.user.password), (False, None))
+            finally:
+                passwords._executor.shutdown()
+                passwords._executor = passwords._admission = None
+
+@override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False}, BLOG_POST_LISTING=True)
+class PostListingTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='lister', password='testpass123', email='lister@example.com', first_name='Lís',
+        )
+        self.posts = [
+            Post.objects.create(title='First', content='Word ' * 100, author=self.user),
+            Post.objects.create(title='Second', content='Body', author=self.user,
+                                featured_image='blog_images/card.jpg'),
+        ]
+
+    def assert_parity(self, url, params=None):
+        listed = self.client.get(url, params)
+        with self.settings(BLOG_POST_LISTING=False):
+            joined = self.client.get(url, params)
+        self.assertEqual(listed.content, joined.content)
+        return listed
+
+    def test_responses_match_the_post_table(self):
+        response = self.assert_parity(reverse('post-list-api'), {'page_size': 1})
+        self.assert_parity(response.data['next'])
+        self.assert_parity(reverse('post-list-api'), {'fields': 'id,featured_image,author.first_name'})
+        self.assert_parity(reverse('recent-posts-api'))
+
+    def test_list_reads_one_table(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('post-list-api'))
+        listing_queries = [q['sql'] for q in queries if 'blog_postlisting' in q['sql']]
+        self.assertEqual(len(listing_queries), 1)
+        self.assertFalse(any('auth_user' in q['sql'] for q in queries))
+
+    def test_rows_follow_post_and_author_changes(self):
+        listing = PostListing.objects.get(id=self.posts[0].id)
+        self.assertTrue(listing.excerpt.endswith('…'))
+        self.assertLessEqual(len(listing.excerpt), 201)
+
+        self.user.username = 'renamed'
+        self.user.save()
+        self.posts[1].delete()
+        self.assertEqual(list(PostListing.objects.values_list('author_username', flat=True)), ['renamed'])
+
+        self.client.force_authenticate(self.user)
+        self.client.post(reverse('post-bulk-api'), [{'op': 'create', 'data': {'title': 'Bulk', 'content': 'Body'}}], format='json')
+        self.assertTrue(PostListing.objects.filter(title='Bulk').exists())
+
+    def test_rebuild_command(self):
+        PostListing.objects.all().delete()
+        call_command('rebuild_post_listing', stdout=StringIO())
+        self.assertEqual(PostListing.objects.count(), 2)
+        self.assert_parity(reverse('post-list-api'))
+
+class FastJSONTests(TestCase):
+    def payload(self):
+        return {
+            'when': timezone.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+            'naive': timezone.datetime(2025, 1, 2),
+            'price': Decimal('19.99'),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'text': 'line\u2028separator ünïcode',
+            'nested': [{'id': 1, 'none': None}],
+            'lazy': gettext_lazy('Invalid cursor'),
+        }
+
+    def test_matches_stock_renderer(self):
+        self.assertEqual(FastJSONRenderer().render(self.payload()), JSONRenderer().render(self.payload()))
+
+    def test_falls_back_without_accelerated_library(self):
+        with mock.patch('blog.renderers.dumps', None):
+            self.assertEqual(FastJSONRenderer().render(self.payload()), JSONRenderer().render(self.payload()))
+
+    def test_indent_uses_stock_renderer(self):
+        rendered = FastJSONRenderer().render({'a': 1}, 'application/json; indent=2')
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+    def test_parser(self):
+        self.assertEqual(FastJSONParser().parse(BytesIO(b'{"title": "\\u00e9"}')), {'title': 'é'})
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"title": NaN}'))
+
+
+@override_settings(BLOG_RESPONSE_CACHE={'ENABLED': True}) # The default LocMemCache is fine in one process
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='cached', password='testpass123')
+        self.post = Post.objects.create(title='Cached', content='Body', author=self.user)
+        self.other = Post.objects.create(title='Other', content='Body', author=self.user)
+
+    def get(self, url, params=None, **extra):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params, **extra)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(queries)
+
+    def test_second_read_skips_database(self):
+        for name in ('post-list-api', 'recent-posts-api'):
+            first, _ = self.get(reverse(name))
+            second, queries = self.get(reverse(name))
+            self.assertEqual(second['X-Cache'], 'HIT')
+            self.assertEqual(queries, 0)
+            self.assertEqual(second.content, first.content)
+
+    def test_hit_revalidates_without_queries(self):
+        url = reverse('post-detail-api', kwargs={'id': self.post.id})
+        etag = self.get(url)[0]['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(queries), 0)
+
+    def test_query_params_are_part_of_the_key(self):
+        self.get(reverse('post-list-api'))
+        response, _ = self.get(reverse('post-list-api'), {'fields': 'id'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+    def test_update_invalidates_only_that_detail(self):
+        post_url = reverse('post-detail-api', kwargs={'id': self.post.id})
+        other_url = reverse('post-detail-api', kwargs={'id': self.other.id})
+        self.get(post_url)
+        self.get(other_url)
+        self.post.title = 'Renamed'
+        self.post.save()
+        response, _ = self.get(post_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertIn(b'Renamed', response.content)
+        self.assertEqual(self.get(other_url)[0]['X-Cache'], 'HIT')
+
+    def test_create_and_delete_invalidate_lists(self):
+        self.get(reverse('post-list-api'))
+        Post.objects.create(title='Fresh', content='Body', author=self.user)
+        response, _ = self.get(reverse('post-list-api'))
+        self.assertIn(b'Fresh', response.content)
+        self.post.delete()
+        response, _ = self.get(reverse('recent-posts-api'))
+        self.assertNotIn(b'"Cached"', response.content)
+
+    def test_author_change_invalidates(self):
+        url = reverse('post-detail-api', kwargs={'id': self.post.id})
+        self.get(url)
+        self.user.first_name = 'Changed'
+        self.user.save()
+        self.assertIn(b'Changed', self.get(url)[0].content)
+
+    def test_requests_with_credentials_bypass_cache(self):
+        self.get(reverse('post-list-api'))
+        response = self.client.get(reverse('post-list-api'), HTTP_AUTHORIZATION='Bearer invalid')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_file_based_cache(self):
+        with tempfile.TemporaryDirectory() as location:
+            backend = {'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': location,
+            }}
+            with self.settings(CACHES=backend, BLOG_RESPONSE_CACHE={'ENABLED': None}): # Shared: on by itself
+                self.get(reverse('post-list-api'))
+                self.assertEqual(self.get(reverse('post-list-api'))[0]['X-Cache'], 'HIT')
+                self.post.delete()
+                response, _ = self.get(reverse('post-list-api'))
+                self.assertEqual(response['X-Cache'], 'MISS')
+
+    def test_process_local_alias_is_off_unless_forced(self):
+        with self.settings(BLOG_RESPONSE_CACHE={'ENABLED': None}):
+            self.get(reverse('post-list-api'))
+            self.assertNotIn('X-Cache', self.get(reverse('post-list-api'))[0])
+            self.assertEqual(check_response_cache(None), [])
+        self.assertEqual([warning.id for warning in check_response_cache(None)], ['blog.W001'])
+
+    def test_logins_and_registrations_keep_cached_responses(self):
+        url = reverse('post-detail-api', kwargs={'id': self.post.id})
+        self.get(url)
+        User.objects.create_user(username='newcomer', password='testpass123')
+        self.user.last_login = timezone.now()
+        self.user.save(update_fields=['last_login'])
+        self.user.set_password('another-pass-456')
+        self.user.save(update_fields=['password'])
+        self.assertEqual(self.get(url)[0]['X-Cache'], 'HIT')
+
+
+class BulkPostTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='bulk', password='testpass123')
+        self.other_user = User.objects.create_user(username='other', password='testpass123')
+        self.mine = Post.objects.create(title='Mine', content='Body', author=self.user)
+        self.doomed = Post.objects.create(title='Doomed', content='Body', author=self.user)
+        self.theirs = Post.objects.create(title='Theirs', content='Body', author=self.other_user)
+        self.client.force_authenticate(self.user)
+        self.url = reverse('post-bulk-api')
+
+    def test_batch_is_applied_and_reported_in_order(self):
+        list_before = self.client.get(reverse('post-list-api')).content
+        response = self.client.post(self.url, [
+            {'op': 'create', 'data': {'title': 'First', 'content': 'One'}},
+            {'op': 'update', 'id': self.mine.id, 'data': {'title': 'Renamed'}},
+            {'op': 'delete', 'id': self.doomed.id},
+            {'op': 'create', 'data': {'title': 'Second', 'content': 'Two'}},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual([r['op'] for r in results], ['create', 'update', 'delete', 'create'])
+        self.assertEqual(Post.objects.get(id=results[0]['id']).author, self.user)
+        self.assertEqual(Post.objects.get(id=results[3]['id']).title, 'Second')
+
+        self.mine.refresh_from_db()
+        self.assertEqual((self.mine.title, self.mine.content), ('Renamed', 'Body'))
+        self.assertFalse(Post.objects.filter(id=self.doomed.id).exists())
+        # Cached responses were invalidated although bulk writes skip signals
+        self.assertNotEqual(self.client.get(reverse('post-list-api')).content, list_before)
+
+    def test_invalid_batch_writes_nothing(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, [
+                {'op': 'create', 'data': {'title': 'Valid', 'content': 'Body'}},
+                {'op': 'update', 'id': self.theirs.id, 'data': {'title': 'Hijacked'}},
+                {'op': 'create', 'data': {'content': 'No title'}},
+                {'op': 'delete', 'id': 999999},
+                {'op': 'rename'},
+            ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data['errors']
+        self.assertEqual(errors[0], {})
+        self.assertIn('permission', errors[1]['detail'])
+        self.assertIn('title', errors[2])
+        self.assertEqual(errors[3], {'detail': 'Not found.'})
+        self.assertIn('op', errors[4])
+        self.assertEqual(Post.objects.count(), 3)
+        self.assertEqual(sum('blog_post' in q['sql'] for q in queries.captured_queries), 1)  # the ownership check
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+        response = self.client.post(self.url, [{'op': 'delete', 'id': self.mine.id}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ExportTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', password='testpass123')
+        self.alice = User.objects.create_user(username='alice', password='testpass123')
+        self.old = Post.objects.create(title='Old', content='Body', author=self.alice)
+        Post.objects.filter(id=self.old.id).update(created_at=timezone.now() - timezone.timedelta(days=30))
+        self.new = Post.objects.create(title='New', content='Body', author=self.admin)
+        self.url = reverse('post-export-api')
+
+    def read_lines(self, content):
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_streams_ndjson_with_filters(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        records = self.read_lines(b''.join(response.streaming_content))
+        self.assertEqual([r['title'] for r in records], ['Old', 'New'])
+        self.assertEqual(records[0]['author'], 'alice')
+
+        week_ago = (timezone.now() - timezone.timedelta(days=7)).date().isoformat()
+        response = self.client.get(self.url, {'created_after': week_ago})
+        self.assertEqual([r['title'] for r in self.read_lines(b''.join(response.streaming_content))], ['New'])
+        response = self.client.get(self.url, {'author': 'alice'})
+        self.assertEqual([r['title'] for r in self.read_lines(b''.join(response.streaming_content))], ['Old'])
+        self.assertEqual(self.client.get(self.url, {'created_before': 'soon'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_gzip_and_staff_only(self):
+        self.client.force_authenticate(self.alice)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(self.url, {'gzip': '1'})
+        self.assertEqual(len(self.read_lines(gzip.decompress(b''.join(response.streaming_content)))), 2)
+
+    def test_command_reads_in_chunks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f'{tmp}/posts.ndjson.gz'
+            with mock.patch.object(QuerySet, 'iterator', autospec=True, side_effect=QuerySet.iterator) as iterator:
+                call_command('export_posts', output=path, chunk_size=1, stdout=StringIO())
+            self.assertEqual(iterator.call_args.kwargs['chunk_size'], 1)
+            with gzip.open(path) as exported:
+                self.assertEqual(len(self.read_lines(exported.read())), 2)
+
+
+class ImportTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', password='testpass123')
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, text):
+        path = f'{self.tmp.name}/{name}'
+        with open(path, 'w', encoding='utf-8') as source:
+            source.write(text)
+        return path
+
+    def test_imports_ndjson_in_batches_with_one_author_lookup(self):
+        lines = [json.dumps({'title': f'Post {i}', 'content': 'Body', 'author': 'alice',
+                             'created_at': '2020-01-02T03:04:05Z'}) for i in range(5)]
+        lines.insert(2, json.dumps({'title': 'Orphan', 'content': 'Body', 'author': 'nobody'}))
+        lines.insert(4, '{not json')
+        path = self.write('posts.ndjson', '\n'.join(lines) + '\n')
+
+        out = StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            call_command('import_posts', path, batch_size=3, stdout=out, stderr=StringIO())
+        self.assertIn('Imported 5 posts', out.getvalue())
+        self.assertIn('rows/sec', out.getvalue())
+        self.assertEqual(sum('auth_user' in q['sql'] for q in queries.captured_queries), 1)
+        self.assertEqual(Post.objects.filter(author=self.alice).count(), 5)
+        self.assertEqual(Post.objects.first().created_at.year, 2020)  # Source timestamps are kept
+        self.assertTrue(Post._meta.get_field('created_at').auto_now_add)
+
+    def test_csv_resumes_from_checkpoint(self):
+        path = self.write('posts.csv', 'title,content,author\nOne,Body,alice\nTwo,Body,alice\nThree,Body,alice\n')
+        checkpoint = f'{self.tmp.name}/import.checkpoint'
+        save_checkpoint(checkpoint, position=2, imported=2)
+        call_command('import_posts', path, checkpoint=checkpoint, stdout=StringIO())
+        self.assertEqual(list(Post.objects.values_list('title', flat=True)), ['Three'])
+        self.assertEqual(load_checkpoint(checkpoint), 3)
+
+    def test_images_are_copied_by_workers(self):
+        os.makedirs(f'{self.tmp.name}/images')
+        data = b'\xff\xd8\xff\xe0 jpeg bytes'
+        for name in ('cover.jpg', 'same.jpg'):
+            with open(f'{self.tmp.name}/images/{name}', 'wb') as image:
+                image.write(data)
+        self.write('images/notes.jpg', 'not an image')
+        path = self.write('posts.ndjson', ''.join(json.dumps(
+            {'title': name, 'content': 'Body', 'author': 'alice', 'featured_image': f'images/{name}'}) + '\n'
+            for name in ('cover.jpg', 'same.jpg', 'notes.jpg')))
+        with override_settings(MEDIA_ROOT=f'{self.tmp.name}/media'):
+            call_command('import_posts', path, media_source=self.tmp.name, image_workers=2,
+                         stdout=StringIO(), stderr=StringIO())
+            digest = hashlib.sha256(data).hexdigest()
+            stored = {f'blog_images/{digest[:2]}/{digest}.jpg'}  # Content-addressed, like uploads
+            self.assertEqual(set(Post.objects.exclude(featured_image='').values_list('featured_image', flat=True)), stored)
+            self.assertTrue(default_storage.exists(stored.pop()))
+            self.assertEqual(len(os.listdir(f'{self.tmp.name}/media/blog_images')), 1)
+            self.assertFalse(Post.objects.get(title='notes.jpg').featured_image)
+
+
+@override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False}, BLOG_IMAGE_RENDITIONS={'WORKERS': 0})
+class ImageRenditionTests(APITestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        media = override_settings(MEDIA_ROOT=tmp.name)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.user = User.objects.create_user(username='photographer', password='testpass123')
+        self.client.force_authenticate(self.user)
+
+    def photo(self, name='photo.jpg'):
+        """2000x1000 JPEG with GPS data and an orientation that rotates it upright to 1000x2000."""
+        from PIL import Image
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation: rotate 90 CW
+        exif[0x8825] = {2: (51.0, 30.0, 0.0)}  # GPSLatitude
+        buffer = BytesIO()
+        Image.new('RGB', (2000, 1000), 'red').save(buffer, 'JPEG', exif=exif)
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+    def test_upload_gets_stripped_upright_renditions(self):
+        from PIL import Image
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('post-create-api'),
+                                        {'title': 'Pic', 'content': 'Body', 'featured_image': self.photo()})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        post = Post.objects.get(pk=response.data['id'])
+        self.assertEqual(set(post.image_renditions), {'thumbnail', 'card', 'full'})
+        card = post.image_renditions['card']
+        self.assertEqual((card['width'], card['height']), (320, 640))
+        with post.featured_image.storage.open(card['jpeg']) as rendition:
+            image = Image.open(rendition)
+            self.assertEqual(image.format, 'JPEG')
+            self.assertEqual(len(image.getexif()), 0)
+
+        data = self.client.get(reverse('post-detail-api', kwargs={'id': post.pk})).data
+        self.assertEqual(data['featured_image_renditions']['card']['webp'],
+                         f"http://testserver/media/{card['webp']}")
+
+    def test_renditions_change_validators(self):
+        post = Post.objects.create(title='Pic', content='Body', author=self.user, featured_image=self.photo())
+        url = reverse('post-detail-api', kwargs={'id': post.pk})
+        etag = self.client.get(url)['ETag']
+        generate_for_post(post.pk)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['featured_image_renditions'])
+        self.assertGreater(Post.objects.get(pk=post.pk).updated_at, post.updated_at)
+
+    def test_posts_sharing_an_image_share_renditions(self):
+        data = self.photo().read()
+        from blog import images
+        with mock.patch('blog.images.render', wraps=images.render) as render:
+            for name in ('a.jpg', 'b.jpg'):
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.client.post(reverse('post-create-api'), {
+                        'title': 'Pic', 'content': 'Body',
+                        'featured_image': SimpleUploadedFile(name, data, content_type='image/jpeg'),
+                    })
+        self.assertEqual(render.call_count, 1)
+        first, second = Post.objects.order_by('id')
+        self.assertEqual(first.image_renditions, second.image_renditions)
+
+    def test_generation_is_queued_after_commit(self):
+        with self.settings(BLOG_IMAGE_RENDITIONS={'WORKERS': 2}), \
+                mock.patch('blog.images.get_executor') as executor:
+            with self.captureOnCommitCallbacks() as callbacks:
+                response = self.client.post(reverse('post-create-api'),
+                                            {'title': 'Pic', 'content': 'Body', 'featured_image': self.photo()})
+                executor.assert_not_called()
+            for callback in callbacks:
+                callback()
+        executor.return_value.submit.assert_called_once_with(_run_job, response.data['id'])
+        self.assertEqual(Post.objects.get(pk=response.data['id']).image_renditions, {})
+
+    def test_new_image_stops_serving_old_renditions(self):
+        post = Post.objects.create(title='Pic', content='Body', author=self.user, featured_image=self.photo())
+        old = generate_for_post(post.pk)
+        storage = post.featured_image.storage
+        from PIL import Image
+        buffer = BytesIO()
+        Image.new('RGB', (800, 600), 'blue').save(buffer, 'JPEG')
+        with mock.patch('blog.images.render', side_effect=OSError('unreadable')), \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(reverse('post-update-api', kwargs={'id': post.pk}), {
+                'featured_image': SimpleUploadedFile('new.jpg', buffer.getvalue(), content_type='image/jpeg'),
+            })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Post.objects.get(pk=post.pk).image_renditions, {}) # The failed job leaves it cleared
+        self.assertEqual(self.client.get(reverse('post-detail-api', kwargs={'id': post.pk})).data['featured_image_renditions'], {})
+        self.assertFalse(storage.exists(old['card']['webp']))
+
+    def test_backfill_command(self):
+        post = Post.objects.create(title='Old', content='Body', author=self.user, featured_image=self.photo('old.jpg'))
+        Post.objects.create(title='No image', content='Body', author=self.user)
+        out = StringIO()
+        call_command('generate_image_renditions', workers=1, stdout=out)
+        self.assertIn('for 1 of 1 posts', out.getvalue())
+        post.refresh_from_db()
+        self.assertTrue(post.featured_image.storage.exists(post.image_renditions['thumbnail']['webp']))
+
+
+@override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False}, BLOG_IMAGE_RENDITIONS={'ENABLED': False})
+class StreamingUploadTests(APITestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        media = override_settings(MEDIA_ROOT=self.tmp.name)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.user = User.objects.create_user(username='uploader', password='testpass123')
+        self.client.force_authenticate(self.user)
+
+    def png(self, name='pic.png', color='blue'):
+        from PIL import Image
+        buffer = BytesIO()
+        Image.new('RGB', (40, 30), color).save(buffer, 'PNG')
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+    def create(self, upload):
+        return self.client.post(reverse('post-create-api'), {'title': 'Pic', 'content': 'Body', 'featured_image': upload})
+
+    def stored_files(self):
+        return sorted(os.path.relpath(os.path.join(root, name), self.tmp.name)
+                      for root, _, names in os.walk(self.tmp.name) for name in names)
+
+    def test_identical_images_are_stored_once_by_content_hash(self):
+        data = self.png().read()
+        with mock.patch('PIL.Image.Image.verify') as verify:
+            first = self.create(SimpleUploadedFile('a.png', data, content_type='image/png'))
+            second = self.create(SimpleUploadedFile('b.png', data, content_type='image/png'))
+        verify.assert_not_called()  # Header check only, no full decode in the request
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        digest = hashlib.sha256(data).hexdigest()
+        name = f'blog_images/{digest[:2]}/{digest}.png'
+        self.assertEqual(set(Post.objects.values_list('featured_image', flat=True)), {name})
+        self.assertEqual(second.data['featured_image'], first.data['featured_image'])
+        self.assertEqual(self.stored_files(), [name])
+
+    def test_non_images_are_refused_without_being_stored(self):
+        response = self.create(SimpleUploadedFile('fake.jpg', b'MZ\x90\x00 not an image' * 100, content_type='image/jpeg'))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('featured_image', response.data)
+        self.assertEqual(self.stored_files(), [])
+        self.assertFalse(Post.objects.exists())
+
+    def test_oversized_images_are_refused(self):
+        with self.settings(BLOG_IMAGE_UPLOADS={'MAX_BYTES': 20}):
+            response = self.create(self.png())
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.stored_files(), [])
+
+    def test_update_replaces_image(self):
+        post = Post.objects.create(title='Old', content='Body', author=self.user)
+        response = self.client.patch(reverse('post-update-api', kwargs={'id': post.pk}), {'featured_image': self.png()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        post.refresh_from_db()
+        self.assertTrue(post.featured_image.storage.exists(post.featured_image.name))
+
+    def test_failed_requests_leave_no_files(self):
+        response = self.client.post(reverse('post-create-api'), {'title': '', 'content': 'Body', 'featured_image': self.png()})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn('featured_image', response.data)
+        self.assertEqual(self.stored_files(), [])
+
+        other = User.objects.create_user(username='other', password='testpass123')
+        post = Post.objects.create(title='Not mine', content='Body', author=other)
+        response = self.client.patch(reverse('post-update-api', kwargs={'id': post.pk}), {'featured_image': self.png()})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.stored_files(), [])
+
+    def test_file_is_stored_before_the_row_commits(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.create(self.png())
+            name = Post.objects.get(pk=response.data['id']).featured_image.name
+            self.assertEqual(self.stored_files(), [name])
+        self.assertTrue(callbacks)
+
+class DatabaseConfigTests(TestCase):
+    def test_defaults_to_local_sqlite_with_persistent_connections(self):
+        database = database_from_env(env={}, default_name='db.sqlite3')
+        self.assertEqual(database['ENGINE'], 'django.db.backends.sqlite3')
+        self.assertEqual(database['NAME'], 'db.sqlite3')
+        self.assertEqual(database['CONN_MAX_AGE'], 60)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+
+    def test_postgresql_from_environment(self):
+        database = database_from_env(env={
+            'DB_ENGINE': 'postgresql', 'DB_NAME': 'blog', 'DB_USER': 'blog', 'DB_HOST': 'db',
+            'DB_CONN_MAX_AGE': 'none', 'DB_CONN_HEALTH_CHECKS': '0',
+        })
+        self.assertEqual(database['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual((database['NAME'], database['HOST'], database['PORT']), ('blog', 'db', '5432'))
+        self.assertIsNone(database['CONN_MAX_AGE'])
+        self.assertFalse(database['CONN_HEALTH_CHECKS'])
+        with self.assertRaises(ValueError):
+            database_from_env(env={'DB_ENGINE': 'oracle'})
+
+    def test_sqlite_pragmas_applied_to_new_connections(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 20000)
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+
+    def test_sqlite_pragma_settings_override_defaults(self):
+        with override_settings(BLOG_SQLITE_PRAGMAS={'busy_timeout': None, 'cache_size': -2000}):
+            pragmas = sqlite_pragmas()
+        self.assertNotIn('busy_timeout', pragmas)
+        self.assertEqual((pragmas['journal_mode'], pragmas['cache_size']), ('WAL', -2000))
+
+    def test_replicas_inherit_primary_settings(self):
+        replicas = replica_databases(env={
+            'DB_ENGINE': 'postgresql', 'DB_NAME': 'blog', 'DB_HOST': 'primary',
+            'DB_REPLICAS': '2', 'DB_REPLICA2_HOST': 'replica-b',
+        })
+        self.assertEqual(sorted(replicas), ['replica1', 'replica2'])
+        self.assertEqual(replicas['replica1']['HOST'], 'primary')
+        self.assertEqual((replicas['replica2']['NAME'], replicas['replica2']['HOST']), ('blog', 'replica-b'))
+        self.assertEqual(replicas['replica2']['TEST'], {'MIRROR': 'default'})
+        self.assertEqual(replica_databases(env={}), {})
+
+
+@override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False},
+                   BLOG_DB_ROUTING={'REPLICAS': ['replica'], 'PIN_SECONDS': 10})
+class ReplicaRoutingTests(APITestCase):
+    """A second SQLite file stands in for a replica that hasn't caught up."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Added after the test-case setup so queries to it are allowed and it
+        # stays out of the per-test transaction, like a real replica.
+        cls.tmp = tempfile.TemporaryDirectory()
+        connections.settings['replica'] = {
+            **connections.settings['default'],
+            'NAME': os.path.join(cls.tmp.name, 'replica.sqlite3'),
+        }
+        call_command('migrate', database='replica', verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        connections['replica'].close()
+        del connections['replica']
+        del connections.settings['replica']
+        cls.tmp.cleanup()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='writer', password='testpass123')
+        self.post = Post.objects.create(title='Primary only', content='Body', author=self.user)
+
+    def test_reads_go_to_replica_and_writes_to_primary(self):
+        url = reverse('post-detail-api', kwargs={'id': self.post.pk})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(Post.objects.get(pk=self.post.pk).title, 'Primary only')  # Outside requests: primary
+
+    def test_author_reads_own_writes_from_primary(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(reverse('post-create-api'), {'title': 'Fresh', 'content': 'Body'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        url = reverse('post-detail-api', kwargs={'id': response.data['id']})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        self.client.force_authenticate(None)  # Other readers still use the replica
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_token_writer_validators_read_from_primary(self):
+        # The ETag query runs before DRF authentication, so the pin comes from the bearer token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        response = self.client.post(reverse('post-create-api'), {'title': 'Fresh', 'content': 'Body'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        with mock.patch('blog.conditional.filter_posts', wraps=filter_posts) as validator:
+            with mock.patch('blog.routers.selector.acquire') as acquire:
+                response = self.client.get(reverse('post-list-api'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        validator.assert_called_once()
+        acquire.assert_not_called()
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer not-a-token')  # Treated as anonymous until DRF rejects it
+        self.assertEqual(self.client.get(reverse('post-list-api')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_process_local_pin_cache_is_flagged(self):
+        self.assertEqual([warning.id for warning in check_pin_cache(None)], ['blog.W002'])
+        with override_settings(BLOG_DB_ROUTING={'REPLICAS': []}):
+            self.assertEqual(check_pin_cache(None), [])
+
+    def test_replica_selection_strategies(self):
+        selector = ReplicaSelector()
+        picks = [selector.acquire(['a', 'b'], 'round_robin') for _ in range(4)]
+        self.assertEqual(picks, ['a', 'b', 'a', 'b'])
+        for alias in picks:
+            selector.release(alias)
+
+        busy = selector.acquire(['a', 'b'], 'least_loaded')
+        self.assertNotEqual(selector.acquire(['a', 'b'], 'least_loaded'), busy)
+        selector.release(busy)
+        self.assertEqual(selector.acquire(['a', 'b'], 'least_loaded'), busy)
+
+
+class ChangeNotificationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='notify', password='testpass123')
+
+    def test_version_moves_on_post_change_without_queries(self):
+        url = reverse('posts-version-api')
+        with tempfile.TemporaryDirectory() as location:
+            backend = {'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': location,
+            }}
+            with self.settings(CACHES=backend): # Shared alias: generation counters
+                before = self.client.get(url).json()['version']
+                with CaptureQueriesContext(connection) as queries:
+                    self.assertEqual(self.client.get(url).json()['version'], before)
+                self.assertEqual(len(queries), 0)
+                Post.objects.create(title='New', content='Body', author=self.user)
+                self.assertNotEqual(self.client.get(url).json()['version'], before)
+
+    def test_process_local_cache_gives_every_worker_the_same_version(self):
+        url = reverse('posts-version-api')
+        before = self.client.get(url).json()['version']
+        cache.clear() # Another worker: its LocMemCache seeds its own counters
+        self.assertEqual(self.client.get(url).json()['version'], before)
+
+        self.user.first_name = 'Renamed'
+        self.user.save()
+        renamed = self.client.get(url).json()['version']
+        self.assertNotEqual(renamed, before)
+        post = Post.objects.create(title='New', content='Body', author=self.user)
+        created = self.client.get(url).json()['version']
+        self.assertNotEqual(created, renamed)
+        post.delete()
+        self.assertNotEqual(self.client.get(url).json()['version'], created)
+
+    @override_settings(BLOG_CHANGE_WEBHOOK={'URLS': ['http://frontend/hooks/posts-changed/'], 'SECRET': 's3cret'})
+    def test_webhook_is_signed_and_sent_after_commit(self):
+        with mock.patch('blog.webhooks.deliver') as deliver, \
+                mock.patch('blog.webhooks.threading.Thread', side_effect=lambda target, args, daemon: mock.Mock(start=lambda: target(*args))):
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                Post.objects.create(title='New', content='Body', author=self.user)
+            deliver.assert_not_called()
+            for callback in callbacks:
+                callback()
+        url, body, secret, timeout = deliver.call_args.args
+        self.assertEqual(url, 'http://frontend/hooks/posts-changed/')
+        self.assertEqual(json.loads(body)['version'], self.client.get(reverse('posts-version-api')).json()['version'])
+
+
+@override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False})
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='etag', password='testpass123')
+        self.post = Post.objects.create(title='Validated', content='Body', author=self.user)
+
+    def test_detail_etag_and_last_modified(self):
+        url = reverse('post-detail-api', kwargs={'id': self.post.id})
+        response = self.client.get(url)
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertEqual(response['Last-Modified'], http_date(self.post.updated_at.timestamp()))
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(queries), 1)  # the updated_at lookup only
+
+        self.post.title = 'Changed'
+        self.post.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_list_etag_tracks_changes(self):
+        url = reverse('post-list-api')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertNotEqual(self.client.get(url, {'fields': 'id'})['ETag'], etag)
+
+        self.post.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_author_change_changes_etag(self):
+        url = reverse('recent-posts-api')
+        etag = self.client.get(url)['ETag']
+        self.user.last_name = 'Renamed'
+        self.user.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_author_rename_moves_validators_in_every_process(self):
+        # As seen by a worker that never ran the rename (its counters don't move)
+        an_hour_ago = timezone.now() - timezone.timedelta(hours=1)
+        Post.objects.filter(pk=self.post.pk).update(updated_at=an_hour_ago)
+        urls = [reverse('post-detail-api', kwargs={'id': self.post.id}), reverse('post-list-api')]
+        before = [self.client.get(url) for url in urls]
+        with mock.patch('blog.signals.bump_user_generation'):
+            self.user.username = 'renamed'
+            self.user.save()
+        for url, response in zip(urls, before):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+            self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 200)
+
+    def test_if_modified_since(self):
+        url = reverse('post-list-api')
+        last_modified = self.client.get(url)['Last-Modified']
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+    def test_missing_post_is_still_404(self):
+        response = self.client.get(reverse('post-detail-api', kwargs={'id': 999999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,276 @@
+"""
+Streaming featured_image uploads for the post create/update endpoints.
+
+ImageUploadHandler takes over the featured_image part of a multipart body
+before Django's memory/temporary-file handlers see it:
+
+* the first chunk is sniffed for a JPEG/PNG/GIF/WebP signature, so other
+  files are refused before anything is written;
+* the upload is refused as soon as it passes MAX_BYTES;
+* chunks are SHA-256 hashed while they are written to a staging file in
+  the upload directory, which gives the content-addressed name
+  (blog_images/ab/ab12...ef.jpg). Identical images uploaded
+  for different posts share one file (and one set of renditions);
+* Pillow only reads the header, to check the pixel count against
+  decompression bombs, instead of decoding the whole image in the request.
+
+The parser then hands the serializer a StoredUpload (staged, with its final
+name) or a RejectedUpload, which StoredImageField turns into the storage name
+or a validation error.
+
+Staged files are promoted to their final name (a rename, or one save for
+storages without a local path) only once the post row referencing them is
+saved, inside the same transaction, so the renditions job queued on commit
+finds the file. A request that fails (validation, ownership, database
+error) leaves nothing in storage: its staged files are removed when the
+view returns.
+"""
+import hashlib
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.files.base import File
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+from django.db import transaction
+from PIL import Image
+
+DEFAULTS = {
+    'FIELD': 'featured_image',
+    'UPLOAD_TO': 'blog_images',
+    'MAX_BYTES': 10 * 1024 * 1024,
+    'MAX_PIXELS': 40_000_000,
+    'TYPES': ['jpeg', 'png', 'gif', 'webp'],
+}
+
+EXTENSIONS = {'jpeg': 'jpg', 'png': 'png', 'gif': 'gif', 'webp': 'webp'}
+CONTENT_TYPES = {'jpeg': 'image/jpeg', 'png': 'image/png', 'gif': 'image/gif', 'webp': 'image/webp'}
+
+
+def upload_settings():
+    return {**DEFAULTS, **getattr(settings, 'BLOG_IMAGE_UPLOADS', {})}
+
+
+def sniff_image_type(head):
+    """Image type from the first bytes of a file, or None."""
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'jpeg'
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+
+def content_addressed_name(digest, image_type, upload_to):
+    return f'{upload_to}/{digest[:2]}/{digest}.{EXTENSIONS[image_type]}'
+
+
+def local_path(name):
+    """Filesystem path of a storage name, or None for remote storages."""
+    try:
+        return default_storage.path(name)
+    except NotImplementedError:
+        return None
+
+
+def open_staging_file(upload_to):
+    # Same directory (and filesystem) as the final file: promoting is a rename
+    storage_dir = local_path(upload_to)
+    if storage_dir is not None:
+        os.makedirs(storage_dir, exist_ok=True)
+    return tempfile.NamedTemporaryFile(dir=storage_dir, prefix='.upload-', delete=False)
+
+
+def promote_staged(staged_path, name):
+    """Move a staging file to its content-addressed storage name."""
+    if default_storage.exists(name):
+        os.remove(staged_path) # Same bytes already stored
+        return
+    final_path = local_path(name)
+    if final_path is not None:
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        permissions = getattr(default_storage, 'file_permissions_mode', None)
+        if permissions is not None:
+            os.chmod(staged_path, permissions)
+        os.replace(staged_path, final_path)
+    else:
+        with open(staged_path, 'rb') as staged:
+            default_storage.save(name, File(staged))
+        os.remove(staged_path)
+
+
+def store_image_file(source_path, options=None):
+    """
+    Copy an image file from disk into storage under its content-addressed
+    name (e.g. for imports); returns the name. Raises ValueError for files
+    that are not an accepted image type.
+    """
+    options = options or upload_settings()
+    hasher = hashlib.sha256()
+    with open(source_path, 'rb') as source:
+        image_type = sniff_image_type(source.read(12))
+        if image_type not in options['TYPES']:
+            raise ValueError(f'{source_path} is not a JPEG, PNG, GIF or WebP image.')
+        source.seek(0)
+        with open_staging_file(options['UPLOAD_TO']) as staged:
+            try:
+                for chunk in iter(lambda: source.read(64 * 1024), b''):
+                    hasher.update(chunk)
+                    staged.write(chunk)
+            except BaseException:
+                staged.close()
+                os.remove(staged.name)
+                raise
+    name = content_addressed_name(hasher.hexdigest(), image_type, options['UPLOAD_TO'])
+    promote_staged(staged.name, name)
+    return name
+
+
+class StoredUpload(UploadedFile):
+    """An image the upload handler has staged, to be stored under `name` by promote()."""
+
+    def __init__(self, name, size, content_type, sha256, staged_path):
+        super().__init__(file=None, name=name, content_type=content_type, size=size)
+        self.sha256 = sha256
+        self.staged_path = staged_path
+
+    def promote(self):
+        """Move the staged file to its content-addressed name (once)."""
+        staged_path, self.staged_path = self.staged_path, None
+        if staged_path is not None:
+            promote_staged(staged_path, self.name)
+
+    def discard(self):
+        staged_path, self.staged_path = self.staged_path, None
+        if staged_path is not None and os.path.exists(staged_path):
+            os.remove(staged_path)
+
+    def _set_name(self, name):
+        self._name = name # Keep the storage path; UploadedFile would strip directories
+
+    name = property(lambda self: self._name, _set_name)
+
+
+class RejectedUpload(UploadedFile):
+    """Stands in for a refused file so the serializer can report why."""
+
+    def __init__(self, name, reason):
+        super().__init__(file=None, name=name or 'upload', size=0)
+        self.reason = reason
+
+
+class ImageUploadHandler(FileUploadHandler):
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.options = upload_settings()
+        self.active = False
+        self.staged = []
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.active = field_name == self.options['FIELD']
+        self.error = None
+        self.image_type = None
+        self.hasher = hashlib.sha256()
+        self.temp = None
+
+    def _reject(self, reason):
+        self.error = reason
+        self._discard()
+
+    def _discard(self):
+        if self.temp is not None:
+            self.temp.close()
+            os.remove(self.temp.name)
+            self.temp = None
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.active:
+            return raw_data
+        if self.error:
+            return None # Drain the rest of a refused file without storing it
+        if start == 0:
+            self.image_type = sniff_image_type(raw_data[:12])
+            if self.image_type not in self.options['TYPES']:
+                self._reject('Upload a JPEG, PNG, GIF or WebP image.')
+                return None
+            self.temp = open_staging_file(self.options['UPLOAD_TO'])
+        if start + len(raw_data) > self.options['MAX_BYTES']:
+            self._reject(f"Images may be at most {self.options['MAX_BYTES'] // (1024 * 1024)} MB.")
+            return None
+        self.hasher.update(raw_data)
+        self.temp.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if not self.active:
+            return None
+        if self.error:
+            return RejectedUpload(self.file_name, self.error)
+        if self.temp is None:
+            return RejectedUpload(self.file_name, 'The submitted file is empty.')
+        self.temp.close()
+        try:
+            with Image.open(self.temp.name) as image: # Parses the header only
+                if image.width * image.height > self.options['MAX_PIXELS']:
+                    raise ValueError('Image dimensions are too large.')
+        except (OSError, ValueError, Image.DecompressionBombError) as exc:
+            self._discard()
+            reason = str(exc) if isinstance(exc, ValueError) else 'Upload a valid image.'
+            return RejectedUpload(self.file_name, reason)
+
+        digest = self.hasher.hexdigest()
+        name = content_addressed_name(digest, self.image_type, self.options['UPLOAD_TO'])
+        temp_path, self.temp = self.temp.name, None
+        upload = StoredUpload(name, file_size, CONTENT_TYPES[self.image_type], digest, temp_path)
+        self.staged.append(upload)
+        return upload
+
+    def promote(self):
+        for upload in self.staged:
+            upload.promote()
+
+    def discard_staged(self):
+        for upload in self.staged:
+            upload.discard()
+
+    def upload_interrupted(self):
+        if self.temp is not None:
+            self._discard()
+
+
+class StreamingImageUploadMixin:
+    """
+    Route multipart featured_image uploads through ImageUploadHandler, and
+    store the staged images only with a successful create/update.
+    """
+    image_upload_handler = None
+
+    def initialize_request(self, request, *args, **kwargs):
+        self.image_upload_handler = ImageUploadHandler(request)
+        request.upload_handlers.insert(0, self.image_upload_handler)
+        return super().initialize_request(request, *args, **kwargs)
+
+    def create(self, request, *args, **kwargs):
+        with transaction.atomic():
+            response = super().create(request, *args, **kwargs)
+            self.image_upload_handler.promote() # Before commit, so on_commit jobs see the file
+        return response
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            response = super().update(request, *args, **kwargs)
+            self.image_upload_handler.promote()
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            if self.image_upload_handler is not None:
+                self.image_upload_handler.discard_staged() # Whatever a failed request left staged
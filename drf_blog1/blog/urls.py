@@ -7,12 +7,17 @@ urlpatterns = [
     # Post API URLs
     path('posts/', views.PostListView.as_view(), name='post-list-api'),
     path('posts/create/', views.PostCreateView.as_view(), name='post-create-api'),
+    path('posts/bulk/', views.PostBulkView.as_view(), name='post-bulk-api'),
     path('posts/<int:id>/', views.PostDetailViewAPI.as_view(), name='post-detail-api'),
     path('posts/<int:id>/update/', views.PostUpdateView.as_view(), name='post-update-api'),
     path('posts/<int:id>/delete/', views.PostDeleteView.as_view(), name='post-delete-api'),
 
     # Additional Post API endpoints
     path('recent-posts/', views.recent_posts, name='recent-posts-api'),
+    path('posts/version/', views.posts_version, name='posts-version-api'),
+    path('posts/export/', views.export_posts, name='post-export-api'),
+    path('authors/<str:username>/posts/', views.AuthorPostListView.as_view(), name='author-posts-api'),
+    path('archive/', views.post_archive, name='post-archive-api'),
 
     # Authentication API URLs
     path('auth/register/', views.user_registration, name='register-api'),
@@ -1,55 +1,222 @@
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
-from django.db.models import Q
+from rest_framework.views import APIView
+from django.conf import settings
 from django.contrib.auth.models import User
-from .models import Post
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from . import markers
+from .archive import add_posts as add_archive_posts, archive
+from .cache import bump_post_generation, cached_response, detail_version, list_version
+from .conditional import conditional_post_detail, conditional_post_list
+from .export import export_queryset, gzip_stream, ndjson_lines, parse_moment
+from .fast_serializers import FastSerializer
+from .filters import author_id_for, filter_posts
+from .images import release_renditions, schedule as schedule_renditions
+from .listing import listing_serializer_for, sync_posts
+from .models import Post, PostListing
+from .signals import bump_now_and_on_commit
+from .uploads import StreamingImageUploadMixin
+from .webhooks import notify_change
 # Removed template-specific imports
 from .serializers import (
     PostListSerializer,
-    PostDetailSerializer, PostCreateSerializer,
-    UserRegistrationSerializer, UserLoginSerializer, UserSerializer
+    PostDetailSerializer, PostCreateSerializer, PostBulkSerializer,
+    UserRegistrationSerializer, UserSerializer,
+    selected_columns,
 )
 
+# ===================================================================
+# SPARSE FIELDSETS
+# ===================================================================
+
+# Always loaded so keyset pagination can read its cursor position
+ALWAYS_LOADED_COLUMNS = ('id', 'created_at')
+
+def field_selection(request):
+    """Read ?fields=a,b and ?exclude=c,author.email into serializer kwargs."""
+    selection = {}
+    for param in ('fields', 'exclude'):
+        value = request.query_params.get(param)
+        if value:
+            selection[param] = [name.strip() for name in value.split(',') if name.strip()]
+    return selection
+
+def project_queryset(queryset, serializer):
+    """Load only the columns the (trimmed) serializer will actually emit."""
+    columns = selected_columns(serializer)
+    if any(column.startswith('author') for column in columns):
+        queryset = queryset.select_related('author')
+    return queryset.only(*ALWAYS_LOADED_COLUMNS, *columns)
+
+class SparseFieldsetViewMixin:
+    """Applies ?fields= / ?exclude= to both the serializer and the queryset."""
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.update(field_selection(self.request))
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        return project_queryset(super().get_queryset(), self.get_serializer())
+
+# ===================================================================
+# FAST READ PATH (settings.BLOG_FAST_SERIALIZERS)
+# ===================================================================
+
+def fast_serializer_for(serializer):
+    """FastSerializer for a read serializer, or None to use DRF as usual."""
+    if not getattr(settings, 'BLOG_FAST_SERIALIZERS', False):
+        return None
+    return FastSerializer.for_serializer(serializer)
+
+class FastReadMixin:
+    """
+    Serves list/retrieve from .values() rows when fast serializers are on.
+    Only for AllowAny read views: there is no model instance to run
+    object-level permission checks against.
+    """
+
+    def list(self, request, *args, **kwargs):
+        fast = fast_serializer_for(self.get_serializer())
+        if fast is None:
+            return super().list(request, *args, **kwargs)
+        queryset = fast.values(self.filter_queryset(self.get_queryset()), *ALWAYS_LOADED_COLUMNS)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast.many(page))
+        return Response(fast.many(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        fast = fast_serializer_for(self.get_serializer())
+        if fast is None:
+            return super().retrieve(request, *args, **kwargs)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        row = fast.values(queryset).first()
+        if row is None:
+            raise Http404
+        return Response(fast.to_representation(row))
+
 # ===================================================================
 # API VIEWS
 # ===================================================================
 
-class PostListView(generics.ListAPIView):
+@method_decorator(cached_response('post-list', list_version), name='dispatch')
+@method_decorator(conditional_post_list, name='dispatch')
+class PostListView(FastReadMixin, SparseFieldsetViewMixin, generics.ListAPIView):
     serializer_class = PostListSerializer
     permission_classes = [permissions.AllowAny]
+    queryset = Post.objects.all()
+
+    def list(self, request, *args, **kwargs):
+        # Denormalized single-table read (settings.BLOG_POST_LISTING); search still needs Post
+        listing = None if request.query_params.get('search') else listing_serializer_for(self.get_serializer())
+        if listing is None:
+            return super().list(request, *args, **kwargs)
+        queryset = filter_posts(PostListing.objects.all(), request, self.kwargs.get('username'), search=False)
+        queryset = listing.values(queryset, *ALWAYS_LOADED_COLUMNS)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(listing.many(page))
+        return Response(listing.many(queryset))
 
     def get_queryset(self):
-        queryset = Post.objects.all().select_related('author')
-        search_query = self.request.query_params.get('search', None)
-        if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) |
-                Q(content__icontains=search_query)
-            )
-        return queryset
-
-class PostDetailViewAPI(generics.RetrieveAPIView):
+        # ?author= and ?search= (blog/filters.py)
+        return filter_posts(super().get_queryset(), self.request, self.kwargs.get('username'))
+
+class AuthorPostListView(PostListView):
+    """
+    /api/authors/<username>/posts/: one author's posts, newest first, with
+    the same fields, sparse fieldsets and keyset cursors as the post list.
+    Each page is an index range scan on (author, -created_at), so page cost
+    doesn't grow with the author's post count.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if author_id_for(request, self.kwargs['username']) is None:
+            raise Http404
+        return super().list(request, *args, **kwargs)
+
+@method_decorator(cached_response('post-detail', detail_version), name='dispatch')
+@method_decorator(conditional_post_detail, name='dispatch')
+class PostDetailViewAPI(FastReadMixin, SparseFieldsetViewMixin, generics.RetrieveAPIView):
     serializer_class = PostDetailSerializer
     permission_classes = [permissions.AllowAny]
     lookup_field = 'id'
     queryset = Post.objects.all()
 
-class PostCreateView(generics.CreateAPIView):
+class PostCreateView(StreamingImageUploadMixin, generics.CreateAPIView):
     queryset = Post.objects.all()
     serializer_class = PostCreateSerializer
     permission_classes = [permissions.IsAuthenticated] # Requires JWT token
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
+        post = serializer.save(author=self.request.user)
+        if post.featured_image:
+            schedule_renditions(post.pk) # Resized copies, off the request path
 
+@cached_response('recent-posts', list_version)
+@conditional_post_list
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def recent_posts(request):
-    posts = Post.objects.all().order_by('-created_at')[:5]
-    serializer = PostListSerializer(posts, many=True)
+    selection = field_selection(request)
+    listing = listing_serializer_for(PostListSerializer(**selection))
+    if listing is not None:
+        return Response(listing.many(listing.values(PostListing.objects.order_by('-created_at'))[:5]))
+    queryset = project_queryset(Post.objects.all(), PostListSerializer(**selection))
+    queryset = queryset.order_by('-created_at')
+    serializer = PostListSerializer(queryset[:5], many=True, **selection)
+    fast = fast_serializer_for(serializer)
+    if fast is not None:
+        return Response(fast.many(fast.values(queryset)[:5]))
     return Response(serializer.data)
 
+# Year/month buckets with post counts, read from the PostArchiveMonth summary
+# table (blog/archive.py); list a month with ?created_after=&created_before=
+@cached_response('post-archive', list_version)
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def post_archive(request):
+    return Response(archive())
+
+# Cheap change detector for caches outside the API (e.g. the frontend page cache):
+# moves whenever any post or author changes (blog/markers.py)
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def posts_version(request):
+    return Response({'version': markers.content_version()})
+
+# Streaming NDJSON dump of every post (blog/export.py). Memory stays flat:
+# rows are read in chunks and encoded as the response is sent.
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser]) # Staff JWT token
+def export_posts(request):
+    filters = {}
+    for param in ('created_after', 'created_before'):
+        value = request.query_params.get(param)
+        if value:
+            try:
+                filters[param] = parse_moment(value)
+            except ValueError as exc:
+                return Response({param: [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
+    if request.query_params.get('author'):
+        filters['author'] = request.query_params['author']
+
+    lines = ndjson_lines(export_queryset(**filters))
+    if request.query_params.get('gzip') in ('1', 'true'):
+        response = StreamingHttpResponse(gzip_stream(lines), content_type='application/gzip')
+        response['Content-Disposition'] = 'attachment; filename="posts.ndjson.gz"'
+    else:
+        response = StreamingHttpResponse(lines, content_type='application/x-ndjson')
+        response['Content-Disposition'] = 'attachment; filename="posts.ndjson"'
+    return response
+
 # API endpoint for registration
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
@@ -83,7 +250,7 @@ def update_user_profile(request):
         })
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class PostUpdateView(generics.UpdateAPIView):
+class PostUpdateView(StreamingImageUploadMixin, generics.UpdateAPIView):
     queryset = Post.objects.all()
     serializer_class = PostCreateSerializer
     permission_classes = [permissions.IsAuthenticated] # Requires JWT token
@@ -92,8 +259,16 @@ class PostUpdateView(generics.UpdateAPIView):
     def perform_update(self, serializer):
         post = self.get_object()
         if post.author != self.request.user:
-            raise permissions.PermissionDenied("You do not have permission to edit this post.")
-        serializer.save()
+            raise PermissionDenied("You do not have permission to edit this post.")
+        if 'featured_image' not in serializer.validated_data:
+            serializer.save()
+            return
+        # New (or removed) image: stop serving the old renditions in this same
+        # save; the job fills in the new ones (the original is served until then)
+        old_renditions = post.image_renditions
+        serializer.save(image_renditions={})
+        transaction.on_commit(lambda: release_renditions(old_renditions))
+        schedule_renditions(post.pk)
 
 class PostDeleteView(generics.DestroyAPIView):
     queryset = Post.objects.all()
@@ -103,7 +278,94 @@ class PostDeleteView(generics.DestroyAPIView):
 
     def perform_destroy(self, instance):
         if instance.author != self.request.user:
-            raise permissions.PermissionDenied("You do not have permission to delete this post.")
+            raise PermissionDenied("You do not have permission to delete this post.")
         instance.delete()
 
+class PostBulkView(APIView):
+    """
+    Apply a batch of post writes in one request and one transaction:
+
+        [{"op": "create", "data": {"title": "...", "content": "..."}},
+         {"op": "update", "id": 5, "data": {"title": "..."}},   # partial update
+         {"op": "delete", "id": 7}]
+
+    The batch is all-or-nothing. Success returns 200 {"results": [...]};
+    any invalid item returns 400 {"errors": [...]} with nothing written.
+    Both lists follow the request order, with {} for items that were fine.
+    """
+    permission_classes = [permissions.IsAuthenticated] # Requires JWT token
+    max_operations = 1000
+
+    def post(self, request):
+        operations = request.data
+        if not isinstance(operations, list) or not operations:
+            return Response({'detail': 'Expected a non-empty list of operations.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(operations) > self.max_operations:
+            return Response({'detail': f'At most {self.max_operations} operations per batch.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        errors = [{} for _ in operations]
+        creates, updates, deletes = [], [], [] # (index, data) / (index, post id, data)
+        seen_ids = set()
+        for index, operation in enumerate(operations):
+            kind = operation.get('op') if isinstance(operation, dict) else None
+            if kind not in ('create', 'update', 'delete'):
+                errors[index] = {'op': ['Must be "create", "update" or "delete".']}
+                continue
+            if kind == 'create':
+                creates.append((index, operation.get('data')))
+                continue
+            post_id = operation.get('id')
+            if not isinstance(post_id, int) or isinstance(post_id, bool):
+                errors[index] = {'id': ['A valid integer is required.']}
+            elif post_id in seen_ids:
+                errors[index] = {'id': ['Only one operation per post is allowed in a batch.']}
+            else:
+                seen_ids.add(post_id)
+                (updates if kind == 'update' else deletes).append((index, post_id, operation.get('data')))
+
+        # Field validation, one list serializer per kind
+        create_serializer = PostBulkSerializer(data=[data for _, data in creates], many=True, context={'request': request})
+        update_serializer = PostBulkSerializer(data=[data for _, _, data in updates], many=True, partial=True, context={'request': request})
+        for serializer, items in ((create_serializer, creates), (update_serializer, updates)):
+            if not serializer.is_valid():
+                for item, item_errors in zip(items, serializer.errors):
+                    if item_errors:
+                        errors[item[0]] = item_errors
+
+        with transaction.atomic():
+            # Ownership of every targeted post in one query, locked until commit
+            posts = Post.objects.select_for_update().only('id', 'author_id').in_bulk([post_id for _, post_id, _ in updates + deletes])
+            for action, items in (('edit', updates), ('delete', deletes)):
+                for index, post_id, _ in items:
+                    post = posts.get(post_id)
+                    if post is None:
+                        errors[index] = {'detail': 'Not found.'}
+                    elif post.author_id != request.user.id:
+                        errors[index] = {'detail': f'You do not have permission to {action} this post.'}
+            if any(errors):
+                return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+            created = create_serializer.save() if creates else []
+            if updates:
+                update_serializer.instance = [posts[post_id] for _, post_id, _ in updates]
+                update_serializer.save()
+            if deletes:
+                Post.objects.filter(id__in=[post_id for _, post_id, _ in deletes]).delete()
+
+            # bulk_create/bulk_update send no post_save signals: invalidate here
+            touched = [post.pk for post in created] + [post_id for _, post_id, _ in updates + deletes]
+            sync_posts(touched)
+            add_archive_posts(post.created_at for post in created) # Deletes above sent post_delete
+            bump_now_and_on_commit(bump_post_generation, *touched)
+            transaction.on_commit(notify_change)
+
+        results = [None] * len(operations)
+        for (index, _), post in zip(creates, created):
+            results[index] = {'op': 'create', 'id': post.pk, 'status': status.HTTP_201_CREATED}
+        for index, post_id, _ in updates:
+            results[index] = {'op': 'update', 'id': post_id, 'status': status.HTTP_200_OK}
+        for index, post_id, _ in deletes:
+            results[index] = {'op': 'delete', 'id': post_id, 'status': status.HTTP_204_NO_CONTENT}
+        return Response({'results': results})
+
 # ALL TEMPLATE VIEWS (def home, def login_view, etc.) ARE REMOVED
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""
+Change notifications for caches outside this process (e.g. the frontend's
+page cache).
+
+After a transaction that changed posts or users commits, every URL in
+BLOG_CHANGE_WEBHOOK['URLS'] receives a POST with the new content version:
+
+    {"version": "<content version>"}
+
+(blog/markers.content_version: the same value in every worker).
+
+The body is signed with HMAC-SHA256 using SECRET; the hex digest goes in the
+X-Blog-Signature header. Delivery happens on a background thread and
+failures are only logged; receivers that miss a call still catch up by
+polling GET /api/posts/version/.
+"""
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import urllib.request
+
+from django.conf import settings
+
+from . import markers
+
+DEFAULTS = {
+    'URLS': [],
+    'SECRET': '',
+    'TIMEOUT': 2,  # Seconds per delivery attempt
+}
+
+SIGNATURE_HEADER = 'X-Blog-Signature'
+
+logger = logging.getLogger(__name__)
+
+
+def webhook_settings():
+    return {**DEFAULTS, **getattr(settings, 'BLOG_CHANGE_WEBHOOK', {})}
+
+
+def sign(secret, body):
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def deliver(url, body, secret, timeout):
+    request = urllib.request.Request(url, data=body, method='POST', headers={
+        'Content-Type': 'application/json',
+        SIGNATURE_HEADER: sign(secret, body),
+    })
+    try:
+        with urllib.request.urlopen(request, timeout=timeout):
+            pass
+    except OSError as e: # URLError, HTTPError and timeouts
+        logger.warning('Change webhook to %s failed: %s', url, e)
+
+
+# Held from scheduling a delivery until it starts, so a burst of changes
+# (e.g. a bulk delete firing one signal per row) sends one notification
+_pending = threading.Lock()
+
+def _deliver_all(options):
+    _pending.release()
+    # Read the version now: it includes every change made before we started
+    body = json.dumps({'version': markers.content_version()}).encode()
+    for url in options['URLS']:
+        deliver(url, body, options['SECRET'], options['TIMEOUT'])
+
+def notify_change():
+    """Send the current content version to every configured webhook."""
+    options = webhook_settings()
+    if not options['URLS'] or not options['SECRET']:
+        return
+    if not _pending.acquire(blocking=False):
+        return # A queued delivery will carry this change too
+    threading.Thread(target=_deliver_all, args=(options,), daemon=True).start()
@@ -0,0 +1,120 @@
+"""
+DATABASES configuration from environment variables.
+
+With nothing set, this is the local SQLite file the project always used.
+Every variable takes a prefix, so the same reader describes the primary
+(DB_*) and, later, other aliases:
+
+    DB_ENGINE              sqlite (default) or postgresql
+    DB_NAME                SQLite file path, or PostgreSQL database name
+    DB_USER, DB_PASSWORD, DB_HOST, DB_PORT     PostgreSQL only
+    DB_CONN_MAX_AGE        Seconds to keep a connection open between
+                           requests (default 60; 0 closes it after each
+                           request; "none" keeps it forever)
+    DB_CONN_HEALTH_CHECKS  Ping reused connections before a request
+                           (default on)
+    DB_POOL                PostgreSQL connection pool (psycopg 3 pool,
+                           Django 5.1+), sized by DB_POOL_MIN_SIZE /
+                           DB_POOL_MAX_SIZE. On older Django, use PgBouncer
+                           with persistent connections instead.
+    DB_SQLITE_TIMEOUT      Seconds SQLite waits for a lock (default 20)
+
+Read replicas (routed by blog/routers.py) are numbered:
+
+    DB_REPLICAS            How many replicas (default 0)
+    DB_REPLICA1_HOST, DB_REPLICA1_NAME, ...   Per-replica overrides of the
+                           DB_* values above; unset ones are inherited
+                           from the primary, so usually only HOST (or, for
+                           SQLite, NAME) differs.
+
+SQLite PRAGMAs (WAL etc.) are applied per connection by blog/database.py.
+"""
+import os
+import warnings
+
+import django
+
+ENGINES = {
+    'sqlite': 'django.db.backends.sqlite3',
+    'sqlite3': 'django.db.backends.sqlite3',
+    'postgres': 'django.db.backends.postgresql',
+    'postgresql': 'django.db.backends.postgresql',
+}
+
+
+def env_flag(value, default=False):
+    if value is None or value == '':
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def conn_max_age(value, default=60):
+    if value is None or value == '':
+        return default
+    if value.strip().lower() == 'none':
+        return None # Unlimited persistent connections
+    return int(value)
+
+
+def database_from_env(prefix='DB_', default_name=None, env=None):
+    env = os.environ if env is None else env
+
+    def get(name, default=None):
+        return env.get(prefix + name, default)
+
+    engine_name = get('ENGINE', 'sqlite').lower()
+    if engine_name not in ENGINES:
+        raise ValueError(f"{prefix}ENGINE must be one of {', '.join(sorted(ENGINES))}, not '{engine_name}'.")
+    engine = ENGINES[engine_name]
+
+    database = {
+        'ENGINE': engine,
+        'NAME': get('NAME', default_name),
+        'CONN_MAX_AGE': conn_max_age(get('CONN_MAX_AGE')),
+        'CONN_HEALTH_CHECKS': env_flag(get('CONN_HEALTH_CHECKS'), default=True),
+        'OPTIONS': {},
+    }
+
+    if engine == 'django.db.backends.sqlite3':
+        # Python's sqlite3 busy wait; the busy_timeout PRAGMA matches it
+        database['OPTIONS']['timeout'] = float(get('SQLITE_TIMEOUT', 20))
+        return database
+
+    database.update({
+        'USER': get('USER', ''),
+        'PASSWORD': get('PASSWORD', ''),
+        'HOST': get('HOST', 'localhost'),
+        'PORT': get('PORT', '5432'),
+    })
+    if env_flag(get('POOL')):
+        if django.VERSION >= (5, 1):
+            database['OPTIONS']['pool'] = {
+                'min_size': int(get('POOL_MIN_SIZE', 2)),
+                'max_size': int(get('POOL_MAX_SIZE', 10)),
+            }
+            database['CONN_MAX_AGE'] = 0 # The pool owns connection lifetime
+        else:
+            warnings.warn(
+                f'{prefix}POOL needs Django 5.1+; using persistent connections '
+                f'(CONN_MAX_AGE={database["CONN_MAX_AGE"]}) instead. Put PgBouncer in '
+                'front of PostgreSQL for pooling across processes.'
+            )
+    return database
+
+
+def replica_databases(prefix='DB_', env=None):
+    """{'replica1': {...}, ...} for DB_REPLICAS replicas of the DB_* primary."""
+    env = os.environ if env is None else env
+    databases = {}
+    for number in range(1, int(env.get(prefix + 'REPLICAS') or 0) + 1):
+        replica_prefix = f'{prefix}REPLICA{number}_'
+        merged = {key: value for key, value in env.items() if key.startswith(prefix)}
+        merged.update({
+            prefix + key[len(replica_prefix):]: value
+            for key, value in env.items() if key.startswith(replica_prefix)
+        })
+        database = database_from_env(prefix, env=merged)
+        # Tests run against the primary; replicas just mirror it
+        database['TEST'] = {'MIRROR': 'default'}
+        databases[f'replica{number}'] = database
+    return databases
@@ -4,9 +4,12 @@ Configured as a pure JSON API backend using DRF and JWT.
 """
 
 from pathlib import Path
+import importlib.util
 import os
 from datetime import timedelta
 
+from .database import database_from_env, replica_databases
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -34,6 +37,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blog.routers.PrimaryPinningMiddleware', # Read-replica routing (blog/routers.py)
     'corsheaders.middleware.CorsMiddleware', # Handles CORS headers
     'django.contrib.sessions.middleware.SessionMiddleware', # Needed for Django Admin
     'django.middleware.common.CommonMiddleware',
@@ -66,13 +70,33 @@ WSGI_APPLICATION = 'blog_project.wsgi.application'
 
 
 # Database
+# Read from DB_* environment variables (see blog_project/database.py); with none
+# set, this is the local SQLite file. Examples:
+#   DB_CONN_MAX_AGE=60 DB_CONN_HEALTH_CHECKS=1            (the defaults)
+#   DB_ENGINE=postgresql DB_NAME=blog DB_USER=blog DB_PASSWORD=... DB_HOST=db DB_POOL=1
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_from_env('DB_', default_name=BASE_DIR / 'db.sqlite3'),
+}
+# Read replicas: DB_REPLICAS=2 DB_REPLICA1_HOST=... DB_REPLICA2_HOST=...
+DATABASES.update(replica_databases('DB_'))
+
+# API reads go to a replica, writes and a user's reads right after their own
+# write go to the primary (blog/routers.py). STRATEGY: round_robin or least_loaded.
+# CACHE holds those read-your-writes pins and must be shared by all workers
+# when replicas are configured (check blog.W002).
+DATABASE_ROUTERS = ['blog.routers.PrimaryReplicaRouter']
+BLOG_DB_ROUTING = {
+    'REPLICAS': [alias for alias in DATABASES if alias != 'default'],
+    'STRATEGY': os.environ.get('DB_REPLICA_STRATEGY', 'round_robin'),
+    'PIN_SECONDS': 10, # Read-your-writes window; cover the worst replication lag
+    'CACHE': 'default',
 }
 
+# Every new SQLite connection gets WAL, busy_timeout etc. (defaults in
+# blog/database.py). Only overrides go here, e.g. {'busy_timeout': 5000};
+# None disables a PRAGMA.
+BLOG_SQLITE_PRAGMAS = {}
+
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -82,6 +106,26 @@ AUTH_PASSWORD_VALIDATORS = [
     { 'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator', },
 ]
 
+# New hashes use the first hasher: Argon2 when argon2-cffi is installed,
+# otherwise scrypt. The others only verify older hashes, which are rehashed
+# with the first one at the next login (blog/passwords.py).
+PASSWORD_HASHERS = [
+    *(['django.contrib.auth.hashers.Argon2PasswordHasher'] if importlib.util.find_spec('argon2') else []),
+    'blog.hashing.ScryptPasswordHasher', # N=2**17 (OWASP); also verifies Django's N=2**14 hashes
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
+# authenticate() (/api/token/, UserLoginSerializer) checks passwords in a
+# process pool; past MAX_PENDING queued checks per web process logins get a 429.
+AUTHENTICATION_BACKENDS = ['blog.passwords.PooledModelBackend']
+BLOG_PASSWORD_POOL = {
+    'WORKERS': 2,
+    'MAX_PENDING': 32,
+    'TIMEOUT': 10,
+    'RETRY_AFTER': 2,
+}
+
 
 # Internationalization
 LANGUAGE_CODE = 'en-us'
@@ -103,15 +147,80 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        # Use JWT authentication as the primary method for the API
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWT authentication, with token users cached (blog/authentication.py)
+        'blog.authentication.CachedJWTAuthentication',
         # SessionAuth can be included if you need login to the Browsable API
         # 'rest_framework.authentication.SessionAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         # Default policy: Read-only for guests, require login (token) for writes
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
-    )
+    ),
+    # orjson/msgspec-backed JSON (falls back to stdlib json if neither is installed)
+    'DEFAULT_RENDERER_CLASSES': (
+        'blog.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'blog.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # Adds 429 for logins refused by the password pool (blog/passwords.py)
+    'EXCEPTION_HANDLER': 'blog.passwords.exception_handler',
+    # Keyset pagination: constant cost per page, no OFFSET scans
+    'DEFAULT_PAGINATION_CLASS': 'blog.pagination.PostCursorPagination',
+    'PAGE_SIZE': 20, # Clients may ask for up to PostCursorPagination.max_page_size with ?page_size=
+}
+
+# Serve post list/detail/recent-posts reads from .values() rows through
+# precompiled converters instead of DRF field machinery (blog/fast_serializers.py).
+# Output is byte-for-byte identical; off by default.
+BLOG_FAST_SERIALIZERS = False
+
+# Serve the post list and recent posts from blog_postlisting, a denormalized
+# copy of post + author columns (blog/listing.py): one indexed table scan, no
+# join. Kept in sync while on; run `manage.py rebuild_post_listing` after
+# turning it on.
+BLOG_POST_LISTING = False
+
+# Versioned response cache for post list/detail/recent-posts (blog/cache.py).
+# Entries are invalidated by Post/User save/delete signals, not by TTL;
+# TIMEOUT only bounds how long unused entries occupy the cache. ALIAS must
+# be shared by all workers: ENABLED = None turns the cache on only when it
+# is (i.e. not for the LocMemCache below).
+BLOG_RESPONSE_CACHE = {
+    'ENABLED': None,
+    'ALIAS': 'default',
+    'TIMEOUT': 60 * 60 * 24,
+}
+
+# featured_image uploads to the post create/update endpoints are type-sniffed,
+# size-capped and hashed while streaming into content-addressed files
+# (blog/uploads.py), so identical images are stored once.
+BLOG_IMAGE_UPLOADS = {
+    'MAX_BYTES': 10 * 1024 * 1024,
+    'MAX_PIXELS': 40_000_000,
+    'TYPES': ['jpeg', 'png', 'gif', 'webp'],
+}
+
+# Resized WebP/JPEG copies of featured images, made on a thread pool after
+# create/update (blog/images.py). Backfill: `manage.py generate_image_renditions`.
+BLOG_IMAGE_RENDITIONS = {
+    'ENABLED': True,
+    'SIZES': {'thumbnail': 320, 'card': 640, 'full': 1600}, # Longest side, px
+    'FORMATS': ['webp', 'jpeg'],
+    'QUALITY': 80,
+    'WORKERS': 2,
+}
+
+# POSTed (signed) after posts or users change, so caches outside this process
+# can drop stale pages (blog/webhooks.py). Off until URLS and SECRET are set,
+# e.g. 'URLS': ['http://127.0.0.1:8000/hooks/posts-changed/'].
+BLOG_CHANGE_WEBHOOK = {
+    'URLS': [],
+    'SECRET': os.environ.get('BLOG_WEBHOOK_SECRET', ''),
+    'TIMEOUT': 2,
 }
 
 SIMPLE_JWT = {
@@ -120,6 +229,31 @@ SIMPLE_JWT = {
 }
 
 
+# Users resolved from JWT access tokens are kept in a per-process LRU for
+# TTL seconds (blog/authentication.py). Saving or deleting a user replaces
+# its stamp in ALIAS, which every process checks on a hit, so ALIAS must be
+# shared by all workers; ENABLED = None turns the cache on only then.
+BLOG_AUTH_CACHE = {
+    'ENABLED': None,
+    'ALIAS': 'default',
+    'TTL': 60,
+    'MAX_ENTRIES': 10_000,
+}
+
+
+# --- CACHE SETTINGS ---
+# Local memory works out of the box (per process). For a cache shared by
+# several workers without extra services, use the file-based backend:
+#   'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+#   'LOCATION': BASE_DIR / 'cache',
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blog-api',
+    }
+}
+
+
 # --- CORS SETTINGS ---
 # Define which origins (frontend servers) are allowed to make requests
 CORS_ALLOWED_ORIGINS = [